@@ -8,11 +8,13 @@ import threading
 import random
 
 from collections import deque
+from contextlib import contextmanager
 
 import logging
 logger = logging.getLogger("underworlds.client")
 
 from grpc.beta import implementations
+from grpc.beta import interfaces as beta_interfaces
 from grpc.framework.interfaces.face.face import ExpirationError,NetworkError,AbortionError
 import underworlds.underworlds_pb2 as gRPC
 
@@ -22,12 +24,34 @@ from numpy import linalg
 from underworlds.types import World, Node, Situation, MeshData, NEW, DELETE, UPDATE
 
 from underworlds.helpers.profile import profile, profileonce
+from underworlds.helpers.cache import OrderedSet, IndexedIds
+from underworlds.helpers.meshcache import MeshCache
 
 from underworlds.helpers.geometry import get_world_transform
 from underworlds.helpers.transformations import decompose_matrix
 
 _TIMEOUT_SECONDS = 1
 _TIMEOUT_SECONDS_MESH_LOADING = 20
+_TIMEOUT_SECONDS_SCENE_LOADING = 20
+# the invalidation stream stays open as long as the context is alive
+_TIMEOUT_SECONDS_INVALIDATION_STREAM = 10 * 365 * 24 * 3600
+
+# default max number of stale nodes refreshed in one single getNodes call
+_NODES_BATCH_SIZE = 500
+
+# default max time (in sec) to wait for the notification of new
+# nodes/situations before re-synchronising with the server
+_PROPAGATION_TIMEOUT_SECONDS = 0.5
+
+# meshes larger than this (in bytes, once serialized) are uploaded in chunks
+# of that size (cf Context.push_mesh)
+_MESH_CHUNK_SIZE = 1024 * 1024
+
+# max number of attempts to resume an interrupted mesh transfer
+_MESH_TRANSFER_ATTEMPTS = 3
+
+# default max size (in bytes) of the meshes kept in memory by a context
+_MESH_CACHE_SIZE = 256 * 1024 * 1024
 
 #TODO: inherit for a collections.MutableSequence? what is the benefit?
 class NodesProxy:
@@ -47,31 +71,86 @@ class NodesProxy:
 
         # list of all node IDs that were once obtained.
         # They may be valid or invalid (if present in _updated_ids)
-        self._ids = []
-
-        # list of invalid ids (ie, nodes that have remotely changed).
-        # This list is updated asynchronously from a server publisher
-        self._updated_ids = deque(self._ctx.rpc.getNodesIds(self._server_ctx, _TIMEOUT_SECONDS).ids)
-
-        self._deleted_ids = deque()
+        self._ids = IndexedIds()
+
+        # set of invalid ids (ie, nodes that have remotely changed).
+        # This set is updated asynchronously from a server publisher
+        self._updated_ids = OrderedSet(self._ctx.rpc.getNodesIds(self._server_ctx, _TIMEOUT_SECONDS).ids)
+
+        # invalidations received from the server, not yet applied to the
+        # cache (cf _process_invalidations). Appending to/popping from a
+        # deque is thread-safe.
+        self._invalidations = deque()
+
+        # protects the node cache (_len, _nodes, _ids, _updated_ids). It is
+        # released while waiting for the server (cf _unlocked).
+        # The invalidation handlers do not need it: they only queue the
+        # invalidations, which are applied by the readers.
+        self._lock = threading.Lock()
+
+        # one thread at a time fetches nodes from the server (cf
+        # __getitem__). Meanwhile, the other readers only read the cache:
+        # the invalidations are applied by the fetching thread, after the
+        # nodes it received (that would otherwise overwrite newer ones).
+        self._fetch_lock = threading.Lock()
+        self._fetching = False
+
+        # set to True once the whole scene has been fetched in bulk (cf _prefetch)
+        self._prefetched = False
+
+        # max number of pending updated nodes refreshed together when one of
+        # them is accessed (cf _update_node_from_remote). Set to 1 to
+        # refresh nodes one by one.
+        self.batch_size = _NODES_BATCH_SIZE
+
+        # max time (in sec) to wait for the notification of nodes added
+        # remotely, before explicitly re-synchronising with the server
+        # (cf _get_more_node)
+        self.propagation_timeout = _PROPAGATION_TIMEOUT_SECONDS
 
         # holds futures for non-blocking RPC calls when updating/removing nodes
         self.update_future = None
         self.remove_future = None
 
-        # Get the root node
-        self.rootnode = self._ctx.rpc.getRootNode(self._server_ctx, _TIMEOUT_SECONDS).id
-        self._update_node_from_remote(self.rootnode)
- 
+        # version of the scene after the last change notified by the server
+        # (0 until then, see SceneProxy.at)
+        self.version = 0
+
         self.waitforchanges_cv = threading.Condition()
         self.lastchange = None
 
+        # Get the root node
+        self._rootnode = self._ctx.rpc.getRootNode(self._server_ctx, _TIMEOUT_SECONDS).id
+        with self._lock:
+            self._update_node_from_remote(self._rootnode)
+
+    @property
+    def rootnode(self):
+        """ The ID of the root node.
+        """
+        rootnode = self._rootnode
+        if rootnode is None:
+            # the whole world has been replaced (cf WorldProxy.copy_from)
+            rootnode = self._rootnode = self._ctx.rpc.getRootNode(self._server_ctx, _TIMEOUT_SECONDS).id
+        return rootnode
+
+    @contextmanager
+    def _unlocked(self):
+        """ Releases self._lock (that must be held) while calling the
+        server.
+        """
+        self._lock.release()
+        try:
+            yield
+        finally:
+            self._lock.acquire()
+
     @profile
-    def _on_remotely_updated_nodes(self, ids):
+    def _on_remotely_updated_nodes(self, ids, deltas=(), nodes=()):
 
-        for id in ids:
-            if id not in self._updated_ids:
-                self._updated_ids.append(id)
+        self._invalidations.append((UPDATE, list(ids),
+                                    {d.node.id: d for d in deltas},
+                                    {n.id: n for n in nodes}))
 
         with self.waitforchanges_cv:
             self.lastchange = (ids, UPDATE)
@@ -79,13 +158,9 @@ class NodesProxy:
 
 
     @profile
-    def _on_remotely_added_nodes(self, ids):
-
-        self._len += len(ids)
+    def _on_remotely_added_nodes(self, ids, nodes=()):
 
-        for id in ids:
-            if id not in self._updated_ids:
-                self._updated_ids.append(id)
+        self._invalidations.append((NEW, list(ids), None, {n.id: n for n in nodes}))
 
         with self.waitforchanges_cv:
             self.lastchange = (ids, NEW)
@@ -95,38 +170,170 @@ class NodesProxy:
     @profile
     def _on_remotely_deleted_nodes(self, ids):
 
-        self._len -= len(ids)
-        self._deleted_ids.extend(ids)
+        self._invalidations.append((DELETE, list(ids), None, None))
 
         with self.waitforchanges_cv:
             self.lastchange = (ids, DELETE)
             self.waitforchanges_cv.notify_all()
 
 
+    def _process_invalidations(self):
+        """ Applies to the cache the invalidations received since the last
+        call. Must be called with self._lock held.
+        """
+        while self._invalidations:
+            action, ids, deltas, payloads = self._invalidations.popleft()
+
+            if action == DELETE:
+                self._len -= len(ids)
+                for id in ids:
+                    self._updated_ids.discard(id)
+                    if id in self._nodes:
+                        self._ids.remove(id)
+                        del(self._nodes[id])
+
+                if self._rootnode in ids:
+                    self._rootnode = None # fetched again on access (cf rootnode)
+                continue
+
+            if action == NEW:
+                self._len += len(ids)
+
+            if not deltas and not payloads:
+                self._updated_ids.extend(ids)
+                continue
+
+            for id in ids:
+                if id in payloads:
+                    self._install_node(payloads[id])
+                    self._updated_ids.discard(id)
+                elif deltas and id in deltas and id in self._nodes and id not in self._updated_ids:
+                    self._apply_delta(deltas[id])
+                else:
+                    self._updated_ids.append(id)
+
+    def _install_node(self, gRPCNode):
+        """ Adds or replaces a node in the cache.
+        """
+        id = gRPCNode.id
+        if id not in self._nodes:
+            self._ids.append(id)
+        self._nodes[id] = Node.deserialize(gRPCNode, self._nodes.get(id))
+
+    def _apply_delta(self, delta):
+        """ Updates a cached node from a delta sent by the server.
+
+        The cached node is replaced by an updated copy: node instances
+        previously returned to the user are left untouched.
+        """
+        node = copy.copy(self._nodes[delta.node.id])
+        node.update_fields(delta.node, delta.fields)
+        self._nodes[node.id] = node
+
+    def _wait_for_invalidations(self):
+        """ Waits until at least one invalidation is received, or
+        `propagation_timeout` is elapsed, and applies the received
+        invalidations. Must be called with self._lock held.
+        """
+        deadline = time.time() + self.propagation_timeout
+
+        with self._unlocked(), self.waitforchanges_cv:
+            while not self._invalidations:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.waitforchanges_cv.wait(remaining)
+
+        self._process_invalidations()
+
+    def _resync(self):
+        """ Re-synchronises the list of nodes with the server, in case
+        some invalidations were lost or are late. Must be called with
+        self._lock held.
+        """
+        self._process_invalidations()
+
+        with self._unlocked():
+            ids = self._ctx.rpc.getNodesIds(self._server_ctx, _TIMEOUT_SECONDS).ids
+        remote_ids = set(ids)
+
+        for id in list(self._ids):
+            if id not in remote_ids:
+                self._ids.remove(id)
+                del(self._nodes[id])
+
+        for id in list(self._updated_ids):
+            if id not in remote_ids:
+                self._updated_ids.discard(id)
+
+        self._updated_ids.extend(id for id in ids if id not in self._ids)
+        self._len = len(ids)
+
     def _get_more_node(self):
         
         if not self._updated_ids:
-            logger.warning("Slow propagation? Waiting for new/updated nodes notifications...")
-            time.sleep(0.05) #leave some time for propagation
+            logger.debug("Waiting for new nodes notifications...")
+            self._wait_for_invalidations()
 
-            # still empty? we have a problem!
-            if not self._updated_ids:
-                logger.error("Inconsistency detected! The server has not"\
-                             " notified all the nodes updates. Or the "\
-                             "IPC transport is really slow.")
-                raise Exception()
+        if not self._updated_ids:
+            logger.warning("No notification of new nodes after %.2fsec. "
+                           "Re-synchronising with the server." % self.propagation_timeout)
+            self._resync()
+
+        if not self._updated_ids:
+            raise IndexError("No more nodes in world <%s>" % self._world.name)
 
-        # here, _updated_ids is not empty. It should not raise an exception
         id = self._updated_ids.pop()
 
         self._get_node_from_remote(id)
 
+    def _get_missing_nodes(self):
+        """ Re-synchronises with the server, and fetches the nodes that are
+        not cached yet. Must be called with self._lock held.
+        """
+        self._resync()
+
+        missing = [id for id in self._updated_ids if id not in self._ids]
+        for id in missing:
+            self._updated_ids.discard(id)
+
+        for i in range(0, len(missing), self.batch_size):
+            self._get_nodes_from_remote(missing[i:i + self.batch_size])
+
+    @profile
+    def _prefetch(self):
+        """ Fetches all the nodes of the world in one single streamed call,
+        instead of one roundtrip per node.
+
+        Must be called with self._lock held. Invalidations received while
+        the scene is being streamed are applied afterwards: the corresponding
+        nodes are fetched again on next access.
+        """
+
+        received = set()
+
+        scene = self._ctx.rpc.getScene(self._server_ctx, _TIMEOUT_SECONDS_SCENE_LOADING)
+        while True:
+            with self._unlocked():
+                nodesInCtxt = next(scene, None)
+            if nodesInCtxt is None:
+                break
+
+            for gRPCNode in nodesInCtxt.nodes:
+                self._install_node(gRPCNode)
+                received.add(gRPCNode.id)
+
+        self._updated_ids = OrderedSet(id for id in self._updated_ids if id not in received)
+
+        self._prefetched = True
+
     def _get_node_from_remote(self, id):
 
         nodeInCtxt = gRPC.NodeInContext(context=self._server_ctx,
                                         node=gRPC.Node(id=id))
         try:
-            gRPCNode = self._ctx.rpc.getNode(nodeInCtxt, _TIMEOUT_SECONDS)
+            with self._unlocked():
+                gRPCNode = self._ctx.rpc.getNode(nodeInCtxt, _TIMEOUT_SECONDS)
         except AbortionError as e:
             raise ValueError(e.details)
 
@@ -134,28 +341,84 @@ class NodesProxy:
         if id not in self._ids:
             self._ids.append(id)
 
-        self._nodes[id] = Node.deserialize(gRPCNode)
+        self._nodes[id] = Node.deserialize(gRPCNode, self._nodes.get(id))
 
 
-    def _update_node_from_remote(self, id):
+    def _get_nodes_from_remote(self, ids):
 
-        self._get_node_from_remote(id)
+        nodesInCtxt = gRPC.NodesInContext(context=self._server_ctx,
+                                          nodes=[gRPC.Node(id=id) for id in ids])
+
+        with self._unlocked():
+            gRPCNodes = self._ctx.rpc.getNodes(nodesInCtxt, _TIMEOUT_SECONDS).nodes
+
+        for gRPCNode in gRPCNodes:
+            self._install_node(gRPCNode)
+
+        return set(n.id for n in gRPCNodes)
+
+    @profile
+    def _update_node_from_remote(self, id):
+        """ Refreshes the node `id`, and, in the same roundtrip, up to
+        `batch_size - 1` other nodes pending in `_updated_ids`.
+        """
 
         self._updated_ids.remove(id)
 
+        if self.batch_size <= 1:
+            self._get_node_from_remote(id)
+            return
+
+        ids = [id]
+        while self._updated_ids and len(ids) < self.batch_size:
+            ids.append(self._updated_ids.popleft())
+
+        if id not in self._get_nodes_from_remote(ids):
+            raise ValueError("Node <%s> does not exist anymore" % id)
+
     def __getitem__(self, key):
 
-        # First, a bit of house keeping
-        # do we have pending nodes to delete?
-        if self._deleted_ids:
-            tmp = copy.copy(self._deleted_ids)
-            for id in tmp:
-                try:
-                    self._ids.remove(id)
-                    del(self._nodes[id])
-                    self._deleted_ids.remove(id)
-                except ValueError:
-                    logger.warning("The node <%s> is already removed. Feels like a synchro issue..." % id)
+        with self._lock:
+            if not self._fetching:
+                self._process_invalidations()
+            node = self._cached_node(key)
+
+        if node is not None:
+            return node
+
+        with self._fetch_lock, self._lock:
+            self._fetching = True
+            try:
+                return self._getitem(key)
+            finally:
+                self._fetching = False
+
+    def _cached_node(self, key):
+        """ Returns the node `key` (an index or an ID) if it is cached and
+        up to date, None otherwise. Must be called with self._lock held.
+        """
+        if type(key) is int:
+            if key >= self._len:
+                raise IndexError
+            if key >= len(self._ids):
+                return None
+            id = self._ids[key]
+        elif key in self._ids:
+            id = key
+        else:
+            return None
+
+        if id in self._updated_ids:
+            return None
+        return self._nodes[id]
+
+    def _getitem(self, key):
+        """ Returns the node `key`, fetching it from the server if needed.
+        Must be called with self._lock held.
+        """
+
+        # First, a bit of house keeping: apply pending invalidations
+        self._process_invalidations()
 
         # Then, let see what the user want:
         if type(key) is int:
@@ -164,8 +427,25 @@ class NodesProxy:
             if key >= self._len:
                 raise IndexError
 
-            # not downloaded enough nodes yet?
+            # not downloaded enough nodes yet? first time, get them all at once
+            if key >= len(self._ids) and not self._prefetched:
+                self._prefetch()
+
+            # the invalidations received meanwhile may only concern known
+            # nodes (eg, if the notification of a new node was lost while
+            # other nodes keep changing): past the propagation timeout,
+            # re-synchronise with the server
+            deadline = time.time() + self.propagation_timeout
             while key >= len(self._ids):
+                if time.time() > deadline:
+                    logger.warning("Node #%d still missing after %.2fsec. "
+                                   "Re-synchronising with the server." % (key, self.propagation_timeout))
+                    self._get_missing_nodes()
+                    if key >= self._len:
+                        raise IndexError
+                    deadline = time.time() + self.propagation_timeout
+                    continue
+
                 self._get_more_node()
 
             id = self._ids[key]
@@ -195,7 +475,10 @@ class NodesProxy:
                 return self._nodes[key]
 
     def __len__(self):
-        return self._len
+        with self._lock:
+            if not self._fetching:
+                self._process_invalidations()
+            return self._len
 
     def append(self, nodes):
         """ Adds one or several new nodes to the node set.
@@ -208,7 +491,7 @@ class NodesProxy:
         return self.update(nodes)
 
     @profile
-    def update(self, nodes):
+    def update(self, nodes, fields=None):
         """ Update the value of one or several nodes in the node set.
         If the node(s) do(es) not exist yet, add them.
 
@@ -235,7 +518,14 @@ class NodesProxy:
         However, once accessed once, nodes keep their index (until a
         node with a smaller index is removed).
 
+        If only some fields of existing nodes have changed (typically, the
+        transformation of tracked objects), `fields` can list them: only
+        these fields are sent to the server and propagated to the other
+        clients. Nodes that do not exist yet are not created in that case.
+
         :param nodes: a single node instance, or a sequence of node instances.
+        :param fields: if not None, the list of fields to update (see
+        underworlds.types.NODE_FIELDS)
         """
 
         # if for some reason, the previous non-blocking call to update the node is
@@ -246,6 +536,16 @@ class NodesProxy:
         if not isinstance(nodes, list):
             nodes = [nodes]
 
+        if fields is not None:
+            deltas = [gRPC.NodeDelta(node=node.serialize(gRPC.Node, fields), fields=fields)
+                      for node in nodes]
+
+            self.update_future = self._ctx.rpc.updateNodesFields.future(
+                                     gRPC.NodeDeltasInContext(context=self._server_ctx,
+                                                              deltas=deltas),
+                                     _TIMEOUT_SECONDS)
+            return
+
         gRPCNodes = [node.serialize(gRPC.Node) for node in nodes]
 
         self.update_future = self._ctx.rpc.updateNodes.future(
@@ -288,6 +588,51 @@ class NodesProxy:
                                  _TIMEOUT_SECONDS)
 
 
+class SceneSnapshot(object):
+    """ A read-only copy of a scene, as it was at a given version (see
+    SceneProxy.at).
+
+    Like SceneProxy, it exposes the scene's `rootnode` and its `nodes`
+    (which can be iterated, or accessed by index or by ID), and can
+    therefore be passed to the helpers expecting a scene (see
+    underworlds.helpers.geometry for instance).
+    """
+
+    def __init__(self, version, rootnode, nodes):
+
+        self.version = version
+
+        self.nodes = _SnapshotNodes(nodes)
+        self.rootnode = self.nodes[rootnode]
+
+    def nodebyname(self, name):
+        """ Returns a list of node that have the given name (or [] if no node has this name)
+        """
+        return [n for n in self.nodes if n.name == name]
+
+class _SnapshotNodes(object):
+
+    def __init__(self, nodes):
+        self._list = nodes
+        self._nodes = {n.id: n for n in nodes}
+
+    def __getitem__(self, key):
+        if type(key) is int:
+            return self._list[key]
+        try:
+            return self._nodes[key]
+        except KeyError:
+            raise KeyError("No node with id " + key)
+
+    def __contains__(self, id):
+        return id in self._nodes
+
+    def __iter__(self):
+        return iter(self._list)
+
+    def __len__(self):
+        return len(self._list)
+
 class SceneProxy(object):
 
     def __init__(self, ctx, world):
@@ -300,6 +645,42 @@ class SceneProxy(object):
     def rootnode(self):
         return self.nodes[self.nodes.rootnode]
 
+    @property
+    def version(self):
+        """ The version of the scene after the last change notified by the
+        server (0 if no change has been notified yet).
+        """
+        return self.nodes.version
+
+    def at(self, version=None):
+        """ Returns a copy of the scene as it was at a given version.
+
+        The nodes of the copy are consistent with each other (they all come
+        from the same state of the scene), even if the scene is being
+        modified by other clients: use it to compute relations between
+        nodes, for instance. The copy is never updated.
+
+        :param version: a version of the scene (for instance,
+        SceneProxy.version after a call to waitforchanges). If None, the
+        current version.
+        :returns: a SceneSnapshot
+        :raises ValueError: if the server does not keep this version
+        anymore (only the most recent versions are kept)
+        """
+
+        sceneAt = gRPC.SceneAt(context=self.nodes._server_ctx, version=version or 0)
+
+        nodes = []
+        try:
+            for chunk in self._ctx.rpc.getSceneAt(sceneAt, _TIMEOUT_SECONDS_SCENE_LOADING):
+                if chunk.rootnode:
+                    version, rootnode = chunk.version, chunk.rootnode
+                nodes.extend(Node.deserialize(n) for n in chunk.nodes)
+        except AbortionError as e:
+            raise ValueError(e.details)
+
+        return SceneSnapshot(version, rootnode, nodes)
+
     def waitforchanges(self, timeout = None):
         """ This method blocks until either the scene has
         been updated (a node has been either updated, 
@@ -380,15 +761,32 @@ class TimelineProxy:
 
         self._situations = {}
 
-        # list of all node IDs that were once obtained.
+        # list of all situation IDs that were once obtained.
         # They may be valid or invalid (if present in _updated_ids)
-        self._ids = []
+        self._ids = IndexedIds()
+
+        # set of invalid ids (ie, situations that have remotely changed).
+        # This set is updated asynchronously from a server publisher
+        self._updated_ids = OrderedSet(self._ctx.rpc.getSituationsIds(self._server_ctx, _TIMEOUT_SECONDS).ids)
+
+        # invalidations received from the server, not yet applied to the
+        # cache (cf _process_invalidations)
+        self._invalidations = deque()
+
+        # protects the situation cache (_len, _situations, _ids,
+        # _updated_ids). It is released while waiting for the server (cf
+        # _unlocked).
+        self._lock = threading.Lock()
 
-        # list of invalid ids (ie, nodes that have remotely changed).
-        # This list is updated asynchronously from a server publisher
-        self._updated_ids = deque(self._ctx.rpc.getSituationsIds(self._server_ctx, _TIMEOUT_SECONDS).ids)
+        # one thread at a time fetches situations from the server (cf
+        # NodesProxy.__getitem__)
+        self._fetch_lock = threading.Lock()
+        self._fetching = False
 
-        self._deleted_ids = deque()
+        # max time (in sec) to wait for the notification of situations added
+        # remotely, before explicitly re-synchronising with the server
+        # (cf _get_more_situations)
+        self.propagation_timeout = _PROPAGATION_TIMEOUT_SECONDS
 
         # holds futures for non-blocking RPC calls when updating/removing nodes
         self.update_future = None
@@ -401,26 +799,30 @@ class TimelineProxy:
         self.waitforchanges_cv = threading.Condition()
         self.lastchange = None
 
+    @contextmanager
+    def _unlocked(self):
+        """ Releases self._lock (that must be held) while calling the
+        server.
+        """
+        self._lock.release()
+        try:
+            yield
+        finally:
+            self._lock.acquire()
+
     @profile
-    def _on_remotely_updated_situations(self, ids):
+    def _on_remotely_updated_situations(self, ids, situations=()):
 
-        for id in ids:
-            if id not in self._updated_ids:
-                self._updated_ids.append(id)
+        self._invalidations.append((UPDATE, list(ids), {s.id: s for s in situations}))
 
         with self.waitforchanges_cv:
             self.lastchange = (ids, UPDATE)
             self.waitforchanges_cv.notify_all()
 
     @profile
-    def _on_remotely_added_situations(self, ids):
-
+    def _on_remotely_added_situations(self, ids, situations=()):
 
-        self._len += len(ids)
-
-        for id in ids:
-            if id not in self._updated_ids:
-                self._updated_ids.append(id)
+        self._invalidations.append((NEW, list(ids), {s.id: s for s in situations}))
 
         with self.waitforchanges_cv:
             self.lastchange = (ids, NEW)
@@ -430,37 +832,117 @@ class TimelineProxy:
     @profile
     def _on_remotely_deleted_situations(self, ids):
 
-        self._len -= len(ids)
-        self._deleted_ids.extend(ids)
+        self._invalidations.append((DELETE, list(ids), None))
 
         with self.waitforchanges_cv:
             self.lastchange = (ids, DELETE)
             self.waitforchanges_cv.notify_all()
 
+    def _process_invalidations(self):
+        """ Applies to the cache the invalidations received since the last
+        call. Must be called with self._lock held.
+        """
+        while self._invalidations:
+            action, ids, payloads = self._invalidations.popleft()
+
+            if action == DELETE:
+                self._len -= len(ids)
+                for id in ids:
+                    self._updated_ids.discard(id)
+                    if id in self._situations:
+                        self._ids.remove(id)
+                        del(self._situations[id])
+                continue
+
+            if action == NEW:
+                self._len += len(ids)
+
+            for id in ids:
+                if id in payloads:
+                    if id not in self._situations:
+                        self._ids.append(id)
+                    self._situations[id] = Situation.deserialize(payloads[id])
+                    self._updated_ids.discard(id)
+                else:
+                    self._updated_ids.append(id)
+
+    def _wait_for_invalidations(self):
+        """ Waits until at least one invalidation is received, or
+        `propagation_timeout` is elapsed, and applies the received
+        invalidations. Must be called with self._lock held.
+        """
+        deadline = time.time() + self.propagation_timeout
+
+        with self._unlocked(), self.waitforchanges_cv:
+            while not self._invalidations:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.waitforchanges_cv.wait(remaining)
+
+        self._process_invalidations()
+
+    def _resync(self):
+        """ Re-synchronises the list of situations with the server, in case
+        some invalidations were lost or are late. Must be called with
+        self._lock held.
+        """
+        self._process_invalidations()
+
+        with self._unlocked():
+            ids = self._ctx.rpc.getSituationsIds(self._server_ctx, _TIMEOUT_SECONDS).ids
+        remote_ids = set(ids)
+
+        for id in list(self._ids):
+            if id not in remote_ids:
+                self._ids.remove(id)
+                del(self._situations[id])
+
+        for id in list(self._updated_ids):
+            if id not in remote_ids:
+                self._updated_ids.discard(id)
+
+        self._updated_ids.extend(id for id in ids if id not in self._ids)
+        self._len = len(ids)
+
     def _get_more_situations(self):
         
         if not self._updated_ids:
-            logger.warning("Slow propagation? Waiting for new/updated situations notifications...")
-            time.sleep(0.05) #leave some time for propagation
+            logger.debug("Waiting for new situations notifications...")
+            self._wait_for_invalidations()
+
+        if not self._updated_ids:
+            logger.warning("No notification of new situations after %.2fsec. "
+                           "Re-synchronising with the server." % self.propagation_timeout)
+            self._resync()
 
-            # still empty? we have a problem!
-            if not self._updated_ids:
-                logger.error("Inconsistency detected! The server has not"\
-                             " notified all the situations updates. Or the "\
-                             "IPC transport is really slow.")
-                raise Exception()
+        if not self._updated_ids:
+            raise IndexError("No more situations in world <%s>" % self._world.name)
 
-        # here, _updated_ids is not empty. It should not raise an exception
         id = self._updated_ids.pop()
 
         self._get_situation_from_remote(id)
 
+    def _get_missing_situations(self):
+        """ Re-synchronises with the server, and fetches the situations
+        that are not cached yet. Must be called with self._lock held.
+        """
+        self._resync()
+
+        for id in [id for id in self._updated_ids if id not in self._ids]:
+            self._updated_ids.discard(id)
+            try:
+                self._get_situation_from_remote(id)
+            except IndexError: # deleted meanwhile
+                pass
+
     def _get_situation_from_remote(self, id):
 
         sitInCtxt = gRPC.SituationInContext(context=self._server_ctx,
                                         situation=gRPC.Situation(id=id))
         try:
-            gRPCSituation = self._ctx.rpc.getSituation(sitInCtxt, _TIMEOUT_SECONDS)
+            with self._unlocked():
+                gRPCSituation = self._ctx.rpc.getSituation(sitInCtxt, _TIMEOUT_SECONDS)
         except AbortionError as e:
             raise IndexError(e.details)
 
@@ -486,17 +968,47 @@ class TimelineProxy:
 
     def __getitem__(self, key):
 
-        # First, a bit of house keeping
-        # do we have pending situations to delete?
-        if self._deleted_ids:
-            tmp = copy.copy(self._deleted_ids)
-            for id in tmp:
-                try:
-                    self._ids.remove(id)
-                    del(self._situations[id])
-                    self._deleted_ids.remove(id)
-                except ValueError:
-                    logger.warning("The situation %s is already removed. Feels like a synchro issue..." % id)
+        with self._lock:
+            if not self._fetching:
+                self._process_invalidations()
+            situation = self._cached_situation(key)
+
+        if situation is not None:
+            return situation
+
+        with self._fetch_lock, self._lock:
+            self._fetching = True
+            try:
+                return self._getitem(key)
+            finally:
+                self._fetching = False
+
+    def _cached_situation(self, key):
+        """ Returns the situation `key` (an index or an ID) if it is cached
+        and up to date, None otherwise. Must be called with self._lock held.
+        """
+        if type(key) is int:
+            if key >= self._len:
+                raise IndexError
+            if key >= len(self._ids):
+                return None
+            id = self._ids[key]
+        elif key in self._ids:
+            id = key
+        else:
+            return None
+
+        if id in self._updated_ids:
+            return None
+        return self._situations[id]
+
+    def _getitem(self, key):
+        """ Returns the situation `key`, fetching it from the server if
+        needed. Must be called with self._lock held.
+        """
+
+        # First, a bit of house keeping: apply pending invalidations
+        self._process_invalidations()
 
         # Then, let see what the user want:
         if type(key) is int:
@@ -505,8 +1017,19 @@ class TimelineProxy:
             if key >= self._len:
                 raise IndexError
 
-            # not downloaded enough nodes yet?
+            # not downloaded enough situations yet? Past the propagation
+            # timeout, re-synchronise with the server (cf NodesProxy._getitem)
+            deadline = time.time() + self.propagation_timeout
             while key >= len(self._ids):
+                if time.time() > deadline:
+                    logger.warning("Situation #%d still missing after %.2fsec. "
+                                   "Re-synchronising with the server." % (key, self.propagation_timeout))
+                    self._get_missing_situations()
+                    if key >= self._len:
+                        raise IndexError
+                    deadline = time.time() + self.propagation_timeout
+                    continue
+
                 self._get_more_situations()
 
             id = self._ids[key]
@@ -536,7 +1059,10 @@ class TimelineProxy:
                 return self._situations[key]
 
     def __len__(self):
-        return self._len
+        with self._lock:
+            if not self._fetching:
+                self._process_invalidations()
+            return self._len
 
     def __repr__(self):
         return "TimelineProxy %s" % [str(s) for s in self._situations]
@@ -722,14 +1248,22 @@ class WorldProxy:
 
     def copy_from(self, world):
         """ Creates and/or replaces the content of the world with an exact copy
-        of the given `world`.
+        of the given `world` (a world or a world name).
+
+        The copy is made by the server: the nodes and situations are not
+        transferred. The local copy of the world is updated through the
+        invalidations that follow.
+
+        :raises ValueError: if `world` does not exist
         """
-        req = {"client":self._ctx.id,
-               "world": self._world.name,
-               "req": "deepcopy %s" % (world.name)}
+        source = world.name if isinstance(world, WorldProxy) else world
 
-        self._ctx.rpc.send_json(req)
-        self._ctx.rpc.recv() #ack
+        worldCopy = gRPC.WorldCopy(context=gRPC.Context(client=self._ctx.id, world=self.name),
+                                   source=source)
+        try:
+            self._ctx.rpc.copyWorld(worldCopy, _TIMEOUT_SECONDS)
+        except AbortionError as e:
+            raise ValueError(e.details)
 
     def __str__(self):
         return self.name
@@ -776,12 +1310,15 @@ class InvalidationServer(gRPC.BetaUnderworldsInvalidationServicer):
         target, action, world, ids = invalidation.target, invalidation.type, invalidation.world, invalidation.ids
 
         if target == gRPC.Invalidation.SCENE:
+            nodes = self.ctx.worlds[world].scene.nodes
+            nodes.version = max(nodes.version, invalidation.version)
+
             if action == UPDATE:
                 logger.debug("Server notification: nodes updated: " + str(ids))
-                self.ctx.worlds[world].scene.nodes._on_remotely_updated_nodes(ids)
+                self.ctx.worlds[world].scene.nodes._on_remotely_updated_nodes(ids, invalidation.deltas, invalidation.nodes)
             elif action == NEW:
                 logger.debug("Server notification: nodes added: " + str(ids))
-                self.ctx.worlds[world].scene.nodes._on_remotely_added_nodes(ids)
+                self.ctx.worlds[world].scene.nodes._on_remotely_added_nodes(ids, invalidation.nodes)
             elif action == DELETE:
                 logger.debug("Server notification: nodes deleted: " + str(ids))
                 self.ctx.worlds[world].scene.nodes._on_remotely_deleted_nodes(ids)
@@ -791,10 +1328,10 @@ class InvalidationServer(gRPC.BetaUnderworldsInvalidationServicer):
         elif target == gRPC.Invalidation.TIMELINE:
             if action == UPDATE:
                 logger.debug("Server notification: situations updated: " + str(ids))
-                self.ctx.worlds[world].timeline._on_remotely_updated_situations(ids)
+                self.ctx.worlds[world].timeline._on_remotely_updated_situations(ids, invalidation.situations)
             elif action == NEW:
                 logger.debug("Server notification: situations added: " + str(ids))
-                self.ctx.worlds[world].timeline._on_remotely_added_situations(ids)
+                self.ctx.worlds[world].timeline._on_remotely_added_situations(ids, invalidation.situations)
             elif action == DELETE:
                 logger.debug("Server notification: situations deleted: " + str(ids))
                 self.ctx.worlds[world].timeline._on_remotely_deleted_situations(ids)
@@ -808,28 +1345,51 @@ class InvalidationServer(gRPC.BetaUnderworldsInvalidationServicer):
 
 class Context(object):
 
-    def __init__(self, name, host="localhost",port=50051):
+    def __init__(self, name, host="localhost",port=50051, reverse_invalidations=False, max_invalidation_rate=0, invalidation_payloads=False, mesh_cache_size=_MESH_CACHE_SIZE, mesh_cache_dir=None):
+        """
+        :param reverse_invalidations: if True, the context starts its own
+        invalidation server on a random port, and the underworlds server
+        connects back to it to send invalidations. Otherwise (default),
+        invalidations are streamed from the underworlds server over the
+        context's connection (see Context._process_invalidations), unless
+        the server already streams the invalidations of too many clients:
+        the context then falls back to its own invalidation server.
+        :param max_invalidation_rate: max rate (in Hz) at which the server
+        notifies this context of remote changes. Changes occuring in between
+        are merged together by the server. Useful for slow readers of fast
+        changing worlds. 0 (default) means no limit.
+        :param invalidation_payloads: if True, the server sends the new
+        content of the nodes/situations along with their invalidations: the
+        local cache is updated without fetching them back. This saves one
+        roundtrip per change, at the cost of receiving the content of
+        changes that the client might never read. Ignored if
+        max_invalidation_rate is set.
+        :param mesh_cache_size: max size (in bytes) of the meshes kept in
+        memory once retrieved from the server (see Context.mesh).
+        :param mesh_cache_dir: if set, meshes are also cached in this
+        directory (typically, underworlds.helpers.meshcache.DEFAULT_DIRECTORY),
+        and re-used across runs. Defaults to the value of the UWDS_MESH_CACHE
+        environment variable, if set.
+        """
 
         self.name = name
         self.worlds = WorldsProxy(self)
 
-        self.invalidation_port = 0
-
-        while self.invalidation_port == 0:
-            invalidation_port = random.randint(port + 1,60000)
-            logger.debug("Creating my own invalidation server on port %s..." % (invalidation_port))
-
-            self.invalidation_server = gRPC.beta_create_UnderworldsInvalidation_server(InvalidationServer(self))
-            self.invalidation_port = self.invalidation_server.add_insecure_port('[::]:%d' % invalidation_port)
-
-            if self.invalidation_port == 0:
-                logger.error("The port for my invalidation server is already in use! Trying another one...")
+        self.invalidation_handler = InvalidationServer(self)
 
+        self.invalidation_server = None
+        self.invalidation_port = 0
 
-        self.invalidation_server.start()
+        self._invalidation_stream = None
+        self._invalidation_thread = None
+        self._closing = False
 
-        logger.debug("Invalidation server created")
+        if mesh_cache_dir is None and os.environ.get("UWDS_MESH_CACHE"):
+            mesh_cache_dir = os.environ["UWDS_MESH_CACHE"]
+        self.meshes = MeshCache(mesh_cache_size, mesh_cache_dir)
 
+        if reverse_invalidations:
+            self._start_invalidation_server(port)
 
         if "UWDS_SERVER" in os.environ and os.environ["UWDS_SERVER"] != "":
             if ":" in os.environ["UWDS_SERVER"]:
@@ -845,9 +1405,27 @@ class Context(object):
             channel = implementations.insecure_channel(host, port)
             self.rpc = gRPC.beta_create_Underworlds_stub(channel)
 
-            self.id = self.rpc.helo(gRPC.Welcome(name=name,
-                                                 host="localhost", 
-                                                 invalidation_server_port=self.invalidation_port), _TIMEOUT_SECONDS).id
+            welcome = gRPC.Welcome(name=name,
+                                   host="localhost",
+                                   invalidation_server_port=self.invalidation_port,
+                                   stream_invalidations=not reverse_invalidations,
+                                   max_invalidation_rate=max_invalidation_rate,
+                                   invalidation_payloads=invalidation_payloads)
+            try:
+                self.id = self.rpc.helo(welcome, _TIMEOUT_SECONDS).id
+            except AbortionError as e:
+                if reverse_invalidations or e.code != beta_interfaces.StatusCode.RESOURCE_EXHAUSTED:
+                    raise
+
+                # the server can not stream more invalidations (cf
+                # Server.helo): falls back to our own invalidation server
+                logger.warning("The underworlds server can not stream the invalidations of "
+                               "<%s>: using reverse invalidations instead." % name)
+                reverse_invalidations = True
+                self._start_invalidation_server(port)
+                welcome.invalidation_server_port = self.invalidation_port
+                welcome.stream_invalidations = False
+                self.id = self.rpc.helo(welcome, _TIMEOUT_SECONDS).id
         except NetworkError as e:
             logger.fatal("Underworlds server unreachable on %s:%d! Is it started?\n"
                          "Set UWDS_SERVER=host:port if underworlded is running on a different machine.\n"
@@ -860,6 +1438,48 @@ class Context(object):
 
         logger.debug("<%s> connected to the underworlds server." % self.name)
 
+        if not reverse_invalidations:
+            self._invalidation_stream = self.rpc.subscribe(gRPC.Client(id=self.id),
+                                                           _TIMEOUT_SECONDS_INVALIDATION_STREAM)
+            self._invalidation_thread = threading.Thread(target=self._process_invalidations,
+                                                         name="invalidations for %s" % name)
+            self._invalidation_thread.daemon = True
+            self._invalidation_thread.start()
+
+    def _start_invalidation_server(self, port):
+        """ Starts the invalidation server of the context, on a random port
+        above the port of the underworlds server.
+        """
+        while self.invalidation_port == 0:
+            invalidation_port = random.randint(port + 1,60000)
+            logger.debug("Creating my own invalidation server on port %s..." % (invalidation_port))
+
+            self.invalidation_server = gRPC.beta_create_UnderworldsInvalidation_server(self.invalidation_handler)
+            self.invalidation_port = self.invalidation_server.add_insecure_port('[::]:%d' % invalidation_port)
+
+            if self.invalidation_port == 0:
+                logger.error("The port for my invalidation server is already in use! Trying another one...")
+
+        self.invalidation_server.start()
+        logger.debug("Invalidation server created")
+
+    def _process_invalidations(self):
+        """ Dispatches the invalidations received on the invalidation stream
+        until the stream is closed.
+        """
+        try:
+            for invalidation in self._invalidation_stream:
+                try:
+                    self.invalidation_handler.emitInvalidation(invalidation, None)
+                except Exception:
+                    logger.exception("Error while processing an invalidation for world <%s>" % invalidation.world)
+        except AbortionError as e:
+            if not self._closing:
+                logger.error("The invalidation stream of [%s] has been interrupted! "
+                             "Original error: %s" % (self.name, str(e)))
+
+        logger.debug("The invalidation stream of [%s] is closed." % self.name)
+
 
     def reset(self):
         """ Hard reset of Underworlds: all the worlds are deleted.
@@ -898,24 +1518,152 @@ class Context(object):
                               _TIMEOUT_SECONDS)
         return ok.value
 
+    def has_meshes(self, ids):
+        """Returns, for each of the given mesh IDs, whether the mesh is
+        already available on the server (in one single request).
+
+        :returns: a list of booleans, in the same order as ids
+        """
+        res = self.rpc.hasMeshes(gRPC.MeshIds(client=gRPC.Client(id=self.id),
+                                              ids=ids),
+                                 _TIMEOUT_SECONDS)
+        bitmap = bytearray(res.bitmap)
+        return [bool(bitmap[i // 8] & (1 << (i % 8))) for i in range(len(ids))]
+
     def mesh(self, id):
-        mesh = self.rpc.getMesh(gRPC.MeshInContext(client=gRPC.Client(id=self.id),
-                                                   mesh=gRPC.Mesh(id=id)),
-                              _TIMEOUT_SECONDS_MESH_LOADING)
-        return MeshData.deserialize(mesh)
+        """Returns a mesh (as a MeshData object) from its ID.
+
+        Meshes are cached (see Context.meshes): they are only retrieved from
+        the server the first time.
+
+        The mesh is streamed from the server in chunks. If the transfer is
+        interrupted, it is resumed where it stopped (up to
+        _MESH_TRANSFER_ATTEMPTS times).
+        """
+        mesh = self.meshes.get(id)
+        if mesh is not None:
+            return mesh
+
+        data = bytearray()
+        size = None
+
+        for attempt in range(_MESH_TRANSFER_ATTEMPTS):
+            transfer = gRPC.MeshTransfer(client=gRPC.Client(id=self.id),
+                                         id=id,
+                                         offset=len(data))
+            try:
+                for chunk in self.rpc.getMeshChunks(transfer, _TIMEOUT_SECONDS_MESH_LOADING):
+                    del data[chunk.offset:]
+                    data.extend(chunk.data)
+                    size = chunk.size
+                break
+            except AbortionError as e:
+                if e.code == beta_interfaces.StatusCode.NOT_FOUND \
+                   or attempt == _MESH_TRANSFER_ATTEMPTS - 1:
+                    raise
+                logger.warning("Download of mesh <%s> interrupted (%s). Resuming..." % (id, e.details))
+
+        if size is not None and len(data) != size:
+            raise RuntimeError("Incomplete download of mesh <%s>" % id)
+
+        mesh = MeshData.deserialize(gRPC.Mesh.FromString(bytes(data)))
+        self.meshes.put(mesh)
+        return mesh
 
     def push_mesh(self, mesh):
+        """Sends a mesh (MeshData object) to the server.
+
+        Meshes larger than _MESH_CHUNK_SIZE are uploaded in chunks. If the
+        upload is interrupted, it is resumed where it stopped (up to
+        _MESH_TRANSFER_ATTEMPTS times).
+        """
 
         starttime = time.time()
+
+        gRPCMesh = mesh.serialize(gRPC.Mesh)
+
         try:
-            self.rpc.pushMesh(gRPC.MeshInContext(client=gRPC.Client(id=self.id),
-                                             mesh=mesh.serialize(gRPC.Mesh)),
-                              _TIMEOUT_SECONDS_MESH_LOADING)
+            if gRPCMesh.ByteSize() > _MESH_CHUNK_SIZE:
+                self._push_mesh_chunks(mesh.id, gRPCMesh.SerializeToString())
+            else:
+                self.rpc.pushMesh(gRPC.MeshInContext(client=gRPC.Client(id=self.id),
+                                                 mesh=gRPCMesh),
+                                  _TIMEOUT_SECONDS_MESH_LOADING)
         except ExpirationError:
             logger.error("Timeout while trying to push a mesh to the server!")
+            return
+
+        self.meshes.put(mesh)
 
         logger.info("Pushed mesh <%s> in %.2fsec" % (mesh.id, time.time() - starttime))
 
+    def push_meshes(self, meshes):
+        """Sends several meshes (MeshData objects) to the server.
+
+        The meshes are streamed to the server in one single request, except
+        for the meshes larger than _MESH_CHUNK_SIZE, that are uploaded in
+        chunks (see Context.push_mesh).
+
+        :param meshes: a sequence (or any iterable) of meshes. It is
+        consumed as the meshes are sent.
+        """
+
+        starttime = time.time()
+
+        client = gRPC.Client(id=self.id)
+        large_meshes = []
+        pushed = []
+
+        def small_meshes():
+            for mesh in meshes:
+                gRPCMesh = mesh.serialize(gRPC.Mesh)
+                if gRPCMesh.ByteSize() > _MESH_CHUNK_SIZE:
+                    large_meshes.append(mesh)
+                else:
+                    pushed.append(mesh)
+                    yield gRPC.MeshInContext(client=client, mesh=gRPCMesh)
+
+        try:
+            self.rpc.pushMeshes(small_meshes(), _TIMEOUT_SECONDS_MESH_LOADING)
+        except ExpirationError:
+            logger.error("Timeout while trying to push meshes to the server!")
+            return
+
+        for mesh in pushed:
+            self.meshes.put(mesh)
+
+        for mesh in large_meshes:
+            self.push_mesh(mesh)
+
+        logger.info("Pushed %d meshes in %.2fsec" % (len(pushed) + len(large_meshes), time.time() - starttime))
+
+    def _push_mesh_chunks(self, id, data):
+
+        client = gRPC.Client(id=self.id)
+
+        def chunks(start):
+            for offset in range(start, len(data), _MESH_CHUNK_SIZE):
+                yield gRPC.MeshChunk(client=client,
+                                     id=id,
+                                     offset=offset,
+                                     size=len(data),
+                                     data=data[offset:offset + _MESH_CHUNK_SIZE])
+
+        for attempt in range(_MESH_TRANSFER_ATTEMPTS):
+
+            # resume a former, interrupted upload of the same mesh, if any
+            status = self.rpc.getMeshUploadStatus(gRPC.MeshTransfer(client=client, id=id),
+                                                  _TIMEOUT_SECONDS)
+            offset = status.offset if status.size == len(data) else 0
+
+            try:
+                self.rpc.pushMeshChunks(chunks(offset), _TIMEOUT_SECONDS_MESH_LOADING)
+                break
+            except AbortionError as e:
+                if attempt == _MESH_TRANSFER_ATTEMPTS - 1:
+                    raise
+                logger.warning("Upload of mesh <%s> interrupted (%s). Resuming..." % (id, e.details))
+
     def __enter__(self):
         return self
 
@@ -924,8 +1672,17 @@ class Context(object):
 
     def close(self):
         logger.debug("Closing context [%s]..." % self.name)
+        self._closing = True
         self.rpc.byebye(gRPC.Client(id=self.id), _TIMEOUT_SECONDS)
-        self.invalidation_server.stop(1).wait()
+
+        if self.invalidation_server:
+            self.invalidation_server.stop(1).wait()
+
+        if self._invalidation_thread:
+            # the server closes the stream upon byebye
+            self._invalidation_thread.join(_TIMEOUT_SECONDS)
+            if self._invalidation_thread.is_alive():
+                self._invalidation_stream.cancel()
         logger.debug("The context [%s] is now closed." % self.name)
 
     def __repr__(self):
@@ -0,0 +1,326 @@
+""" An asyncio implementation of the underworlds server, based on grpc.aio
+(python 3 and grpcio >= 1.32 only). Selected with
+underworlds.server.start(aio=True).
+
+AsyncServer implements the same service as underworlds.server.Server, whose
+request processing it reuses, but all the requests are processed by a single
+event loop: a connected client costs no thread, even while its invalidations
+are streamed to it (cf subscribe). This is meant for servers with many
+clients, most of them idle readers.
+
+The requests that do not touch the worlds or the stored meshes are processed
+by the event loop itself. All the others may block (on the lock of a world,
+or on disk I/O when the worlds or the meshes are stored on disk): they run in
+a thread pool, and only hold one of its threads while they are processed.
+"""
+
+import asyncio
+import threading
+import collections
+import queue
+import logging;logger = logging.getLogger("underworlds.server")
+
+from concurrent import futures
+import grpc
+import grpc.aio
+
+import underworlds.underworlds_pb2 as gRPC
+from underworlds.server import Server, _MAX_PENDING_INVALIDATIONS
+
+# period (in sec) at which invalidation streams check whether their client is
+# still active. Streams are closed right away when the client disconnects
+# (cf AsyncServer.byebye): this only matters for clients deactivated by the
+# server (eg, too slow to read their invalidations)
+_INVALIDATION_POLL_PERIOD = 1
+
+# returned by next() once a stream is exhausted (cf AsyncServer._stream)
+_END_OF_STREAM = object()
+
+class _InvalidationQueue(object):
+    """ Where the invalidations streamed to a client are stored until sent
+    (cf Client.invalidations). put_nowait can be called from any thread
+    (invalidations of rate-limited clients are sent by a timer), while get
+    is a coroutine, run by the event loop.
+    """
+
+    def __init__(self, loop, maxsize):
+        self._loop = loop
+        self._maxsize = maxsize
+        self._items = collections.deque()
+        self._lock = threading.Lock()
+        self._available = asyncio.Event()
+
+    def put_nowait(self, item):
+        with self._lock:
+            if len(self._items) >= self._maxsize:
+                raise queue.Full
+            self._items.append(item)
+        self._loop.call_soon_threadsafe(self._available.set)
+
+    def wake(self):
+        """ Wakes up the coroutine waiting for an invalidation, if any (eg,
+        to let it know that the client is disconnected).
+        """
+        self._loop.call_soon_threadsafe(self._available.set)
+
+    async def get(self, timeout):
+        """ Returns the next invalidation, or None if none is available after
+        `timeout` seconds.
+        """
+        with self._lock:
+            if self._items:
+                return self._items.popleft()
+            self._available.clear()
+
+        try:
+            await asyncio.wait_for(self._available.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        with self._lock:
+            return self._items.popleft() if self._items else None
+
+class AsyncServer(Server):
+    """ The underworlds service, with asynchronous handlers.
+
+    Must be created by a coroutine running in the event loop of the server.
+    """
+
+    def __init__(self, mesh_store=None, world_store=None):
+        super().__init__(mesh_store, world_store)
+        self._loop = asyncio.get_event_loop()
+
+    def _new_invalidation_queue(self):
+        return _InvalidationQueue(self._loop, _MAX_PENDING_INVALIDATIONS)
+
+    async def _run(self, method, *args):
+        """ Runs a blocking request handler of Server in the thread pool.
+        """
+        return await self._loop.run_in_executor(None, method, *args)
+
+    async def _stream(self, generator):
+        """ Runs a blocking streaming request handler of Server in the
+        thread pool, one message at a time.
+        """
+        while True:
+            message = await self._loop.run_in_executor(None, next, generator, _END_OF_STREAM)
+            if message is _END_OF_STREAM:
+                return
+            yield message
+
+    ############ GENERAL
+    async def helo(self, client, context):
+        return super().helo(client, context)
+
+    async def byebye(self, client, context):
+
+        with self._client_lock:
+            c = self._clients.get(client.id)
+
+        # waits for the invalidations being sent to the client
+        res = await self._run(super().byebye, client, context)
+
+        # closes the invalidation stream of the client right away
+        if c is not None and c.invalidations is not None:
+            c.invalidations.wake()
+
+        return res
+
+    async def subscribe(self, client, context):
+        logger.debug("Got <subscribe> from %s" % (self._clientname(client.id)))
+
+        with self._client_lock:
+            c = self._clients[client.id]
+
+        if c.invalidations is None:
+            logger.warning("%s attempted to subscribe to invalidations, but "
+                           "it has its own invalidation server" % c.name)
+            context.set_details("Client %s did not request streamed invalidations in <helo>" % c.name)
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            return
+
+        while c.isactive and not context.done():
+            invalidation = await c.invalidations.get(_INVALIDATION_POLL_PERIOD)
+            if invalidation is not None:
+                yield invalidation
+
+        logger.debug("<subscribe> completed: invalidation stream of %s closed" % c.name)
+
+    async def uptime(self, client, context):
+        return super().uptime(client, context)
+
+    async def topology(self, client, context):
+        return await self._run(super().topology, client, context)
+
+    async def reset(self, client, context):
+        return await self._run(super().reset, client, context)
+
+    async def copyWorld(self, worldCopy, context):
+        return await self._run(super().copyWorld, worldCopy, context)
+
+    ############ NODES
+    async def getNodesLen(self, ctxt, context):
+        return await self._run(super().getNodesLen, ctxt, context)
+
+    async def getNodesIds(self, ctxt, context):
+        return await self._run(super().getNodesIds, ctxt, context)
+
+    async def getRootNode(self, ctxt, context):
+        return await self._run(super().getRootNode, ctxt, context)
+
+    async def getNode(self, nodeInCtxt, context):
+        return await self._run(super().getNode, nodeInCtxt, context)
+
+    async def getNodes(self, nodesInCtxt, context):
+        return await self._run(super().getNodes, nodesInCtxt, context)
+
+    async def getScene(self, ctxt, context):
+        async for chunk in self._stream(super().getScene(ctxt, context)):
+            yield chunk
+
+    async def getSceneAt(self, sceneAt, context):
+        async for chunk in self._stream(super().getSceneAt(sceneAt, context)):
+            yield chunk
+
+    async def updateNodes(self, nodesInCtxt, context):
+        return await self._run(super().updateNodes, nodesInCtxt, context)
+
+    async def updateNodesFields(self, deltasInCtxt, context):
+        return await self._run(super().updateNodesFields, deltasInCtxt, context)
+
+    async def deleteNodes(self, nodesInCtxt, context):
+        return await self._run(super().deleteNodes, nodesInCtxt, context)
+
+    ############ TIMELINES
+    async def getSituationsLen(self, ctxt, context):
+        return await self._run(super().getSituationsLen, ctxt, context)
+
+    async def getSituationsIds(self, ctxt, context):
+        return await self._run(super().getSituationsIds, ctxt, context)
+
+    async def getSituation(self, sitInCtxt, context):
+        return await self._run(super().getSituation, sitInCtxt, context)
+
+    async def timelineOrigin(self, ctxt, context):
+        return await self._run(super().timelineOrigin, ctxt, context)
+
+    async def updateSituations(self, sitInCtxt, context):
+        return await self._run(super().updateSituations, sitInCtxt, context)
+
+    async def deleteSituations(self, sitInCtxt, context):
+        return await self._run(super().deleteSituations, sitInCtxt, context)
+
+    ############ MESHES
+    async def hasMesh(self, meshInCtxt, context):
+        return super().hasMesh(meshInCtxt, context)
+
+    async def hasMeshes(self, meshIds, context):
+        return super().hasMeshes(meshIds, context)
+
+    async def getMesh(self, meshInCtxt, context):
+        return await self._run(super().getMesh, meshInCtxt, context)
+
+    async def pushMesh(self, meshInCtxt, context):
+        return await self._run(super().pushMesh, meshInCtxt, context)
+
+    async def pushMeshes(self, meshInCtxt_iterator, context):
+        logger.debug("Got <pushMeshes>")
+
+        nb_meshes = 0
+        async for meshInCtxt in meshInCtxt_iterator:
+            await self._run(self._push_mesh, meshInCtxt)
+            nb_meshes += 1
+
+        logger.debug("<pushMeshes> completed (%d meshes)" % nb_meshes)
+        return gRPC.Empty()
+
+    async def getMeshChunks(self, transfer, context):
+        async for chunk in self._stream(super().getMeshChunks(transfer, context)):
+            yield chunk
+
+    async def pushMeshChunks(self, chunk_iterator, context):
+        logger.debug("Got <pushMeshChunks>")
+
+        status = gRPC.MeshTransfer()
+
+        async for chunk in chunk_iterator:
+            chunk_status = await self._run(self._push_mesh_chunk, chunk, context)
+            if chunk_status is None:
+                return status
+            status = chunk_status
+
+        logger.debug("<pushMeshChunks> completed")
+        return status
+
+    async def getMeshUploadStatus(self, transfer, context):
+        return super().getMeshUploadStatus(transfer, context)
+
+class AsyncServerThread(object):
+    """ Runs an AsyncServer in the event loop of a dedicated thread.
+
+    Offers the same interface as the grpc.Server returned by
+    underworlds.server.start (add_insecure_port, start, stop).
+    """
+
+    def __init__(self, mesh_store=None, world_store=None, workers=None, options=None, maximum_concurrent_rpcs=None):
+        """
+        :param workers: size of the thread pool running the blocking
+        requests
+        :param options, maximum_concurrent_rpcs: see grpc.aio.server
+        """
+
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(futures.ThreadPoolExecutor(max_workers=workers))
+
+        self._thread = threading.Thread(target=self._run, name="underworlds aio server")
+        self._thread.daemon = True
+        self._thread.start()
+
+        self.server = self._call(self._create(mesh_store, world_store, options, maximum_concurrent_rpcs))
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        self._loop.close()
+
+    def _call(self, coroutine):
+        """ Runs a coroutine in the event loop of the server, and returns its
+        result.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _create(self, mesh_store, world_store, options, maximum_concurrent_rpcs):
+        server = grpc.aio.server(options=options, maximum_concurrent_rpcs=maximum_concurrent_rpcs)
+        gRPC.add_UnderworldsServicer_to_server(AsyncServer(mesh_store, world_store), server)
+        return server
+
+    def add_insecure_port(self, address):
+
+        async def add():
+            return self.server.add_insecure_port(address)
+
+        return self._call(add())
+
+    def start(self):
+        self._call(self.server.start())
+
+    def stop(self, grace):
+        """ Stops the server, and its event loop.
+
+        :returns: a threading.Event, set once the server is stopped.
+        """
+
+        stopped = threading.Event()
+
+        async def stop():
+            await self.server.stop(grace)
+            # waits for the requests still running in the thread pool
+            await self._loop.shutdown_default_executor()
+            self._loop.stop()
+            stopped.set()
+
+        asyncio.run_coroutine_threadsafe(stop(), self._loop)
+
+        return stopped
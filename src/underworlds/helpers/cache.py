@@ -0,0 +1,161 @@
+""" Containers used by the client-side proxies (NodesProxy and TimelineProxy)
+to keep track of the ids of the nodes/situations they cache.
+
+They are designed so that the cost of processing an invalidation does not
+depend on the size of the world.
+"""
+
+import bisect
+from collections import OrderedDict
+
+class OrderedSet(object):
+    """ A set that remembers the insertion order of its items.
+
+    Membership tests, insertions and removals (at both ends or anywhere) are
+    all O(1).
+    """
+
+    def __init__(self, items=()):
+        self._items = OrderedDict()
+        self.extend(items)
+
+    def append(self, item):
+        """ Adds an item at the end of the set. Does nothing (in particular,
+        does not move the item) if the item is already present.
+        """
+        if item not in self._items:
+            self._items[item] = None
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def pop(self):
+        """ Removes and returns the last item. Raises KeyError if empty.
+        """
+        return self._items.popitem(last=True)[0]
+
+    def popleft(self):
+        """ Removes and returns the first item. Raises KeyError if empty.
+        """
+        return self._items.popitem(last=False)[0]
+
+    def remove(self, item):
+        """ Removes an item. Raises KeyError if not present.
+        """
+        del self._items[item]
+
+    def discard(self, item):
+        self._items.pop(item, None)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+    __nonzero__ = __bool__ # python2
+
+    def __repr__(self):
+        return "OrderedSet(%s)" % list(self._items)
+
+
+_REMOVED = object() # marker for removed ids in IndexedIds
+
+# IndexedIds is compacted once the removed ids exceed this share of its list
+_MAX_REMOVED_SHARE = 0.25
+
+class IndexedIds(object):
+    """ An ordered list of unique ids, with O(1) membership test, O(1)
+    append and O(log k) id <-> index lookups (k: number of removed ids).
+
+    Removals are amortized: removed ids are only marked as such (and their
+    positions recorded), and the list is only compacted once they exceed a
+    quarter of it. Removing k ids therefore costs one O(n) pass, instead of
+    k passes with list.remove, even if the list is accessed in between.
+    """
+
+    def __init__(self, ids=()):
+        self._ids = []
+        self._positions = {} # id -> index in self._ids
+        self._removed = [] # sorted indices of the removed ids in self._ids
+
+        for id in ids:
+            self.append(id)
+
+    def append(self, id):
+        """ Adds an id at the end of the list. Does nothing if the id is
+        already present.
+        """
+        if id in self._positions:
+            return
+        self._positions[id] = len(self._ids)
+        self._ids.append(id)
+
+    def remove(self, id):
+        """ Removes an id. Raises ValueError if not present (like
+        list.remove).
+        """
+        try:
+            index = self._positions.pop(id)
+        except KeyError:
+            raise ValueError("%s not in list" % id)
+
+        self._ids[index] = _REMOVED
+        bisect.insort(self._removed, index)
+
+        # trailing removed ids are simply dropped
+        while self._removed and self._removed[-1] == len(self._ids) - 1:
+            self._ids.pop()
+            self._removed.pop()
+
+        if len(self._removed) > len(self._ids) * _MAX_REMOVED_SHARE:
+            self._compact()
+
+    def _compact(self):
+        self._ids = [id for id in self._ids if id is not _REMOVED]
+        self._positions = {id: index for index, id in enumerate(self._ids)}
+        self._removed = []
+
+    def index(self, id):
+        """ Returns the index of an id. Raises ValueError if not present.
+        """
+        if id not in self._positions:
+            raise ValueError("%s not in list" % id)
+        position = self._positions[id]
+        return position - bisect.bisect_left(self._removed, position)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("list index out of range")
+
+        # skips the removed ids before the index-th id: their number is the
+        # number of removed positions p (at rank r) such that p - r <= index
+        removed = self._removed
+        lo, hi = 0, len(removed)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if removed[mid] - mid <= index:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._ids[index + lo]
+
+    def __contains__(self, id):
+        return id in self._positions
+
+    def __iter__(self):
+        return iter([id for id in self._ids if id is not _REMOVED])
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __repr__(self):
+        return "IndexedIds(%s)" % list(self)
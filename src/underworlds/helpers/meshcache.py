@@ -0,0 +1,150 @@
+""" Client-side cache of meshes (cf Context.mesh).
+
+Mesh IDs are computed from the content of the meshes (see MeshData): a given
+ID always refers to the same mesh, and cached meshes never need to be
+invalidated.
+
+Meshes are kept in memory (the least recently used meshes are dropped once
+the cache exceeds its size) and, optionally, on disk: each mesh is then
+stored in its own directory, as numpy files that are memory-mapped when the
+mesh is loaded back.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+import logging; logger = logging.getLogger("underworlds.meshcache")
+
+import numpy
+
+from underworlds.types import MeshData
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "underworlds", "meshes")
+
+# only meshes whose ID can safely be used as a file name are stored on disk
+_FILENAME_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+_ARRAYS = ["vertices", "faces", "normals", "diffuse"]
+
+def _nbytes(mesh):
+    return mesh.vertices.nbytes + mesh.faces.nbytes + mesh.normals.nbytes
+
+class MeshCache(object):
+    """ A LRU cache of meshes, with a budget in bytes, optionally backed by a
+    directory on disk.
+
+    Thread-safe. Several processes can share the same directory.
+    """
+
+    def __init__(self, max_bytes, directory=None):
+        """
+        :param max_bytes: max total size of the meshes kept in memory. Meshes
+        larger than that are not cached in memory at all.
+        :param directory: if not None, meshes are also stored in (and loaded
+        from) this directory. The directory is never cleaned up: delete it
+        to free the disk space.
+        """
+
+        self.max_bytes = max_bytes
+        self.directory = directory
+
+        self._meshes = OrderedDict() # mesh ID -> MeshData, least recently used first
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+        if directory is not None and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError: # created in the meantime by another process?
+                if not os.path.isdir(directory):
+                    raise
+
+    def get(self, id):
+        """ Returns a mesh from its ID, or None if the mesh is not cached.
+        """
+
+        with self._lock:
+            mesh = self._meshes.pop(id, None)
+            if mesh is not None:
+                self._meshes[id] = mesh
+                return mesh
+
+        mesh = self._load(id)
+        if mesh is not None:
+            self._add(mesh)
+        return mesh
+
+    def put(self, mesh):
+        """ Adds a mesh to the cache (and stores it on disk, if the cache is
+        backed by a directory).
+        """
+        self._add(mesh)
+        self._save(mesh)
+
+    def __contains__(self, id):
+        with self._lock:
+            return id in self._meshes
+
+    def __len__(self):
+        with self._lock:
+            return len(self._meshes)
+
+    def _add(self, mesh):
+
+        size = _nbytes(mesh)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if mesh.id in self._meshes:
+                return
+
+            self._meshes[mesh.id] = mesh
+            self._nbytes += size
+
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._meshes.popitem(last=False)
+                self._nbytes -= _nbytes(evicted)
+
+    def _path(self, id):
+        if self.directory is None or not _FILENAME_SAFE_ID.match(id):
+            return None
+        return os.path.join(self.directory, id)
+
+    def _load(self, id):
+
+        path = self._path(id)
+        if path is None or not os.path.isdir(path):
+            return None
+
+        try:
+            arrays = [numpy.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in _ARRAYS]
+        except (IOError, ValueError) as e:
+            logger.warning("Can not load mesh %s from the cache in %s: %s" % (id, self.directory, e))
+            return None
+
+        vertices, faces, normals, diffuse = arrays
+        return MeshData.from_arrays(id, vertices, faces, normals, diffuse.tolist())
+
+    def _save(self, mesh):
+
+        path = self._path(mesh.id)
+        if path is None or os.path.isdir(path):
+            return
+
+        # the mesh is written in a temporary directory, then moved in place:
+        # other processes never see partially written meshes
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for name in _ARRAYS:
+                numpy.save(os.path.join(tmp, name + ".npy"), numpy.asarray(getattr(mesh, name)))
+            os.rename(tmp, path)
+        except (IOError, OSError) as e:
+            if not os.path.isdir(path): # not saved in the meantime by another process
+                logger.warning("Can not store mesh %s in the cache in %s: %s" % (mesh.id, self.directory, e))
+            shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,180 @@
+""" Server-side storage of the meshes (cf Server.meshes).
+
+Meshes are stored as serialized gRPC Mesh messages, and sent back to clients
+as such (cf Server.getMeshChunks), without being deserialized.
+
+Two backends are available:
+
+- MemoryMeshStore keeps all the meshes in memory (default);
+- DiskMeshStore keeps the meshes in a directory, one file per mesh: they
+  survive a restart of the server. Mesh files are memory-mapped when read,
+  and only the most recently used meshes are kept in memory, up to a given
+  size.
+"""
+
+import os
+import re
+import mmap
+import binascii
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+import logging; logger = logging.getLogger("underworlds.server.meshstore")
+
+# default max size (in bytes) of the meshes kept in memory by a DiskMeshStore
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+
+_EXTENSION = ".mesh"
+
+# mesh IDs that can be used as they are as file names. Other IDs are
+# hex-encoded (and prefixed with '_')
+_FILENAME_SAFE_ID = re.compile(r"^[A-Za-z0-9-]+$")
+
+def _filename(id):
+    if _FILENAME_SAFE_ID.match(id):
+        return id + _EXTENSION
+    return "_" + binascii.hexlify(id.encode("utf-8")).decode("ascii") + _EXTENSION
+
+def _id(filename):
+    name = filename[:-len(_EXTENSION)]
+    if name.startswith("_"):
+        return binascii.unhexlify(name[1:]).decode("utf-8")
+    return name
+
+class MemoryMeshStore(object):
+    """ Keeps all the meshes in memory.
+    """
+
+    def __init__(self):
+        self._meshes = {}
+
+    def add(self, id, data):
+        """ Stores a mesh.
+
+        :param data: the serialized gRPC Mesh message
+        """
+        self._meshes[id] = data
+
+    def get(self, id):
+        """ Returns the serialized gRPC Mesh message of a mesh, as a
+        bytes-like object (supporting len() and slicing).
+        Raises KeyError if the mesh does not exist.
+        """
+        return self._meshes[id]
+
+    def __contains__(self, id):
+        return id in self._meshes
+
+    def __len__(self):
+        return len(self._meshes)
+
+class DiskMeshStore(object):
+    """ Keeps the meshes in a directory, with a LRU cache in memory.
+
+    Meshes are never removed from the directory. Meshes larger than the
+    cache are never loaded in memory: they are memory-mapped, and sent
+    chunk by chunk.
+    """
+
+    def __init__(self, directory, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        :param directory: where the meshes are stored. Created if needed.
+        Meshes already present in this directory are available right away.
+        :param cache_size: max size (in bytes) of the meshes kept in memory
+        """
+
+        self.directory = directory
+        self.cache_size = cache_size
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+
+        self._ids = set(_id(f) for f in os.listdir(directory) if f.endswith(_EXTENSION))
+
+        self._cache = OrderedDict() # mesh ID -> data, least recently used first
+        self._cache_bytes = 0
+
+        logger.info("Mesh store in %s: %d meshes available" % (directory, len(self._ids)))
+
+    def add(self, id, data):
+        """ Stores a mesh.
+
+        :param data: the serialized gRPC Mesh message
+        """
+
+        path = os.path.join(self.directory, _filename(id))
+
+        # write in a temporary file, then move it in place: the mesh files
+        # are always complete
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.rename(tmp, path)
+        except:
+            os.remove(tmp)
+            raise
+
+        with self._lock:
+            self._ids.add(id)
+            self._uncache(id)
+            self._cache_add(id, data)
+
+    def get(self, id):
+        """ Returns the serialized gRPC Mesh message of a mesh, as a
+        bytes-like object (supporting len() and slicing).
+        Raises KeyError if the mesh does not exist.
+        """
+
+        with self._lock:
+            if id not in self._ids:
+                raise KeyError(id)
+
+            if id in self._cache:
+                data = self._cache.pop(id)
+                self._cache[id] = data
+                return data
+
+        with open(os.path.join(self.directory, _filename(id)), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # empty files can not be memory-mapped
+                data = b""
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(data) > self.cache_size:
+            return data
+
+        data = data[:]
+        with self._lock:
+            self._cache_add(id, data)
+        return data
+
+    def __contains__(self, id):
+        with self._lock:
+            return id in self._ids
+
+    def __len__(self):
+        with self._lock:
+            return len(self._ids)
+
+    def _cache_add(self, id, data):
+
+        if len(data) > self.cache_size or id in self._cache:
+            return
+
+        self._cache[id] = data
+        self._cache_bytes += len(data)
+
+        while self._cache_bytes > self.cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    def _uncache(self, id):
+        data = self._cache.pop(id, None)
+        if data is not None:
+            self._cache_bytes -= len(data)
@@ -0,0 +1,536 @@
+""" Persistence of the worlds of the server (cf Server.world_store).
+
+The content of all the worlds (nodes of the scenes and situations of the
+timelines. Meshes are referenced by the nodes through their IDs, and are
+stored by the mesh store: see underworlds.helpers.meshstore) is saved in a
+directory, as:
+
+- a snapshot (file 'snapshot'): the complete content of the worlds at some
+  point;
+- write-ahead logs (files 'wal-<n>'): every change made to the worlds since
+  this snapshot, appended as soon as the server has applied it.
+
+Both are sequences of WorldRecord messages, each prefixed by its size. When
+the server starts, the snapshot is loaded and the logs written after it are
+replayed (see WorldStore.restore).
+
+Snapshots are taken periodically (if the worlds have changed), on demand
+(WorldStore.snapshot) and when the store is closed. While a snapshot is
+taken, changes to the worlds are only blocked while the lists of nodes and
+situations of the worlds are copied: the server never modifies nodes or
+situations in place (it replaces them), so these lists can be serialized and
+written to disk afterwards.
+
+The nodes of the snapshots are stored in PACKED_NODES records: one list
+per field (and per property) rather than one Node message per node, with
+the transformations of all the nodes in a single buffer. These records are
+decoded much faster than Node messages (with the pure python implementation
+of protobuf, in particular). The write-ahead logs only contain Node
+messages.
+"""
+
+import os
+import re
+import gc
+import time
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import logging; logger = logging.getLogger("underworlds.server.persistence")
+
+import numpy
+
+import underworlds.underworlds_pb2 as gRPC
+from underworlds.types import World, Node, Situation, _blank_node, \
+                              _encode_property, _decode_property
+
+# default period (in sec) between two snapshots
+DEFAULT_SNAPSHOT_PERIOD = 60
+
+_SNAPSHOT = "snapshot"
+_WAL = re.compile(r"^wal-(\d+)$")
+
+# size prefix of the records: 32bit little-endian unsigned integer
+_SIZE = struct.Struct("<I")
+
+# max number of nodes (or situations) per record in snapshots
+_RECORD_BATCH_SIZE = 1000
+
+# transformations of the packed nodes: 16 little-endian 32bit floats per node
+_TRANSFORMATION_DTYPE = numpy.dtype("<f4")
+
+def _wal_name(index):
+    return "wal-%d" % index
+
+def _write_record(f, record):
+    data = record.SerializeToString()
+    f.write(_SIZE.pack(len(data)) + data)
+
+def _read_records(path):
+    """ Yields the records stored in a file. A truncated record at the end of
+    the file (the server stopped while writing it) is ignored.
+    """
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    offset = 0
+    while offset < len(data):
+        if offset + _SIZE.size > len(data):
+            break
+        size, = _SIZE.unpack_from(data, offset)
+        offset += _SIZE.size
+        if offset + size > len(data):
+            break
+
+        record = gRPC.WorldRecord()
+        record.ParseFromString(data[offset:offset + size])
+        offset += size
+        yield record
+
+    if offset < len(data):
+        logger.warning("%s ends with a truncated record: ignoring it" % path)
+
+@contextmanager
+def _nolock():
+    yield
+
+def _value_key(value):
+    """ Returns a key identifying a property value, so that values repeated
+    across nodes are only stored once in PACKED_NODES records. None if the
+    value is not a scalar or a list of scalars.
+    """
+    if isinstance(value, list):
+        # typed: [1] and [True] are encoded differently
+        value = tuple((type(v), v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (type(value), value)
+
+def _pack_nodes(nodes, packed):
+    """ Encodes nodes into a PackedNodes message (cf PACKED_NODES records).
+    """
+    packed.ids.extend(n.id for n in nodes)
+    packed.names.extend(n.name for n in nodes)
+    packed.types = bytes(bytearray(n.type for n in nodes))
+    packed.parents.extend(n.parent or "" for n in nodes)
+    packed.last_updates.extend(n.last_update for n in nodes)
+    packed.transformations = numpy.array([n.transformation for n in nodes],
+                                         dtype=_TRANSFORMATION_DTYPE).tobytes()
+
+    properties = {} # property name -> (PackedNodes.Property, {value key: value index})
+    for index, node in enumerate(nodes):
+        for name, value in node.properties.items():
+            if name not in properties:
+                properties[name] = (packed.properties.add(name=name), {})
+            column, indices = properties[name]
+
+            key = _value_key(value)
+            value_index = indices.get(key) if key is not None else None
+            if value_index is None:
+                value_index = len(column.values)
+                _encode_property(value, column.values.add())
+                if key is not None:
+                    indices[key] = value_index
+
+            column.nodes.append(index)
+            column.value_indices.append(value_index)
+
+def _unpack_nodes(packed):
+    """ Decodes the nodes of a PackedNodes message.
+    """
+    transformations = numpy.frombuffer(packed.transformations, dtype=_TRANSFORMATION_DTYPE) \
+                           .astype(numpy.float32).reshape(-1, 4, 4)
+
+    nodes = []
+    for id, name, type, parent, last_update, transformation in zip(packed.ids,
+                                                                   packed.names,
+                                                                   bytearray(packed.types),
+                                                                   packed.parents,
+                                                                   packed.last_updates,
+                                                                   transformations):
+        node = _blank_node(type)
+        node.id = id
+        node.name = name
+        node.parent = parent if parent else None
+        node.transformation = transformation
+        node.last_update = last_update
+        nodes.append(node)
+
+    for column in packed.properties:
+        name = column.name
+        values = [_decode_property(value) for value in column.values]
+        for index, value_index in zip(column.nodes, column.value_indices):
+            value = values[value_index]
+            if isinstance(value, list): # only shared if made of immutable values
+                value = list(value)
+            nodes[index].properties[name] = value
+
+    return nodes
+
+def _replay(worlds, record):
+    """ Applies a record to the worlds (a dictionary name -> World).
+
+    Records can be applied several times (a change logged just after a
+    snapshot might already be part of the snapshot): the result is the same.
+    """
+
+    if record.type == gRPC.WorldRecord.SNAPSHOT:
+        return
+
+    if record.type == gRPC.WorldRecord.RESET:
+        worlds.clear()
+        return
+
+    if record.type == gRPC.WorldRecord.COPY:
+        source = worlds.get(record.source)
+        if source is None:
+            logger.warning("Ignoring a copy of the unknown world <%s>" % record.source)
+            return
+
+        world = World(record.world)
+        world.deepcopy(source)
+        worlds[record.world] = world
+        return
+
+    if record.type == gRPC.WorldRecord.WORLD:
+        if record.world in worlds:
+            return
+
+        world = World(record.world)
+        world.timeline.origin = record.time
+
+        scene = world.scene
+        root = Node.deserialize(record.nodes[0])
+        scene.remove(scene.rootnode.id)
+        scene.rootnode = root
+        scene.update(root)
+
+        worlds[record.world] = world
+        return
+
+    world = worlds.get(record.world)
+    if world is None:
+        logger.warning("Ignoring a change to the unknown world <%s>" % record.world)
+        return
+
+    if record.type == gRPC.WorldRecord.PACKED_NODES:
+        world.scene.load(_unpack_nodes(record.packed_nodes))
+
+    elif record.type == gRPC.WorldRecord.UPDATE_NODES:
+        world.scene.load([Node.deserialize(data) for data in record.nodes])
+
+    elif record.type == gRPC.WorldRecord.DELETE_NODES:
+        scene = world.scene
+        for data in record.nodes:
+            if scene.node(data.id) is not None:
+                scene.remove(data.id)
+
+    elif record.type == gRPC.WorldRecord.UPDATE_SITUATIONS:
+        for data in record.situations:
+            world.timeline.update(Situation.deserialize(data))
+
+    elif record.type == gRPC.WorldRecord.DELETE_SITUATIONS:
+        for data in record.situations:
+            world.timeline.situations.pop(data.id, None)
+
+class WorldStore(object):
+    """ Saves the worlds of the server in a directory, and restores them.
+
+    Typical use (this is what the server does):
+
+    >>> store = WorldStore("/var/lib/underworlds")
+    >>> worlds = store.restore()
+    >>> store.start(lambda: worlds, reading)
+    >>> # ...every change to the worlds is then logged, eg:
+    >>> store.log_nodes("base", [node])
+    >>> # ...
+    >>> store.close()
+    """
+
+    def __init__(self, directory, snapshot_period=DEFAULT_SNAPSHOT_PERIOD):
+        """
+        :param directory: where the worlds are stored. Created if needed.
+        :param snapshot_period: period (in sec) between two snapshots. If 0
+        or None, snapshots are only taken on demand and when the store is
+        closed.
+        """
+
+        self.directory = directory
+        self.snapshot_period = snapshot_period
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock() # protects the write-ahead log
+        self._wal = None
+        self._wal_index = 0
+        self._nb_changes = 0 # changes logged since the last snapshot
+
+        self._snapshot_lock = threading.Lock() # one snapshot at a time
+
+        self._get_worlds = None
+        self._reading = _nolock
+        self._stopped = threading.Event()
+        self._snapshotter = None
+
+    def restore(self):
+        """ Loads the worlds stored in the directory (the last snapshot, then
+        the changes logged since then), and opens a new write-ahead log.
+
+        :returns: a dictionary world name -> World
+        """
+
+        start = time.time()
+
+        worlds = {}
+        first_wal = 0
+        nb_records = 0
+
+        gc_enabled = gc.isenabled()
+        gc.disable() # restoring creates many objects, and no garbage
+        try:
+            path = os.path.join(self.directory, _SNAPSHOT)
+            if os.path.exists(path):
+                for record in _read_records(path):
+                    if record.type == gRPC.WorldRecord.SNAPSHOT:
+                        first_wal = record.wal
+                    _replay(worlds, record)
+                    nb_records += 1
+
+            for index in self._wal_indices():
+                if index < first_wal: # already part of the snapshot
+                    os.remove(os.path.join(self.directory, _wal_name(index)))
+                    continue
+                for record in _read_records(os.path.join(self.directory, _wal_name(index))):
+                    _replay(worlds, record)
+                    nb_records += 1
+                    self._nb_changes += 1
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        indices = self._wal_indices()
+        self._open_wal(max(indices) + 1 if indices else first_wal)
+
+        logger.info("Restored %d worlds (%d nodes) from %s in %.3fsec (%d records)" % \
+                        (len(worlds),
+                         sum(len(w.scene.nodes) for w in worlds.values()),
+                         self.directory,
+                         time.time() - start,
+                         nb_records))
+
+        return worlds
+
+    def start(self, get_worlds, reading=None):
+        """ Starts taking periodic snapshots.
+
+        :param get_worlds: a function returning the current worlds (a
+        dictionary world name -> World)
+        :param reading: if not None, a function returning a context manager
+        that prevents any change to the worlds (like the creation of a world,
+        or the logging of a change) while it is held. Only needed if the
+        worlds are changed while snapshots are taken.
+        """
+
+        self._get_worlds = get_worlds
+        if reading is not None:
+            self._reading = reading
+
+        if self.snapshot_period:
+            self._snapshotter = threading.Thread(target=self._run_snapshots,
+                                                 name="world snapshots")
+            self._snapshotter.daemon = True
+            self._snapshotter.start()
+
+    def close(self):
+        """ Stops the periodic snapshots, takes a last snapshot and closes the
+        write-ahead log.
+        """
+
+        self._stopped.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+            self._snapshotter = None
+
+        if self._get_worlds is not None and self._nb_changes:
+            self.snapshot()
+
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
+    ############ WRITE-AHEAD LOG
+
+    def log_world(self, world):
+        """ Logs the creation of a new world.
+        """
+        record = gRPC.WorldRecord(type=gRPC.WorldRecord.WORLD,
+                                  world=world.name,
+                                  time=world.timeline.origin)
+        record.nodes.extend([world.scene.rootnode.serialize(gRPC.Node)])
+        self._log(record)
+
+    def log_nodes(self, world, nodes):
+        """ Logs nodes added to (or replaced in) a world.
+        """
+        record = gRPC.WorldRecord(type=gRPC.WorldRecord.UPDATE_NODES, world=world)
+        record.nodes.extend([node.serialize(gRPC.Node) for node in nodes])
+        self._log(record)
+
+    def log_deleted_nodes(self, world, ids):
+        """ Logs nodes removed from a world.
+        """
+        record = gRPC.WorldRecord(type=gRPC.WorldRecord.DELETE_NODES, world=world)
+        record.nodes.extend([gRPC.Node(id=id) for id in ids])
+        self._log(record)
+
+    def log_situations(self, world, situations):
+        """ Logs situations added to (or replaced in) a world.
+        """
+        record = gRPC.WorldRecord(type=gRPC.WorldRecord.UPDATE_SITUATIONS, world=world)
+        record.situations.extend([s.serialize(gRPC.Situation) for s in situations])
+        self._log(record)
+
+    def log_deleted_situations(self, world, ids):
+        """ Logs situations removed from a world.
+        """
+        record = gRPC.WorldRecord(type=gRPC.WorldRecord.DELETE_SITUATIONS, world=world)
+        record.situations.extend([gRPC.Situation(id=id) for id in ids])
+        self._log(record)
+
+    def log_copy(self, source, world):
+        """ Logs the replacement of a world by a copy of another one.
+        """
+        self._log(gRPC.WorldRecord(type=gRPC.WorldRecord.COPY, world=world, source=source))
+
+    def log_reset(self):
+        """ Logs the deletion of all the worlds.
+        """
+        self._log(gRPC.WorldRecord(type=gRPC.WorldRecord.RESET))
+
+    def _log(self, record):
+
+        data = record.SerializeToString()
+
+        with self._lock:
+            if self._wal is None:
+                logger.warning("The world store is closed: change not saved")
+                return
+
+            self._wal.write(_SIZE.pack(len(data)) + data)
+            self._wal.flush()
+            self._nb_changes += 1
+
+    def _open_wal(self, index):
+        """ Starts a new write-ahead log. Must be called with self._lock held
+        (or before the store is shared between threads).
+        """
+        if self._wal is not None:
+            self._wal.close()
+
+        self._wal_index = index
+        self._wal = open(os.path.join(self.directory, _wal_name(index)), "ab")
+
+    def _wal_indices(self):
+        indices = []
+        for f in os.listdir(self.directory):
+            match = _WAL.match(f)
+            if match:
+                indices.append(int(match.group(1)))
+        return sorted(indices)
+
+    ############ SNAPSHOTS
+
+    def snapshot(self):
+        """ Saves the current content of all the worlds, and deletes the
+        write-ahead logs it makes obsolete.
+
+        The worlds are only locked (for reading) while their content is
+        listed (a few milliseconds, even for large worlds): the snapshot is
+        written by the calling thread afterwards.
+        """
+
+        with self._snapshot_lock:
+
+            start = time.time()
+
+            # the worlds must not change between the start of the new log
+            # and the listing of their content: the snapshot is exactly the
+            # state of the worlds at the start of the log
+            with self._reading():
+
+                # changes logged from now on go to a new log, and are
+                # replayed on top of this snapshot
+                with self._lock:
+                    if self._wal is None:
+                        return
+                    wal_index = self._wal_index + 1
+                    self._open_wal(wal_index)
+                    self._nb_changes = 0
+
+                worlds = [(name,
+                           world.timeline.origin,
+                           world.scene.rootnode,
+                           list(world.scene.nodes),
+                           list(world.timeline.situations.values()))
+                          for name, world in list(self._get_worlds().items())]
+
+            locked = time.time() - start
+
+            fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    self._write_snapshot(f, wal_index, worlds)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.rename(tmp, os.path.join(self.directory, _SNAPSHOT))
+            except:
+                os.remove(tmp)
+                raise
+
+            for index in self._wal_indices():
+                if index < wal_index:
+                    os.remove(os.path.join(self.directory, _wal_name(index)))
+
+            logger.info("Snapshot of %d worlds (%d nodes) taken in %.3fsec "
+                        "(worlds locked for %.1fms)" % \
+                            (len(worlds),
+                             sum(len(w[3]) for w in worlds),
+                             time.time() - start,
+                             locked * 1000))
+
+    def _write_snapshot(self, f, wal_index, worlds):
+
+        _write_record(f, gRPC.WorldRecord(type=gRPC.WorldRecord.SNAPSHOT, wal=wal_index))
+
+        for name, origin, rootnode, nodes, situations in worlds:
+
+            record = gRPC.WorldRecord(type=gRPC.WorldRecord.WORLD, world=name, time=origin)
+            record.nodes.extend([rootnode.serialize(gRPC.Node)])
+            # the scene rebuilds the children of its nodes
+            del record.nodes[0].children[:]
+            _write_record(f, record)
+
+            for i in range(0, len(nodes), _RECORD_BATCH_SIZE):
+                record = gRPC.WorldRecord(type=gRPC.WorldRecord.PACKED_NODES, world=name)
+                _pack_nodes(nodes[i:i + _RECORD_BATCH_SIZE], record.packed_nodes)
+                _write_record(f, record)
+
+            for i in range(0, len(situations), _RECORD_BATCH_SIZE):
+                record = gRPC.WorldRecord(type=gRPC.WorldRecord.UPDATE_SITUATIONS, world=name)
+                record.situations.extend([s.serialize(gRPC.Situation) for s in situations[i:i + _RECORD_BATCH_SIZE]])
+                _write_record(f, record)
+
+    def _run_snapshots(self):
+        while not self._stopped.wait(self.snapshot_period):
+            if self._nb_changes:
+                try:
+                    self.snapshot()
+                except (IOError, OSError) as e:
+                    logger.error("Can not take a snapshot of the worlds in %s: %s" % (self.directory, e))
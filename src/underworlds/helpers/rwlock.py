@@ -0,0 +1,64 @@
+""" A readers-writer lock, used by the server to protect the worlds (cf
+Server._locking).
+"""
+
+import threading
+
+from contextlib import contextmanager
+
+class RWLock(object):
+    """ A lock that can be held either by any number of readers (shared
+    lock) or by a single writer (exclusive lock).
+
+    Writers have priority: once a writer waits for the lock, new readers
+    wait as well, so that a steady flow of readers can not starve writers.
+    As a consequence, the lock is not reentrant: a thread that already holds
+    the lock (shared or exclusive) must not acquire it again.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_shared(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_shared(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_exclusive(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_exclusive(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def shared(self):
+        self.acquire_shared()
+        try:
+            yield
+        finally:
+            self.release_shared()
+
+    @contextmanager
+    def exclusive(self):
+        self.acquire_exclusive()
+        try:
+            yield
+        finally:
+            self.release_exclusive()
@@ -1,29 +1,139 @@
 import uuid
 import time
+import copy
 import threading
+try:
+    import queue
+except ImportError: # python2
+    import Queue as queue
 import logging;logger = logging.getLogger("underworlds.server")
 
+from collections import OrderedDict
+from contextlib import contextmanager
+
 from underworlds.types import *
 from underworlds.helpers.profile import profile, profileonce
-from grpc.framework.interfaces.face.face import ExpirationError,NetworkError,AbortionError
+from underworlds.helpers.meshstore import MemoryMeshStore
+from underworlds.helpers.rwlock import RWLock
+from concurrent import futures
+import grpc
+from google.protobuf.message import DecodeError
 import underworlds.underworlds_pb2 as gRPC 
-from grpc.beta import interfaces as beta_interfaces
-from grpc.beta import implementations
 
 _TIMEOUT_SECONDS = 1
 
+# max number of nodes sent in a single message when streaming a whole scene
+_NODES_CHUNK_SIZE = 500
+
+# max number of invalidations waiting to be streamed to a single client. A
+# client that does not keep up is disconnected.
+_MAX_PENDING_INVALIDATIONS = 10000
+
+# period (in sec) at which invalidation streams check whether they are still
+# active
+_INVALIDATION_POLL_PERIOD = 0.1
+
+# default size of the server's thread pool (cf start). Each streamed
+# invalidation channel (cf Server.subscribe) holds one thread for the
+# lifetime of the client.
+DEFAULT_WORKERS = 100
+
+# max share of the thread pool that the streamed invalidation channels may
+# hold (cf start): further clients are asked to use their own invalidation
+# server, so that requests are still processed.
+_MAX_STREAMS_SHARE = 0.5
+
+# size (in bytes) of the chunks used to stream meshes (cf getMeshChunks)
+_MESH_CHUNK_SIZE = 1024 * 1024
+
+# max size (in bytes) of the meshes returned by getMesh (gRPC's default max
+# message size): larger meshes are only sent in chunks (cf getMeshChunks)
+_MAX_MESH_MESSAGE_SIZE = 4 * 1024 * 1024
+
+# max total size (in bytes) of the meshes being uploaded in chunks (cf
+# pushMeshChunks), and time (in sec) after which an upload that did not
+# receive any chunk is abandoned
+_MAX_PARTIAL_MESHES_SIZE = 512 * 1024 * 1024
+_PARTIAL_MESH_EXPIRY = 600
+
+def _nb_faces(mesh):
+    """ Returns the number of faces of a gRPC mesh (packed or legacy encoding)
+    """
+    if mesh.packed_faces:
+        return len(mesh.packed_faces) // 12 # 3 x uint32 per face
+    return len(mesh.faces)
+
+def _coalesce_invalidation(pending, id, invalidation_type):
+    """ Merges a new invalidation of type `invalidation_type` for `id` into
+    `pending` (a dictionary id -> invalidation type of the invalidations not
+    yet sent to a client).
+    """
+
+    previous = pending.get(id)
+
+    if previous is None:
+        pending[id] = invalidation_type
+
+    elif previous == NEW:
+        if invalidation_type == DELETE:
+            # the client never heard of this one
+            del pending[id]
+        # otherwise, still a new one for the client
+
+    elif previous == DELETE:
+        if invalidation_type != DELETE:
+            # deleted, then re-created: the client only sees an update
+            pending[id] = UPDATE
+
+    else: # UPDATE
+        if invalidation_type == DELETE:
+            pending[id] = DELETE
+
+
 class Client:
 
-    def __init__(self, name, host, port):
+    def __init__(self, name, host, port, stream_invalidations=False, max_invalidation_rate=0, invalidation_payloads=False, invalidation_queue=None):
+        """
+        :param invalidation_queue: if the client streams its invalidations,
+        where they are queued (by default, a queue.Queue). Only its
+        put_nowait method is used by the client.
+        """
         self.id = str(uuid.uuid4())
         self.name = name
 
+        # min period (in sec) between two batches of invalidations sent to
+        # the client. Invalidations emitted in between are coalesced.
+        self.min_invalidation_period = 1. / max_invalidation_rate if max_invalidation_rate > 0 else 0
+
+        # (world, target) -> {id: invalidation type} of coalesced
+        # invalidations waiting to be sent
+        self.pending_invalidations = OrderedDict()
+        # (world, target) -> latest version of the coalesced invalidations
+        self.pending_versions = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        self._last_flush = 0
+
+        # whether the client wants the content of the nodes/situations in
+        # the invalidations (not supported with coalesced invalidations)
+        self.invalidation_payloads = invalidation_payloads and not self.min_invalidation_period
+
         # stores the links (cf clients' types) with the various worlds.
         self.links = {}
 
         self.channel = None
-        self.invalidation_server = self._connect_invalidation_server(name, host, port)
-        self.isactive = (self.invalidation_server is not None)
+        self.invalidation_server = None
+
+        # if the client streams its invalidations (cf Server.subscribe), they
+        # are queued here until sent
+        self.invalidations = None
+
+        if stream_invalidations:
+            self.invalidations = invalidation_queue if invalidation_queue is not None else queue.Queue(maxsize=_MAX_PENDING_INVALIDATIONS)
+            self.isactive = True
+        else:
+            self.invalidation_server = self._connect_invalidation_server(name, host, port)
+            self.isactive = (self.invalidation_server is not None)
 
         self.active_invalidations = []
 
@@ -37,12 +147,12 @@ class Client:
 
     def _connect_invalidation_server(self, name, host, port):
         try:
-            self.channel = implementations.insecure_channel(host, port)
-            invalidation_server = gRPC.beta_create_UnderworldsInvalidation_stub(self.channel)
+            self.channel = grpc.insecure_channel("%s:%d" % (host, port))
+            invalidation_server = gRPC.UnderworldsInvalidationStub(self.channel)
             logger.info("Connected to invalidation server of client <%s>" % name)
             return invalidation_server
 
-        except (NetworkError, AbortionError) as e:
+        except grpc.RpcError as e:
             logger.warn("Underworld server unable to establish a connection with Underworlds'\n"
                          " client <%> on %s:%d. Client died? Unreachable over network?\n"
                          "Removing the client.\nOriginal error: %s" % (name, host, port, str(e)))
@@ -54,6 +164,66 @@ class Client:
             logger.debug("Attempting to send invalidations to inactive client <%s>. Skipping" % self.name)
             return
 
+        if not self.min_invalidation_period:
+            self._send_invalidation(invalidation)
+            return
+
+        # only the ids are coalesced: nodes deltas (if any) are not
+        # forwarded to rate-limited clients, which fetch the nodes instead.
+        with self._pending_lock:
+            key = (invalidation.world, invalidation.target)
+            pending = self.pending_invalidations.setdefault(key, OrderedDict())
+            for id in invalidation.ids:
+                _coalesce_invalidation(pending, id, invalidation.type)
+            self.pending_versions[key] = max(self.pending_versions.get(key, 0), invalidation.version)
+
+            if self._flush_timer is None:
+                delay = max(0, self._last_flush + self.min_invalidation_period - time.time())
+                self._flush_timer = threading.Timer(delay, self._flush_invalidations)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush_invalidations(self):
+        """ Sends all the coalesced invalidations, at most one per world,
+        target and invalidation type.
+        """
+
+        with self._pending_lock:
+            pending = self.pending_invalidations
+            versions = self.pending_versions
+            self.pending_invalidations = OrderedDict()
+            self.pending_versions = {}
+            self._flush_timer = None
+            self._last_flush = time.time()
+
+        for (world, target), ids in pending.items():
+            for invalidation_type in [NEW, UPDATE, DELETE]:
+                type_ids = [id for id, t in ids.items() if t == invalidation_type]
+                if not type_ids:
+                    continue
+
+                invalidation = gRPC.Invalidation(target=target,
+                                                 type=invalidation_type,
+                                                 world=world,
+                                                 version=versions[(world, target)])
+                invalidation.ids[:] = type_ids
+                self._send_invalidation(invalidation)
+
+    def _send_invalidation(self, invalidation):
+
+        if not self.isactive:
+            return
+
+        if self.invalidations is not None:
+            try:
+                self.invalidations.put_nowait(invalidation)
+            except queue.Full:
+                logger.error("Client <%s> does not read its invalidations fast "
+                             "enough (more than %d pending). Closing its "
+                             "invalidation stream." % (self.name, _MAX_PENDING_INVALIDATIONS))
+                self.isactive = False
+            return
+
         future = self.invalidation_server.emitInvalidation.future(invalidation, _TIMEOUT_SECONDS)
 
         self.active_invalidations.append(future)
@@ -70,55 +240,213 @@ class Client:
         else:
             self.active_invalidations.remove(invalidation)
 
+    def next_invalidation(self, timeout):
+        """ Returns the next invalidation to stream to the client, or None if
+        none is available after `timeout` seconds.
+        """
+        try:
+            return self.invalidations.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
     def reset_links(self):
         self.links = {}
 
     def close(self):
         self.isactive = False
+
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self.pending_invalidations = OrderedDict()
+            self.pending_versions = {}
+
+        if self.invalidations is not None:
+            logger.debug("Client <%s> is now disconnected. Its invalidation stream is closing." % self.name)
+            return
+
         logger.debug("Waiting for all pending invalidation to client <%s> to complete..." % self.name)
         for i in self.active_invalidations:
             i.result()
         logger.debug("No more pending invalidations. The client <%s> is now properly disconnected." % self.name)
         self.active_invalidations = []
 
-
-
-
-class Server(gRPC.BetaUnderworldsServicer):
-
-    def __init__(self):
-
-        self._worlds = {}
+        if self.channel is not None:
+            self.channel.close()
+
+
+
+
+class Server(gRPC.UnderworldsServicer):
+
+    def __init__(self, mesh_store=None, world_store=None, max_streams=None):
+        """
+        :param mesh_store: where meshes are stored: a MemoryMeshStore
+        (default) or a DiskMeshStore (see underworlds.helpers.meshstore)
+        :param world_store: if not None, a WorldStore (see
+        underworlds.helpers.persistence) from which the worlds are
+        restored, and where every change to the worlds is saved.
+        :param max_streams: if not None, max number of clients with
+        streamed invalidations (cf helo). Further clients are rejected with
+        RESOURCE_EXHAUSTED, and must use their own invalidation server.
+        """
+
+        self.world_store = world_store
+
+        # Locking of the worlds (cf _locking): every request accessing the
+        # worlds holds _worlds_lock (shared), plus a lock per world it
+        # accesses, shared for reads, exclusive for writes. Requests on
+        # different worlds thus run in parallel.
+        # Only reset (that replaces all the worlds) holds _worlds_lock
+        # exclusively.
+        self._worlds_lock = RWLock()
+        self._world_locks = {} # world name -> RWLock
+        self._world_locks_lock = threading.Lock() # also protects the creation of worlds
+        # worlds can not be created while a snapshot of all the worlds is
+        # taken (cf _reading_all)
+        self._worlds_frozen = 0
+        self._worlds_unfrozen = threading.Condition(self._world_locks_lock)
+
+        if world_store is not None:
+            self._worlds = world_store.restore()
+            world_store.start(lambda: self._worlds, self._reading_all)
+        else:
+            self._worlds = {}
 
         self._clients = {} 
         self._client_lock = threading.RLock()
+        self._max_streams = max_streams
+
+        # meshes are stored as serialized gRPC Mesh messages, indexed by
+        # mesh ID (see underworlds.helpers.meshstore)
+        self.meshes = mesh_store if mesh_store is not None else MemoryMeshStore()
 
-        # meshes are stored as a dictionary:
-        # - the key is a unique ID
-        # - the value is a ditionary with these keys:
-        #   - vertices: [(x,y,z), ...]
-        #   - faces: [(i1, i2, i3), ...] with i an index in the vertices list
-        #   - normals
-        self.meshes = {}
+        # meshes being uploaded in chunks (cf pushMeshChunks):
+        # {mesh id: (total size, bytearray of the bytes received so far,
+        #            id of the uploading client, time of the last chunk)}
+        self._partial_meshes = {}
+        self._partial_meshes_size = 0 # total nb of bytes received so far
+        self._partial_meshes_lock = threading.Lock()
 
         self.starttime = time.time()
 
+    def _new_invalidation_queue(self):
+        """ Returns the queue where the invalidations streamed to a new
+        client are stored until sent (cf Client and subscribe).
+        """
+        return queue.Queue(maxsize=_MAX_PENDING_INVALIDATIONS)
+
     def _clientname(self, id):
         with self._client_lock:
             return self._clients[id].name
 
     def _new_world(self, name):
-        self._worlds[name] = World(name)
+        """ Creates a new world. Must be called with _world_locks_lock held.
+        """
+        self._set_world(World(name))
+
+    def _set_world(self, world, source=None):
+        """ Adds a world, or replaces the world with the same name (by a copy
+        of the world `source`, if not None). Must be called with
+        _world_locks_lock held.
+        """
+        while self._worlds_frozen:
+            self._worlds_unfrozen.wait()
+
+        self._worlds[world.name] = world
+
+        if self.world_store is not None:
+            if source is None:
+                self.world_store.log_world(world)
+            else:
+                self.world_store.log_copy(source, world.name)
+
+    def _world_lock(self, world):
+        with self._world_locks_lock:
+            lock = self._world_locks.get(world)
+            if lock is None:
+                lock = self._world_locks[world] = RWLock()
+            return lock
+
+    @contextmanager
+    def _locking(self, read=(), write=()):
+        """ Locks worlds for the duration of a request: shared locks for the
+        worlds in `read`, exclusive locks for the worlds in `write`.
 
+        The locks are always acquired in the same order (by world name), so
+        that requests locking several worlds (like copyWorld) can not
+        deadlock each other.
+        """
+
+        self._worlds_lock.acquire_shared()
+
+        acquired = []
+        try:
+            for world in sorted(set(read) | set(write)):
+                lock = self._world_lock(world)
+                if world in write:
+                    lock.acquire_exclusive()
+                    acquired.append(lock.release_exclusive)
+                else:
+                    lock.acquire_shared()
+                    acquired.append(lock.release_shared)
+            yield
+        finally:
+            for release in reversed(acquired):
+                release()
+            self._worlds_lock.release_shared()
+
+    def _reading(self, world):
+        return self._locking(read=(world,))
+
+    def _writing(self, world):
+        return self._locking(write=(world,))
+
+    @contextmanager
+    def _reading_all(self):
+        """ Locks all the worlds for reading, and prevents the creation of
+        new worlds (cf WorldStore.snapshot).
+
+        _world_locks_lock is not held meanwhile: the requests reading the
+        worlds still proceed, and the requests creating a world wait for
+        the end of the snapshot (cf _set_world).
+        """
+
+        while True:
+            with self._world_locks_lock:
+                worlds = list(self._worlds)
+
+            with self._locking(read=worlds):
+                with self._world_locks_lock:
+                    if set(self._worlds) != set(worlds):
+                        continue # a world has been created meanwhile
+                    self._worlds_frozen += 1
+
+                try:
+                    yield
+                finally:
+                    with self._world_locks_lock:
+                        self._worlds_frozen -= 1
+                        self._worlds_unfrozen.notify_all()
+                return
 
     def _get_scene_timeline(self, ctxt):
+        """ Returns the scene and the timeline of the world of the request,
+        creating the world if needed. Must be called with the world locked.
+        """
 
         world = ctxt.world
 
         if world not in self._worlds:
-            self._new_world(world)
-            logger.info("<%s> created a new world <%s>" % (self._clientname(ctxt.client), 
-                                                         world))
+            # the world may be concurrently created by a reader
+            with self._world_locks_lock:
+                created = world not in self._worlds
+                if created:
+                    self._new_world(world)
+            if created:
+                logger.info("<%s> created a new world <%s>" % (self._clientname(ctxt.client), 
+                                                             world))
 
         scene = self._worlds[world].scene
         timeline = self._worlds[world].timeline
@@ -136,34 +464,28 @@ class Server(gRPC.BetaUnderworldsServicer):
             self._clients[client].links[world] = (type, time.time())
 
     def _update_node(self, scene, node):
+        """ Adds or replaces a node in the scene.
+
+        :returns: the type of the invalidation (NEW or UPDATE) and the ID of
+        the former parent of the node (None for new nodes).
+        """
 
         node.last_update = time.time()
 
         if node.parent is None and node.id != scene.rootnode.id:
             node.parent = scene.rootnode.id
 
-        oldnode = scene.node(node.id)
-
-        if oldnode: # the node already exist
-            parent_has_changed = oldnode.parent != node.parent
-
-            # update the list of children
-            node._children = [n.id for n in scene.nodes if n.parent == node.id]
-
-            # replace the node
-            scene.nodes = [node if old == node else old for old in scene.nodes]
-            
-            action = UPDATE
+        # add or replace the node. The scene takes care of updating the
+        # list of children of the node and of its parents, if needed.
+        oldnode = scene.update(node)
 
+        if oldnode: # the node already existed
+            return UPDATE, oldnode.parent
         else: # new node
-            scene.nodes.append(node)
-            parent_has_changed = True
-            action = NEW
-
-        return action, parent_has_changed
+            return NEW, None
 
     def _delete_node(self, scene, id):
-        scene.nodes.remove(scene.node(id))
+        scene.remove(id)
 
     def _update_situation(self, timeline, situation):
 
@@ -179,19 +501,79 @@ class Server(gRPC.BetaUnderworldsServicer):
         return action
 
     @profile
-    def _emit_invalidation(self, target, world, node_ids, invalidation_type):
+    def _emit_invalidation(self, target, world, node_ids, invalidation_type, deltas=None, version=0):
+        """
+        :param version: the version of the scene or timeline once the
+        changes have been applied (cf Scene.version)
+        """
 
         invalidation = gRPC.Invalidation(target=target,
                                          type=invalidation_type, 
-                                         world=world)
+                                         world=world,
+                                         version=version)
         invalidation.ids[:] = node_ids
 
+        if deltas:
+            invalidation.deltas.extend(deltas)
+
+        # the same invalidation, with the content of the nodes/situations.
+        # Only created if needed.
+        invalidation_with_payloads = None
 
         with self._client_lock:
             for client_id in self._clients:
-                if world in self._clients[client_id].links:
+                client = self._clients[client_id]
+                if world in client.links:
                     logger.debug("Informing client <%s> that nodes have been invalidated in world <%s>" % (self._clientname(client_id), world))
-                    self._clients[client_id].emit_invalidation(invalidation)
+
+                    if client.invalidation_payloads and invalidation_type != DELETE:
+                        if invalidation_with_payloads is None:
+                            invalidation_with_payloads = self._add_payloads(invalidation)
+                        client.emit_invalidation(invalidation_with_payloads)
+                    else:
+                        client.emit_invalidation(invalidation)
+
+    def _emit_changes(self, target, world, former_ids, ids, version):
+        """ Emits the invalidations for a world whose nodes (or situations)
+        `former_ids` have been replaced by `ids`: one invalidation per type
+        of change.
+        """
+
+        former = set(former_ids)
+        current = set(ids)
+
+        deleted = [id for id in former_ids if id not in current]
+        updated = [id for id in ids if id in former]
+        new = [id for id in ids if id not in former]
+
+        if deleted:
+            self._emit_invalidation(target, world, deleted, DELETE, version=version)
+        if updated:
+            self._emit_invalidation(target, world, updated, UPDATE, version=version)
+        if new:
+            self._emit_invalidation(target, world, new, NEW, version=version)
+
+    def _add_payloads(self, invalidation):
+        """ Returns a copy of the invalidation, with the current content of
+        the invalidated nodes or situations.
+        """
+
+        res = gRPC.Invalidation()
+        res.CopyFrom(invalidation)
+
+        scene, timeline = self._worlds[invalidation.world].scene, self._worlds[invalidation.world].timeline
+
+        for id in invalidation.ids:
+            if invalidation.target == gRPC.Invalidation.SCENE:
+                node = scene.node(id)
+                if node is not None:
+                    res.nodes.extend([node.serialize(gRPC.Node)])
+            else:
+                situation = timeline.situations.get(id)
+                if situation is not None:
+                    res.situations.extend([situation.serialize(gRPC.Situation)])
+
+        return res
 
 
     #############################################
@@ -201,7 +583,25 @@ class Server(gRPC.BetaUnderworldsServicer):
     @profile
     def helo(self, client, context):
         logger.debug("Got <helo> from %s" % client.name)
-        c = Client(client.name, client.host, client.invalidation_server_port)
+
+        if client.stream_invalidations and self._max_streams is not None:
+            with self._client_lock:
+                nb_streams = sum(1 for c in self._clients.values() if c.invalidations is not None)
+            if nb_streams >= self._max_streams:
+                logger.warning("%s requested streamed invalidations, but %d clients "
+                               "already stream theirs" % (client.name, nb_streams))
+                context.set_details("Too many clients with streamed invalidations: "
+                                    "use reverse invalidations")
+                context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+                return gRPC.Client()
+
+        c = Client(client.name,
+                   client.host,
+                   client.invalidation_server_port,
+                   client.stream_invalidations,
+                   client.max_invalidation_rate,
+                   client.invalidation_payloads,
+                   self._new_invalidation_queue() if client.stream_invalidations else None)
         with self._client_lock:
             self._clients[c.id] = c
 
@@ -213,12 +613,39 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("Got <byebye> from %s" % (self._clientname(client.id)))
 
         with self._client_lock:
-            self._clients[client.id].close()
-            del self._clients[client.id]
+            c = self._clients.pop(client.id)
+
+        # the uploads of the client can not be resumed anymore
+        self._drop_partial_meshes(lambda client_id, last_chunk: client_id == client.id)
+
+        # waits for the invalidations being sent to the client: not with
+        # the lock held, that would prevent changes to the worlds meanwhile
+        c.close()
 
         logger.debug("<byebye> completed")
         return gRPC.Empty()
 
+    @profile
+    def subscribe(self, client, context):
+        logger.debug("Got <subscribe> from %s" % (self._clientname(client.id)))
+
+        with self._client_lock:
+            c = self._clients[client.id]
+
+        if c.invalidations is None:
+            logger.warning("%s attempted to subscribe to invalidations, but "
+                           "it has its own invalidation server" % c.name)
+            context.set_details("Client %s did not request streamed invalidations in <helo>" % c.name)
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            return
+
+        while c.isactive and context.is_active():
+            invalidation = c.next_invalidation(_INVALIDATION_POLL_PERIOD)
+            if invalidation is not None:
+                yield invalidation
+
+        logger.debug("<subscribe> completed: invalidation stream of %s closed" % c.name)
+
 
     @profile
     def uptime(self, client, context):
@@ -233,8 +660,9 @@ class Server(gRPC.BetaUnderworldsServicer):
     
         topo = gRPC.Topology()
 
-        for w in self._worlds.keys():
-            topo.worlds.append(w)
+        with self._worlds_lock.shared():
+            for w in list(self._worlds.keys()):
+                topo.worlds.append(w)
 
         with self._client_lock:
             for client_id in self._clients:
@@ -263,7 +691,12 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.warning("Resetting Underworlds upon client <%s> request" % client.id)
         logger.warning("This might break other clients!")
 
-        self._worlds = {}
+        # waits for the requests in progress to complete
+        with self._worlds_lock.exclusive():
+            self._worlds = {}
+
+            if self.world_store is not None:
+                self.world_store.log_reset()
 
         with self._client_lock:
             for cid, c in self._clients.items():
@@ -273,6 +706,54 @@ class Server(gRPC.BetaUnderworldsServicer):
 
         return gRPC.Empty()
 
+    @profile
+    def copyWorld(self, worldCopy, context):
+        logger.debug("Got <copyWorld> from %s" % worldCopy.context.client)
+
+        client_id, world, source = worldCopy.context.client, worldCopy.context.world, worldCopy.source
+
+        with self._locking(read=(source,), write=(world,)):
+            if source not in self._worlds:
+                logger.warning("%s attempted to copy the non-existant world <%s>" % (self._clientname(client_id), source))
+                context.set_details("World <%s> does not exist" % source)
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                return gRPC.Empty()
+
+            self._update_current_links(client_id, source, READER)
+            self._update_current_links(client_id, world, PROVIDER)
+
+            if source == world:
+                return gRPC.Empty()
+
+            former = self._worlds.get(world)
+
+            replacement = World(world)
+            replacement.deepcopy(self._worlds[source])
+            with self._world_locks_lock:
+                self._set_world(replacement, source)
+
+            logger.info("<%s> copied world <%s> (%d nodes) into world <%s>" % \
+                                (self._clientname(client_id),
+                                 source,
+                                 len(replacement.scene.nodes),
+                                 world))
+
+            # tells everyone about the new content of the world, in bulk
+            former_nodes = [n.id for n in former.scene.nodes] if former else []
+            former_situations = list(former.timeline.situations.keys()) if former else []
+
+            self._emit_changes(gRPC.Invalidation.SCENE, world,
+                               former_nodes,
+                               [n.id for n in replacement.scene.nodes],
+                               replacement.scene.version)
+            self._emit_changes(gRPC.Invalidation.TIMELINE, world,
+                               former_situations,
+                               list(replacement.timeline.situations.keys()),
+                               replacement.timeline.version)
+
+        logger.debug("<copyWorld> completed")
+        return gRPC.Empty()
+
 
     ############ NODES
     @profile
@@ -280,9 +761,10 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("Got <getNodesLen> from %s" % ctxt.client)
         self._update_current_links(ctxt.client, ctxt.world, READER)
 
-        scene,_ = self._get_scene_timeline(ctxt)
+        with self._reading(ctxt.world):
+            scene,_ = self._get_scene_timeline(ctxt)
 
-        res = gRPC.Size(size=len(scene.nodes))
+            res = gRPC.Size(size=len(scene.nodes))
         logger.debug("<getNodesLen> completed")
         return res
 
@@ -291,11 +773,12 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("Got <getNodesIds> from %s" % ctxt.client)
         self._update_current_links(ctxt.client, ctxt.world, READER)
 
-        scene,_ = self._get_scene_timeline(ctxt)
+        with self._reading(ctxt.world):
+            scene,_ = self._get_scene_timeline(ctxt)
 
-        nodes = gRPC.Nodes()
-        for n in scene.nodes:
-            nodes.ids.append(n.id)
+            nodes = gRPC.Nodes()
+            for n in scene.nodes:
+                nodes.ids.append(n.id)
 
         logger.debug("<getNodesIds> completed")
         return nodes
@@ -305,9 +788,10 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("Got <getRootNode> from %s" % ctxt.client)
         self._update_current_links(ctxt.client, ctxt.world, READER)
 
-        scene,_ = self._get_scene_timeline(ctxt)
+        with self._reading(ctxt.world):
+            scene,_ = self._get_scene_timeline(ctxt)
 
-        res = gRPC.Node(id=scene.rootnode.id)
+            res = gRPC.Node(id=scene.rootnode.id)
         logger.debug("<getRootNode> completed")
         return res
 
@@ -317,32 +801,120 @@ class Server(gRPC.BetaUnderworldsServicer):
 
         client_id, world = nodeInCtxt.context.client, nodeInCtxt.context.world
 
-        scene,_ = self._get_scene_timeline(nodeInCtxt.context)
+        with self._reading(world):
+            scene,_ = self._get_scene_timeline(nodeInCtxt.context)
 
-        self._update_current_links(client_id, world, READER)
+            self._update_current_links(client_id, world, READER)
 
-        if not nodeInCtxt.node.id:
-            logger.warning("%s has required a node without specifying its id!" % (self._clientname(client_id)))
+            if not nodeInCtxt.node.id:
+                logger.warning("%s has required a node without specifying its id!" % (self._clientname(client_id)))
 
-            context.details("No node id provided")
-            context.code(beta_interfaces.StatusCode.NOT_FOUND)
-            return gRPC.Node()
+                context.set_details("No node id provided")
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                return gRPC.Node()
 
-        node = scene.node(nodeInCtxt.node.id)
+            node = scene.node(nodeInCtxt.node.id)
 
-        if not node:
-            logger.warning("%s has required an non-existant "
-                           "node <%s> in world %s" % (self._clientname(client_id), nodeInCtxt.node.id, world))
+            if not node:
+                logger.warning("%s has required an non-existant "
+                               "node <%s> in world %s" % (self._clientname(client_id), nodeInCtxt.node.id, world))
 
-            context.details("Node <%s> does not exist in world %s" % (nodeInCtxt.node.id, world))
-            context.code(beta_interfaces.StatusCode.NOT_FOUND)
-            return gRPC.Node()
+                context.set_details("Node <%s> does not exist in world %s" % (nodeInCtxt.node.id, world))
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                return gRPC.Node()
 
 
-        else:
-            res = node.serialize(gRPC.Node)
-            logger.debug("<getNode> completed")
-            return res
+            else:
+                res = node.serialize(gRPC.Node)
+                logger.debug("<getNode> completed")
+                return res
+
+    @profile
+    def getNodes(self, nodesInCtxt, context):
+        logger.debug("Got <getNodes> from %s" % self._clientname(nodesInCtxt.context.client))
+
+        client_id, world = nodesInCtxt.context.client, nodesInCtxt.context.world
+
+        with self._reading(world):
+            scene,_ = self._get_scene_timeline(nodesInCtxt.context)
+
+            self._update_current_links(client_id, world, READER)
+
+            res = gRPC.NodesInContext(context=nodesInCtxt.context)
+
+            for gRPCNode in nodesInCtxt.nodes:
+                node = scene.node(gRPCNode.id)
+
+                if not node:
+                    logger.debug("%s has required the non-existant node <%s> "
+                                 "in world %s. Skipping it." % (self._clientname(client_id), gRPCNode.id, world))
+                    continue
+
+                res.nodes.extend([node.serialize(gRPC.Node)])
+
+        logger.debug("<getNodes> completed")
+        return res
+
+    @profile
+    def getScene(self, ctxt, context):
+        logger.debug("Got <getScene> from %s" % ctxt.client)
+        self._update_current_links(ctxt.client, ctxt.world, READER)
+
+        # take a snapshot of the node list: the scene may be modified while
+        # we stream it
+        with self._reading(ctxt.world):
+            scene,_ = self._get_scene_timeline(ctxt)
+            nodes = list(scene.nodes)
+
+        for i in range(0, len(nodes), _NODES_CHUNK_SIZE):
+            chunk = nodes[i:i + _NODES_CHUNK_SIZE]
+            yield gRPC.NodesInContext(context=ctxt,
+                                      nodes=[n.serialize(gRPC.Node) for n in chunk])
+
+        logger.debug("<getScene> completed (%d nodes)" % len(nodes))
+
+    @profile
+    def getSceneAt(self, sceneAt, context):
+        logger.debug("Got <getSceneAt> from %s" % sceneAt.context.client)
+        self._update_current_links(sceneAt.context.client, sceneAt.context.world, READER)
+
+        # the world is only locked while the nodes are listed, not while
+        # they are streamed
+        with self._reading(sceneAt.context.world):
+            scene,_ = self._get_scene_timeline(sceneAt.context)
+
+            version = sceneAt.version or scene.version
+            rootnode = scene.rootnode.id
+            try:
+                nodes = scene.nodes_at(version)
+            except ValueError as e:
+                logger.warning("%s has required an unavailable version of world <%s>: %s" % \
+                                    (self._clientname(sceneAt.context.client), sceneAt.context.world, e))
+                context.set_details(str(e))
+                context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+                return
+
+        # the children of the nodes, at this version
+        children = {}
+        for n in nodes:
+            children.setdefault(n.parent, []).append(n.id)
+
+        for i in range(0, len(nodes), _NODES_CHUNK_SIZE):
+            chunk = gRPC.SceneAt(context=sceneAt.context)
+            if i == 0:
+                chunk.version = version
+                chunk.rootnode = rootnode
+
+            gRPCNodes = []
+            for n in nodes[i:i + _NODES_CHUNK_SIZE]:
+                gRPCNode = n.serialize(gRPC.Node)
+                gRPCNode.children[:] = children.get(n.id, [])
+                gRPCNodes.append(gRPCNode)
+            chunk.nodes.extend(gRPCNodes)
+
+            yield chunk
+
+        logger.debug("<getSceneAt> completed (%d nodes at version %d)" % (len(nodes), version))
 
 
     @profile
@@ -351,102 +923,190 @@ class Server(gRPC.BetaUnderworldsServicer):
         self._update_current_links(nodesInCtxt.context.client, nodesInCtxt.context.world, PROVIDER)
 
         client_id, world = nodesInCtxt.context.client, nodesInCtxt.context.world
-        scene,_ = self._get_scene_timeline(nodesInCtxt.context)
+        with self._writing(world):
+            scene,_ = self._get_scene_timeline(nodesInCtxt.context)
 
-        nodes_to_invalidate_new = []
-        nodes_to_invalidate_update = []
-        for gRPCNode in nodesInCtxt.nodes:
-            node = Node.deserialize(gRPCNode)
+            nodes_to_invalidate_new = []
+            nodes_to_invalidate_update = []
+            updated_nodes = []
+            for gRPCNode in nodesInCtxt.nodes:
+                node = Node.deserialize(gRPCNode, scene.node(gRPCNode.id))
 
-            invalidation_type, parent_has_changed = self._update_node(scene, node)
+                invalidation_type, former_parent = self._update_node(scene, node)
+                updated_nodes.append(node)
 
-            logger.info("<%s> %s node <%s> in world <%s>" % \
-                                (self._clientname(client_id), 
-                                "updated" if invalidation_type==UPDATE else "created",
-                                repr(node), 
-                                world))
+                logger.info("<%s> %s node <%s> in world <%s>" % \
+                                    (self._clientname(client_id), 
+                                    "updated" if invalidation_type==UPDATE else "created",
+                                    repr(node), 
+                                    world))
 
-            if invalidation_type ==  UPDATE:
-                nodes_to_invalidate_update.append(gRPCNode.id)
-            elif invalidation_type ==  NEW:
-                nodes_to_invalidate_new.append(gRPCNode.id)
-            else:
-                raise RuntimeError("Unexpected invalidation type")
+                if invalidation_type ==  UPDATE:
+                    nodes_to_invalidate_update.append(gRPCNode.id)
+                elif invalidation_type ==  NEW:
+                    nodes_to_invalidate_new.append(gRPCNode.id)
+                else:
+                    raise RuntimeError("Unexpected invalidation type")
 
 
-            ## If necessary, update the node hierarchy
-            if parent_has_changed:
-                parent = scene.node(node.parent)
-                if parent is None:
-                    logger.warning("Node %s references a non-exisiting parent" % node)
-                elif node.id not in parent.children:
-                    parent._children.append(node.id)
-                    # tells everyone about the change to the parent
-                    logger.debug("Adding invalidation action [update " + parent.id + "] due to hierarchy update")
-                    nodes_to_invalidate_update.append(parent.id)
+                ## If the node hierarchy has changed, tells everyone about the
+                ## change to the (new and former) parents' children
+                if former_parent != node.parent:
+                    parent = scene.node(node.parent)
+                    if parent is None:
+                        logger.warning("Node %s references a non-exisiting parent" % node)
+                    else:
+                        logger.debug("Adding invalidation action [update " + parent.id + "] due to hierarchy update")
+                        nodes_to_invalidate_update.append(parent.id)
+
+                    if scene.node(former_parent):
+                        logger.debug("Adding invalidation action [update " + former_parent + "] due to hierarchy update")
+                        nodes_to_invalidate_update.append(former_parent)
+
+            version = scene.version
 
-                    # As a node has only one parent, if the parent has changed we must
-                    # remove our node from its previous parent
-                    for othernode in scene.nodes:
-                        if othernode.id != parent.id and node.id in othernode.children:
-                            othernode._children.remove(node.id)
-                            # tells everyone about the change to the former parent
-                            logger.debug("Adding invalidation action [update " + othernode.id + "] due to hierarchy update")
-                            nodes_to_invalidate_update.append(othernode.id)
-                            break
+            if self.world_store is not None and updated_nodes:
+                self.world_store.log_nodes(world, updated_nodes)
 
-        if nodes_to_invalidate_update:
-            self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_update, UPDATE)
-        if nodes_to_invalidate_new:
-            self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_new, NEW)
+            if nodes_to_invalidate_update:
+                self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_update, UPDATE, version=version)
+            if nodes_to_invalidate_new:
+                self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_new, NEW, version=version)
 
 
         logger.debug("<updateNodes> completed")
         return gRPC.Empty()
 
+    @profile
+    def updateNodesFields(self, deltasInCtxt, context):
+        logger.debug("Got <updateNodesFields> from %s" % deltasInCtxt.context.client)
+        self._update_current_links(deltasInCtxt.context.client, deltasInCtxt.context.world, PROVIDER)
+
+        client_id, world = deltasInCtxt.context.client, deltasInCtxt.context.world
+        with self._writing(world):
+            scene,_ = self._get_scene_timeline(deltasInCtxt.context)
+
+            nodes_to_invalidate_update = []
+            deltas = []
+            updated_nodes = []
+            for delta in deltasInCtxt.deltas:
+
+                node = scene.node(delta.node.id)
+                if node is None:
+                    logger.warning("%s attempted to update fields of the non-existant "
+                                   "node <%s> in world %s. Skipping it." % (self._clientname(client_id), delta.node.id, world))
+                    continue
+
+                # update a copy of the node: _update_node needs the former node
+                node = copy.copy(node)
+                try:
+                    node.update_fields(delta.node, delta.fields)
+                except UnderworldsError as e:
+                    logger.warning("%s attempted an invalid update of node <%s>: %s. "
+                                   "Skipping it." % (self._clientname(client_id), delta.node.id, str(e)))
+                    continue
+
+                _, former_parent = self._update_node(scene, node)
+                updated_nodes.append(node)
+
+                logger.info("<%s> updated fields %s of node <%s> in world <%s>" % \
+                                    (self._clientname(client_id),
+                                     list(delta.fields),
+                                     repr(node),
+                                     world))
+
+                nodes_to_invalidate_update.append(node.id)
+                deltas.append(gRPC.NodeDelta(node=node.serialize(gRPC.Node, delta.fields),
+                                             fields=delta.fields))
+
+                ## If the node hierarchy has changed, tells everyone about the
+                ## change to the (new and former) parents' children
+                if former_parent != node.parent:
+                    parent = scene.node(node.parent)
+                    if parent is None:
+                        logger.warning("Node %s references a non-exisiting parent" % node)
+                    else:
+                        logger.debug("Adding invalidation action [update " + parent.id + "] due to hierarchy update")
+                        nodes_to_invalidate_update.append(parent.id)
+
+                    if scene.node(former_parent):
+                        logger.debug("Adding invalidation action [update " + former_parent + "] due to hierarchy update")
+                        nodes_to_invalidate_update.append(former_parent)
+
+            version = scene.version
+
+            if self.world_store is not None and updated_nodes:
+                self.world_store.log_nodes(world, updated_nodes)
+
+            if nodes_to_invalidate_update:
+                self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_update, UPDATE, deltas, version=version)
+
+        logger.debug("<updateNodesFields> completed")
+        return gRPC.Empty()
+
     @profile
     def deleteNodes(self, nodesInCtxt, context):
         logger.debug("Got <deleteNodes> from %s" % nodesInCtxt.context.client)
         self._update_current_links(nodesInCtxt.context.client, nodesInCtxt.context.world, PROVIDER)
 
         client_id, world = nodesInCtxt.context.client, nodesInCtxt.context.world
-        scene,_ = self._get_scene_timeline(nodesInCtxt.context)
-
-        nodes_to_invalidate_delete = []
-        nodes_to_invalidate_update = []
-        for gRPCNode in nodesInCtxt.nodes:
-            node = scene.node(gRPCNode.id)
-            logger.info("<%s> deleted node <%s> in world <%s>" % \
-                                (self._clientname(client_id), 
-                                repr(node), 
-                                world))
-
-            action = self._delete_node(scene, gRPCNode.id)
-
-            # tells everyone about the change
-            logger.debug("Sent invalidation action [delete]")
-            nodes_to_invalidate_delete.append(gRPCNode.id)
-
-            # reparent children to the scene's root node
-            children_to_update = []
-            for child_id in node.children:
-                child = scene.node(child_id)
-                child.parent = scene.rootnode.id
-                logger.debug("Reparenting child " + child_id + " to root node")
-                nodes_to_invalidate_update.append(child_id)
-
-            # Also remove the node from its parent's children
-            parent = scene.node(node.parent)
-            if parent:
-                parent._children.remove(node.id)
+        with self._writing(world):
+            scene,_ = self._get_scene_timeline(nodesInCtxt.context)
+
+            nodes_to_invalidate_delete = []
+            nodes_to_invalidate_update = []
+            reparented_nodes = []
+            for gRPCNode in nodesInCtxt.nodes:
+                node = scene.node(gRPCNode.id)
+                if node is None:
+                    logger.warning("%s attempted to delete the non-existant "
+                                   "node <%s> in world %s. Skipping it." % (self._clientname(client_id), gRPCNode.id, world))
+                    continue
+
+                logger.info("<%s> deleted node <%s> in world <%s>" % \
+                                    (self._clientname(client_id), 
+                                    repr(node), 
+                                    world))
+
+                self._delete_node(scene, gRPCNode.id)
+
+                # tells everyone about the change
+                logger.debug("Sent invalidation action [delete]")
+                nodes_to_invalidate_delete.append(gRPCNode.id)
+
+                # reparent children to the scene's root node
+                for child_id in list(node.children):
+                    # nodes are replaced, not modified in place (cf WorldStore.snapshot)
+                    child = copy.copy(scene.node(child_id))
+                    child.parent = scene.rootnode.id
+                    scene.update(child)
+                    reparented_nodes.append(child)
+                    logger.debug("Reparenting child " + child_id + " to root node")
+                    nodes_to_invalidate_update.append(child_id)
+
+                if node.children:
+                    # tells everyone about the change to the root node's children
+                    nodes_to_invalidate_update.append(scene.rootnode.id)
+
+                # The scene has removed the node from its parent's children:
                 # tells everyone about the change to the parent
-                logger.debug("Sent invalidation action [update " + parent.id + "] due to hierarchy update")
-                nodes_to_invalidate_update.append(parent.id)
+                parent = scene.node(node.parent)
+                if parent:
+                    logger.debug("Sent invalidation action [update " + parent.id + "] due to hierarchy update")
+                    nodes_to_invalidate_update.append(parent.id)
+
+            version = scene.version
 
-        if nodes_to_invalidate_update:
-            self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_update, UPDATE)
-        if nodes_to_invalidate_delete:
-            self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_delete, DELETE)
+            if self.world_store is not None:
+                if nodes_to_invalidate_delete:
+                    self.world_store.log_deleted_nodes(world, nodes_to_invalidate_delete)
+                if reparented_nodes:
+                    self.world_store.log_nodes(world, reparented_nodes)
+
+            if nodes_to_invalidate_update:
+                self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_update, UPDATE, version=version)
+            if nodes_to_invalidate_delete:
+                self._emit_invalidation(gRPC.Invalidation.SCENE, world, nodes_to_invalidate_delete, DELETE, version=version)
 
 
         logger.debug("<deleteNodes> completed")
@@ -459,9 +1119,10 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("Got <getSituationsLen> from %s" % ctxt.client)
         self._update_current_links(ctxt.client, ctxt.world, READER)
 
-        _,timeline = self._get_scene_timeline(ctxt)
+        with self._reading(ctxt.world):
+            _,timeline = self._get_scene_timeline(ctxt)
 
-        res = gRPC.Size(size=len(timeline.situations))
+            res = gRPC.Size(size=len(timeline.situations))
         logger.debug("<getSituationsLen> completed")
         return res
 
@@ -470,11 +1131,12 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("Got <getSituationsIds> from %s" % ctxt.client)
         self._update_current_links(ctxt.client, ctxt.world, READER)
 
-        _,timeline = self._get_scene_timeline(ctxt)
+        with self._reading(ctxt.world):
+            _,timeline = self._get_scene_timeline(ctxt)
 
-        situations = gRPC.Situations()
-        for sit_id in timeline.situations.keys():
-            situations.ids.append(sit_id)
+            situations = gRPC.Situations()
+            for sit_id in timeline.situations.keys():
+                situations.ids.append(sit_id)
 
         logger.debug("<getSituationsIds> completed")
         return situations
@@ -486,41 +1148,43 @@ class Server(gRPC.BetaUnderworldsServicer):
 
         client_id, world = sitInCtxt.context.client, sitInCtxt.context.world
 
-        _,timeline = self._get_scene_timeline(sitInCtxt.context)
+        with self._reading(world):
+            _,timeline = self._get_scene_timeline(sitInCtxt.context)
 
-        self._update_current_links(client_id, world, READER)
+            self._update_current_links(client_id, world, READER)
 
-        if not sitInCtxt.situation.id:
-            logger.warning("%s has required a situation without specifying its id!" % (self._clientname(client_id)))
+            if not sitInCtxt.situation.id:
+                logger.warning("%s has required a situation without specifying its id!" % (self._clientname(client_id)))
 
-            context.details("No situation id provided")
-            context.code(beta_interfaces.StatusCode.NOT_FOUND)
-            return gRPC.Node()
+                context.set_details("No situation id provided")
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                return gRPC.Node()
 
-        situation = timeline.situation(sitInCtxt.situation.id)
+            situation = timeline.situation(sitInCtxt.situation.id)
 
-        if not situation:
-            logger.warning("%s has required an non-existant "
-                           "situation <%s> in world %s" % (self._clientname(client_id), sitInCtxt.node.id, world))
+            if not situation:
+                logger.warning("%s has required an non-existant "
+                               "situation <%s> in world %s" % (self._clientname(client_id), sitInCtxt.node.id, world))
 
-            context.details("Situation <%s> does not exist in world %s" % (sitInCtxt.node.id, world))
-            context.code(beta_interfaces.StatusCode.NOT_FOUND)
-            return gRPC.Situation()
+                context.set_details("Situation <%s> does not exist in world %s" % (sitInCtxt.node.id, world))
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                return gRPC.Situation()
 
 
-        else:
-            res = situation.serialize(gRPC.Situation)
-            logger.debug("<getSituation> completed")
-            return res
+            else:
+                res = situation.serialize(gRPC.Situation)
+                logger.debug("<getSituation> completed")
+                return res
 
     @profile
     def timelineOrigin(self, ctxt, context):
         logger.debug("Got <timelineOrigin> from %s" % ctxt.client)
         self._update_current_links(ctxt.client, ctxt.world, READER)
 
-        _,timeline = self._get_scene_timeline(ctxt)
+        with self._reading(ctxt.world):
+            _,timeline = self._get_scene_timeline(ctxt)
 
-        res = gRPC.Time(time=timeline.origin)
+            res = gRPC.Time(time=timeline.origin)
         logger.debug("<timelineOrigin> completed")
         return res
 
@@ -530,36 +1194,44 @@ class Server(gRPC.BetaUnderworldsServicer):
         self._update_current_links(sitInCtxt.context.client, sitInCtxt.context.world, PROVIDER)
 
         client_id, world = sitInCtxt.context.client, sitInCtxt.context.world
-        _, timeline = self._get_scene_timeline(sitInCtxt.context)
+        with self._writing(world):
+            _, timeline = self._get_scene_timeline(sitInCtxt.context)
 
-        situations_to_invalidate_update = []
-        situations_to_invalidate_new = []
-        for gRPCSit in sitInCtxt.situations:
+            situations_to_invalidate_update = []
+            situations_to_invalidate_new = []
+            updated_situations = []
+            for gRPCSit in sitInCtxt.situations:
 
 
-            situation = Situation.deserialize(gRPCSit)
+                situation = Situation.deserialize(gRPCSit)
 
-            invalidation_type = self._update_situation(timeline, situation)
+                invalidation_type = self._update_situation(timeline, situation)
+                updated_situations.append(situation)
 
-            logger.info("<%s> updated situation <%s> in world <%s>" % \
-                                (self._clientname(client_id), 
-                                repr(situation), 
-                                world))
+                logger.info("<%s> updated situation <%s> in world <%s>" % \
+                                    (self._clientname(client_id), 
+                                    repr(situation), 
+                                    world))
 
 
-            logger.debug("Adding invalidation action [" + str(invalidation_type) + "]")
+                logger.debug("Adding invalidation action [" + str(invalidation_type) + "]")
 
-            if invalidation_type == UPDATE:
-                situations_to_invalidate_update.append(situation.id)
-            elif invalidation_type == NEW:
-                situations_to_invalidate_new.append(situation.id)
-            else:
-                raise RuntimeError("Unexpected invalidation type")
+                if invalidation_type == UPDATE:
+                    situations_to_invalidate_update.append(situation.id)
+                elif invalidation_type == NEW:
+                    situations_to_invalidate_new.append(situation.id)
+                else:
+                    raise RuntimeError("Unexpected invalidation type")
+
+            version = timeline.version
 
-        if situations_to_invalidate_update:
-            self._emit_invalidation(gRPC.Invalidation.TIMELINE, world, situations_to_invalidate_update, UPDATE)
-        if situations_to_invalidate_new:
-            self._emit_invalidation(gRPC.Invalidation.TIMELINE, world, situations_to_invalidate_new, NEW)
+            if self.world_store is not None and updated_situations:
+                self.world_store.log_situations(world, updated_situations)
+
+            if situations_to_invalidate_update:
+                self._emit_invalidation(gRPC.Invalidation.TIMELINE, world, situations_to_invalidate_update, UPDATE, version=version)
+            if situations_to_invalidate_new:
+                self._emit_invalidation(gRPC.Invalidation.TIMELINE, world, situations_to_invalidate_new, NEW, version=version)
 
 
         logger.debug("<updateSituations> completed")
@@ -571,26 +1243,32 @@ class Server(gRPC.BetaUnderworldsServicer):
         self._update_current_links(sitInCtxt.context.client, sitInCtxt.context.world, PROVIDER)
 
         client_id, world = sitInCtxt.context.client, sitInCtxt.context.world
-        _, timeline = self._get_scene_timeline(sitInCtxt.context)
+        with self._writing(world):
+            _, timeline = self._get_scene_timeline(sitInCtxt.context)
+
+            situations_to_invalidate_delete = []
+            for gRPCSit in sitInCtxt.situations:
+
+                situation = Situation.deserialize(gRPCSit)
 
-        situations_to_invalidate_delete = []
-        for gRPCSit in sitInCtxt.situations:
+                timeline.remove(situation)
 
-            situation = Situation.deserialize(gRPCSit)
+                logger.info("<%s> deleted situation <%s> in world <%s>" % \
+                                    (self._clientname(client_id), 
+                                    repr(situation), 
+                                    world))
 
-            timeline.remove(situation)
+                # tells everyone about the change
+                logger.debug("Sent invalidation action [delete]")
+                situations_to_invalidate_delete.append(situation.id)
 
-            logger.info("<%s> deleted situation <%s> in world <%s>" % \
-                                (self._clientname(client_id), 
-                                repr(situation), 
-                                world))
+            version = timeline.version
 
-            # tells everyone about the change
-            logger.debug("Sent invalidation action [delete]")
-            situations_to_invalidate_delete.append(situation.id)
+            if self.world_store is not None and situations_to_invalidate_delete:
+                self.world_store.log_deleted_situations(world, situations_to_invalidate_delete)
 
-        if situations_to_invalidate_delete:
-            self._emit_invalidation(gRPC.Invalidation.TIMELINE, world, situations_to_invalidate_delete, DELETE)
+            if situations_to_invalidate_delete:
+                self._emit_invalidation(gRPC.Invalidation.TIMELINE, world, situations_to_invalidate_delete, DELETE, version=version)
 
         logger.debug("<deleteSituations> completed")
         return gRPC.Empty()
@@ -603,42 +1281,198 @@ class Server(gRPC.BetaUnderworldsServicer):
         logger.debug("<hasMesh> completed")
         return res
 
+    @profile
+    def hasMeshes(self, meshIds, context):
+        logger.debug("Got <hasMeshes> from %s" % meshIds.client.id)
+
+        bitmap = bytearray((len(meshIds.ids) + 7) // 8)
+        for i, id in enumerate(meshIds.ids):
+            if id in self.meshes:
+                bitmap[i // 8] |= 1 << (i % 8)
+
+        logger.debug("<hasMeshes> completed")
+        return gRPC.MeshesAvailability(bitmap=bytes(bitmap))
+
     @profile
     def getMesh(self, meshInCtxt, context):
         logger.debug("Got <getMesh> from %s" % meshInCtxt.client.id)
+
+        id = meshInCtxt.mesh.id
+        if id not in self.meshes:
+            context.set_details("Mesh <%s> does not exist" % id)
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            return gRPC.Mesh()
+
+        # large meshes of a DiskMeshStore are memory-mapped: they are not
+        # loaded in memory as a whole
+        data = self.meshes.get(id)
+        if len(data) > _MAX_MESH_MESSAGE_SIZE:
+            context.set_details("Mesh <%s> is too large (%d bytes): use getMeshChunks" % (id, len(data)))
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            return gRPC.Mesh()
+
         logger.debug("<getMesh> completed")
-        return self.meshes[meshInCtxt.mesh.id]
+        return gRPC.Mesh.FromString(data[:])
 
     @profile
     def pushMesh(self, meshInCtxt, context):
         logger.debug("Got <pushMesh> from %s" % meshInCtxt.client.id)
+        self._push_mesh(meshInCtxt)
+        logger.debug("<pushMesh> completed")
+        return gRPC.Empty()
+
+    def _push_mesh(self, meshInCtxt):
 
         mesh_id = meshInCtxt.mesh.id
-        self.meshes[mesh_id] = meshInCtxt.mesh
+        self.meshes.add(mesh_id, meshInCtxt.mesh.SerializeToString())
 
         logger.info("<%s> added a new mesh ID %s (%d faces)" % \
                                 (self._clientname(meshInCtxt.client.id),
                                 mesh_id, 
-                                len(self.meshes[mesh_id].faces)))
+                                _nb_faces(meshInCtxt.mesh)))
 
-        logger.debug("<pushMesh> completed")
+    @profile
+    def pushMeshes(self, meshInCtxt_iterator, context):
+        logger.debug("Got <pushMeshes>")
+
+        nb_meshes = 0
+        for meshInCtxt in meshInCtxt_iterator:
+            self._push_mesh(meshInCtxt)
+            nb_meshes += 1
+
+        logger.debug("<pushMeshes> completed (%d meshes)" % nb_meshes)
         return gRPC.Empty()
 
+    @profile
+    def getMeshChunks(self, transfer, context):
+        logger.debug("Got <getMeshChunks> from %s" % transfer.client.id)
 
-#
-#                ###########################################################################
-#                # SCENES
-#                ###########################################################################
-#                if cmd == "deepcopy":
-#                    self.update_current_links(client, world, PROVIDER)
-#                    logger.info("<%s> made a deep copy of world %s "
-#                                "into world %s" % (clientname, arg, world))
-#                    self._worlds[world].deepcopy(self._worlds[arg])
-#                    rpc.send(b"ack")
-#
-#
-#
+        if transfer.id not in self.meshes:
+            context.set_details("Mesh <%s> does not exist" % transfer.id)
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            return
+
+        # large meshes of a DiskMeshStore are memory-mapped: only the chunks
+        # are actually read
+        data = self.meshes.get(transfer.id)
+
+        for offset in range(transfer.offset, len(data), _MESH_CHUNK_SIZE):
+            yield gRPC.MeshChunk(id=transfer.id,
+                                 offset=offset,
+                                 size=len(data),
+                                 data=data[offset:offset + _MESH_CHUNK_SIZE])
+
+        logger.debug("<getMeshChunks> completed")
+
+    @profile
+    def pushMeshChunks(self, chunk_iterator, context):
+        logger.debug("Got <pushMeshChunks>")
+
+        status = gRPC.MeshTransfer()
+
+        for chunk in chunk_iterator:
+            chunk_status = self._push_mesh_chunk(chunk, context)
+            if chunk_status is None:
+                return status
+            status = chunk_status
+
+        logger.debug("<pushMeshChunks> completed")
+        return status
+
+    def _push_mesh_chunk(self, chunk, context):
+        """ Adds a chunk to the mesh being uploaded, and stores the mesh
+        once complete.
+
+        :returns: the status of the upload, or None if the chunk is invalid
+        (the error is then set on the context).
+        """
+
+        self._drop_partial_meshes(lambda client_id, last_chunk: \
+                                    last_chunk < time.time() - _PARTIAL_MESH_EXPIRY)
+
+        with self._partial_meshes_lock:
+            size, data, _, _ = self._partial_meshes.get(chunk.id, (chunk.size, bytearray(), None, None))
+            received = len(data) # already counted in _partial_meshes_size
+
+            if size != chunk.size:
+                # the client restarted the upload from scratch
+                size, data = chunk.size, bytearray()
+
+            if chunk.offset > len(data):
+                context.set_details("Chunk of mesh <%s> at offset %d, but only %d bytes received so far" % (chunk.id, chunk.offset, len(data)))
+                context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+                return None
+
+            if chunk.offset + len(chunk.data) > size:
+                context.set_details("Chunk of mesh <%s> ends at byte %d, beyond the size of the mesh (%d bytes)" % (chunk.id, chunk.offset + len(chunk.data), size))
+                context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+                return None
+
+            if self._partial_meshes_size - received + chunk.offset + len(chunk.data) > _MAX_PARTIAL_MESHES_SIZE:
+                context.set_details("Too many meshes being uploaded: no room left for mesh <%s>" % chunk.id)
+                context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+                return None
+
+            # chunks sent again after an interruption replace the former ones
+            del data[chunk.offset:]
+            data.extend(chunk.data)
+
+            self._partial_meshes_size -= received
+            if len(data) < size:
+                self._partial_meshes[chunk.id] = (size, data, chunk.client.id, time.time())
+                self._partial_meshes_size += len(data)
+            else:
+                self._partial_meshes.pop(chunk.id, None)
+
+        status = gRPC.MeshTransfer(id=chunk.id, offset=len(data), size=size)
+
+        if len(data) == size:
+            data = bytes(data)
 
+            try:
+                mesh = gRPC.Mesh.FromString(data)
+            except DecodeError as e:
+                context.set_details("Invalid content for mesh <%s>: %s" % (chunk.id, e))
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                return None
+
+            if mesh.id != chunk.id:
+                context.set_details("Mesh <%s> uploaded as mesh <%s>" % (mesh.id, chunk.id))
+                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                return None
+
+            self.meshes.add(mesh.id, data)
+
+            logger.info("<%s> added a new mesh ID %s (%d faces)" % \
+                                    (self._clientname(chunk.client.id),
+                                    mesh.id,
+                                    _nb_faces(mesh)))
+
+        return status
+
+    def _drop_partial_meshes(self, predicate):
+        """ Abandons the uploads in chunks for which
+        predicate(uploading client id, time of the last chunk) is true.
+        """
+
+        with self._partial_meshes_lock:
+            for id, (size, data, client_id, last_chunk) in list(self._partial_meshes.items()):
+                if predicate(client_id, last_chunk):
+                    logger.debug("Upload of mesh <%s> abandoned" % id)
+                    del self._partial_meshes[id]
+                    self._partial_meshes_size -= len(data)
+
+    @profile
+    def getMeshUploadStatus(self, transfer, context):
+        logger.debug("Got <getMeshUploadStatus> from %s" % transfer.client.id)
+
+        with self._partial_meshes_lock:
+            size, data, _, _ = self._partial_meshes.get(transfer.id, (0, b"", None, None))
+
+        return gRPC.MeshTransfer(id=transfer.id, offset=len(data), size=size)
+
+
+#
 #                ###########################################################################
 #                # TIMELINES
 #                ###########################################################################
@@ -653,10 +1487,35 @@ class Server(gRPC.BetaUnderworldsServicer):
 #                    pass #TODO
 #
 
-def start(port=50051, signaling_queue=None):
+def start(port=50051, signaling_queue=None, mesh_store=None, world_store=None,
+          workers=DEFAULT_WORKERS, max_concurrent_rpcs=None,
+          max_concurrent_streams=None, max_message_size=None, aio=False):
     """Starts the underworlds server in a thread on the given port and returns
     the resulting gRPC server.
 
+    :param mesh_store: where meshes are stored (see Server)
+    :param world_store: where worlds are saved, if anywhere (see Server).
+    It is closed when the server exits (blocking behaviour only, see below).
+    :param workers: size of the thread pool processing the requests. Each
+    client with streamed invalidations holds one of these threads for as long
+    as it is connected: at most half of the pool can be held that way, further
+    clients are asked to use their own invalidation server (cf Server.helo).
+    :param max_concurrent_rpcs: if not None, requests received while this
+    many requests are already being processed are rejected (with
+    RESOURCE_EXHAUSTED) instead of being queued. Not supported by older
+    versions of grpcio (like the 1.4 used by the CI).
+    :param max_concurrent_streams: if not None, max number of concurrent
+    requests per client connection (HTTP/2 streams). Further requests wait
+    on the client side.
+    :param max_message_size: if not None, max size (in bytes) of the messages
+    sent and received by the server (gRPC default: 4MB for received
+    messages).
+    :param aio: if True, runs the asyncio implementation of the server (see
+    underworlds.aioserver; python 3 and grpcio >= 1.32 only): connected
+    clients then do not hold any thread, and `workers` only sets the size
+    of the pool processing the requests that access the worlds or the
+    meshes.
+
     If signaling_queue is provided, the behaviour is blocking:
     it creates and start an underworlds server, then blocks until something is pushed onto the queue.
     It then properly closes the server and returns None.
@@ -664,14 +1523,41 @@ def start(port=50051, signaling_queue=None):
 
     desired_port=str(port)
 
-    server = gRPC.beta_create_Underworlds_server(Server())
-    port = server.add_insecure_port('[::]:%s' % desired_port)
+    options = []
+    if max_concurrent_streams is not None:
+        options.append(("grpc.max_concurrent_streams", max_concurrent_streams))
+    if max_message_size is not None:
+        options.append(("grpc.max_send_message_length", max_message_size))
+        options.append(("grpc.max_receive_message_length", max_message_size))
+
+    if aio:
+        from underworlds.aioserver import AsyncServerThread
+        server = AsyncServerThread(mesh_store, world_store,
+                                   workers=workers,
+                                   options=options,
+                                   maximum_concurrent_rpcs=max_concurrent_rpcs)
+    else:
+        # only passed if set: older versions of grpcio do not support it
+        kwargs = {}
+        if max_concurrent_rpcs is not None:
+            kwargs["maximum_concurrent_rpcs"] = max_concurrent_rpcs
+
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers),
+                             options=options,
+                             **kwargs)
+        max_streams = max(1, int(workers * _MAX_STREAMS_SHARE))
+        gRPC.add_UnderworldsServicer_to_server(Server(mesh_store, world_store, max_streams), server)
+
+    try:
+        port = server.add_insecure_port('[::]:%s' % desired_port)
+    except RuntimeError: # recent versions of gRPC raise instead of returning 0
+        port = 0
 
     if port == 0:
         raise RuntimeError("The port %s is already in use! Underworlds server already running? "
                      "I can not start the server." % desired_port)
 
-    logger.info("Starting the server...")
+    logger.info("Starting the %sserver (%d workers)..." % ("asyncio " if aio else "", workers))
     server.start()
     time.sleep(0.2) # leave some time to the server to start
     logger.info("Server started.")
@@ -683,13 +1569,24 @@ def start(port=50051, signaling_queue=None):
         signaling_queue.get()
         logger.info("uwds server exiting. Closing connections...")
         server.stop(1).wait()
+        if world_store is not None:
+            world_store.close()
         logger.info("uwds server closed.")
 
-def start_process(port=50051):
+def start_process(port=50051, mesh_store=None, world_store=None, **options):
+    """ Starts the underworlds server in a separate process.
+
+    :param options: other options of the server (workers,
+    max_concurrent_rpcs...), see start
+
+    :returns: the process and the queue to push something onto to stop the
+    server (see start)
+    """
     import multiprocessing
 
     q = multiprocessing.Queue()
-    p = multiprocessing.Process(target=start, args=(port, q,))
+    kwargs = dict(options, port=port, signaling_queue=q, mesh_store=mesh_store, world_store=world_store)
+    p = multiprocessing.Process(target=start, kwargs=kwargs)
     p.start()
 
     return p, q
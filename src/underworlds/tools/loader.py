@@ -3,6 +3,12 @@
 
 import sys
 import uuid
+import threading
+
+try:
+    import queue
+except ImportError: # python2
+    import Queue as queue
 
 import logging; logger = logging.getLogger("underworlds.model_loader")
 
@@ -21,12 +27,82 @@ from underworlds.helpers import transformations
 DEFAULT_WORLD = "base"
 ROTATION_180_X = numpy.array([[1,0,0,0],[0,-1,0,0],[0,0,-1,0],[0,0,0,1]], dtype=numpy.float32)
 
+class MeshUploader(threading.Thread):
+    """ Sends meshes to the server in the background, as they are added,
+    skipping the ones that are already available on the server.
+
+    Meshes added while a batch is being uploaded are grouped in the next
+    batch: one hasMeshes and one pushMeshes request per batch.
+    """
+
+    def __init__(self, ctx):
+        threading.Thread.__init__(self, name="mesh uploader")
+        self.daemon = True
+
+        self.ctx = ctx
+        self.nb_sent = 0
+        self.nb_notsent = 0
+        self.error = None
+
+        self._meshes = queue.Queue()
+
+    def add(self, mesh):
+        self._meshes.put(mesh)
+
+    def finish(self):
+        """ Waits until all the meshes added so far are uploaded. The upload
+        error, if any, is then stored in `error` (it is not re-raised: the
+        caller might be handling another error).
+        """
+        self._meshes.put(None)
+        self.join()
+
+    def run(self):
+
+        done = False
+        while not done:
+            batch = [self._meshes.get()]
+            while True:
+                try:
+                    batch.append(self._meshes.get_nowait())
+                except queue.Empty:
+                    break
+
+            if batch[-1] is None:
+                done = True
+                batch.pop()
+
+            if not batch or self.error is not None:
+                continue
+
+            try:
+                self._upload(batch)
+            except Exception as e:
+                logger.error("Error while sending meshes to the server: %s" % e)
+                self.error = e
+
+    def _upload(self, meshes):
+
+        available = self.ctx.has_meshes([mesh.id for mesh in meshes])
+        missing = [mesh for mesh, ok in zip(meshes, available) if not ok]
+
+        logger.debug("Sending %d meshes (%d already available on the server)" % (len(missing), len(meshes) - len(missing)))
+        if missing:
+            self.ctx.push_meshes(missing)
+
+        self.nb_sent += len(missing)
+        self.nb_notsent += len(meshes) - len(missing)
+
 class ModelLoader:
 
     def __init__(self):
 
         self.meshes = {}
 
+        # if not None, the MeshUploader that sends the meshes to the server
+        # as they are created
+        self.uploader = None
+
         # mapping {assimp name: (assimp node, underworld node)}
         self.node_map = {}
 
@@ -74,18 +150,17 @@ class ModelLoader:
 
             for m in assimp_node.meshes:
                 if scale != 1.0:
-                    vertices = [[vertex[0] * scale, vertex[1] * scale, vertex[2] * scale] for vertex in m.vertices]
-                    m.vertices = vertices
-                else:
-                    vertices = m.vertices.tolist()
+                    m.vertices = m.vertices * scale
 
-                mesh = MeshData(vertices,
-                                m.faces.tolist(), 
-                                m.normals.tolist(),
+                mesh = MeshData(m.vertices,
+                                m.faces,
+                                m.normals,
                                 m.material.properties["diffuse"] if ('diffuse', 0) in m.material.properties else (0,0,0,1))
 
                 id = mesh.id
                 logger.debug("\tLoading mesh %s" % id)
+                if id not in self.meshes and self.uploader is not None:
+                    self.uploader.add(mesh)
                 self.meshes[id] = mesh
                 if underworlds_node.properties["mesh_ids"] is None:
                     underworlds_node.properties["mesh_ids"] = [id]
@@ -188,30 +263,31 @@ class ModelLoader:
         self.recur_node(model.rootnode, model)
 
         logger.info("%d nodes in the model" % len(self.node_map))
-        logger.info("Loading the nodes...")
-        for n, pair in list(self.node_map.items()):
-            self.fill_node_details(*pair,
-                                    assimp_model = model,
-                                    custom_root=root, scale=scale)
-        logger.info("...done")
 
+        # the meshes are sent to the server (if they do not already exist
+        # there) while the nodes are being loaded
+        self.uploader = MeshUploader(ctx)
+        self.uploader.start()
 
-        # Send first the meshes to make sure they are available on the server
-        # when needed by clients.  (but only if they do not already exist on
-        # the server)
-        logger.info("Sending meshes to the server...")
-        count_sent = 0
-        count_notsent = 0
-        for id, mesh in list(self.meshes.items()):
-            if ctx.has_mesh(id):
-                logger.debug("Not resending mesh <%s>: already available on the server" % id)
-                count_notsent += 1
-            else:
-                logger.debug("Sending mesh <%s>" % id)
-                ctx.push_mesh(mesh)
-                count_sent += 1
-
-        logger.info("Sent %d meshes (%d were already available on the server)" % (count_sent, count_notsent))
+        logger.info("Loading the nodes...")
+        try:
+            for n, pair in list(self.node_map.items()):
+                self.fill_node_details(*pair,
+                                        assimp_model = model,
+                                        custom_root=root, scale=scale)
+            logger.info("...done")
+
+        finally:
+            # Wait for the meshes to make sure they are available on the
+            # server when needed by clients.
+            logger.info("Sending meshes to the server...")
+            uploader, self.uploader = self.uploader, None
+            uploader.finish()
+
+        if uploader.error is not None:
+            raise uploader.error
+
+        logger.info("Sent %d meshes (%d were already available on the server)" % (uploader.nb_sent, uploader.nb_notsent))
 
         if not only_meshes:
             nodes = ctx.worlds[world].scene.nodes
@@ -2,6 +2,11 @@ import uuid
 import copy
 import json
 import time
+import struct
+import hashlib
+import itertools
+
+from collections import OrderedDict, deque
 
 import logging
 logger = logging.getLogger("underworlds.core")
@@ -57,6 +62,103 @@ INVALIDATIONTYPE_NAMES = {NEW: "new",
                           DELETE: "delete"
                          }
 
+# Node fields that can be updated individually (cf Node.update_fields)
+NODE_FIELDS = ["name", "parent", "transformation", "properties"]
+
+# 16 little-endian 32bit floats. The type (float32) ensures OpenGL
+# compatibilty on 64bit platforms
+_TRANSFORMATION_DTYPE = numpy.dtype("<f4")
+
+def _serialize_transformation(transformation):
+    return numpy.ascontiguousarray(transformation, dtype=_TRANSFORMATION_DTYPE).tobytes()
+
+def _deserialize_transformation(data):
+    """Converts the transformation of a protobuf node into a (writable) 4x4
+    numpy array.
+    """
+    if data.packed_transformation:
+        transformation = numpy.frombuffer(data.packed_transformation, dtype=_TRANSFORMATION_DTYPE)
+        return transformation.astype(numpy.float32).reshape(4,4)
+
+    # legacy encoding
+    return numpy.array(data.transformation, dtype=numpy.float32).reshape(4,4)
+
+def _deserialize_property(name, value):
+    """Decodes a property from the legacy (json) encoding
+    """
+    value = json.loads(value)
+    if name == "facing":
+        value = numpy.array(value, dtype=numpy.float32).reshape(4,4)
+    return value
+
+try:
+    _STRING_TYPES = (str, unicode)
+    _INTEGER_TYPES = (int, long)
+except NameError: # python3
+    _STRING_TYPES = (str,)
+    _INTEGER_TYPES = (int,)
+
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+def _isinteger(v):
+    return isinstance(v, _INTEGER_TYPES) and not isinstance(v, bool) \
+            and _INT64_MIN <= v <= _INT64_MAX
+
+def _isnumber(v):
+    return isinstance(v, (float, numpy.floating))
+
+def _encode_property(value, pv):
+    """Encodes a property value into a PropertyValue message.
+
+    Values that do not fit one of the typed encodings (for instance, lists
+    mixing integers and floats, or dictionaries) are json-encoded.
+    """
+    if isinstance(value, bool):
+        pv.boolean = value
+    elif _isinteger(value):
+        pv.integer = value
+    elif _isnumber(value):
+        pv.number = value
+    elif isinstance(value, _STRING_TYPES):
+        pv.text = value
+    elif isinstance(value, numpy.ndarray):
+        if value.dtype.kind not in "biuf":
+            pv.json = json.dumps(value.tolist())
+            return
+        pv.array.dtype = value.dtype.str
+        pv.array.shape.extend(value.shape)
+        pv.array.data = numpy.ascontiguousarray(value).tobytes()
+    elif isinstance(value, (list, tuple)) and value:
+        if all(isinstance(v, bool) for v in value):
+            pv.booleans.values.extend(value)
+        elif all(_isinteger(v) for v in value):
+            pv.integers.values.extend(value)
+        elif all(_isnumber(v) for v in value):
+            pv.numbers.values.extend(value)
+        elif all(isinstance(v, _STRING_TYPES) for v in value):
+            pv.texts.values.extend(value)
+        else:
+            pv.json = json.dumps(value)
+    else:
+        pv.json = json.dumps(value)
+
+def _decode_property(pv):
+    """Decodes a PropertyValue message.
+    """
+    kind = pv.WhichOneof("value")
+
+    if kind in ("boolean", "integer", "number", "text"):
+        return getattr(pv, kind)
+    elif kind in ("booleans", "integers", "numbers", "texts"):
+        return list(getattr(pv, kind).values)
+    elif kind == "array":
+        array = numpy.frombuffer(pv.array.data, dtype=numpy.dtype(str(pv.array.dtype)))
+        return array.reshape(tuple(pv.array.shape)).copy()
+    elif kind == "json":
+        return json.loads(pv.json)
+
+    return None
+
 class Node(object):
     def __init__(self, name = "", type = UNDEFINED):
 
@@ -90,6 +192,10 @@ class Node(object):
         ##                     END OF THE API                         ##
         ################################################################
 
+        # json-encoded property values received for this node, with their
+        # decoded value: {name: (json, value)} (see Node.deserialize)
+        self._properties_cache = {}
+
     # getters for read-only properties
     @property
     def children(self):
@@ -142,82 +248,162 @@ class Node(object):
 
         return node
 
-    def serialize(self, NodeType):
+    def serialize(self, NodeType, fields=None):
         """Outputs a protobuf encoding of the node
 
         The NodeType (underworlds_pb2.Node) needs to be passed as parameter
         to prevent the creation of a 2nd instance of the underworlds_pb2 that
         crashes the gRPC. Not sure why...
         Similar to http://stackoverflow.com/questions/32010905/unbound-method-must-be-called-with-x-instance-as-first-argument-got-x-instance
+
+        :param fields: if not None, a list of fields (see NODE_FIELDS): only
+        the node ID, type, last update and these fields are encoded (partial
+        encoding, see Node.update_fields).
         """
 
 
         node = NodeType()
         node.id = self.id
-        node.name = self.name
         node.type = self._type
-        node.parent = self.parent if self.parent is not None else ""
+        node.last_update = self.last_update
 
-        for c in self.children:
-            node.children.append(c)
+        if fields is None or "name" in fields:
+            node.name = self.name
 
-        for v in self.transformation.flatten().tolist():
-            node.transformation.append(v)
+        if fields is None or "parent" in fields:
+            node.parent = self.parent if self.parent is not None else ""
 
-        node.last_update = self.last_update
+        if fields is None:
+            for c in self.children:
+                node.children.append(c)
+
+        if fields is None or "transformation" in fields:
+            node.packed_transformation = _serialize_transformation(self.transformation)
+
+        if fields is not None and "properties" not in fields:
+            return node
 
         for k, v in self.properties.items():
             if v is None:
                 raise UnderworldsError("Property %s is required but not set (and has no default value)" % k)
             
-            if k == "facing":
-                l = []
-                for sv in v.flatten().tolist():
-                    l.append(sv)
-                node.properties[k]=json.dumps(l)
-            else:
-                node.properties[k] = json.dumps(v)
+            _encode_property(v, node.typed_properties[k])
 
         return node
 
+    def _decode_properties(self, data, properties, previous=None):
+        """Decodes the properties of `data` into the `properties` dictionary.
+
+        Json-encoded values already decoded for `previous` (a former
+        version of the node) are reused instead of being parsed again.
+        """
+
+        # legacy encoding first: typed properties take precedence
+        for k, v in data.properties.items():
+            properties[k] = _deserialize_property(k, v)
+
+        for k, v in data.typed_properties.items():
+            if v.WhichOneof("value") != "json":
+                properties[k] = _decode_property(v)
+                continue
+
+            cached = previous._properties_cache.get(k) if previous is not None else None
+            if cached is not None and cached[0] == v.json:
+                value = cached[1]
+            else:
+                value = json.loads(v.json)
+
+            self._properties_cache[k] = (v.json, value)
+            properties[k] = value
+
     @staticmethod
-    def deserialize(data):
+    def deserialize(data, previous=None):
         """Creates a node from a protobuf encoding.
+
+        :param previous: if not None, a former version of the same node.
+        Json-encoded properties that did not change since this version are
+        not decoded again: their value is shared with the former version
+        (and must therefore be replaced, not modified in place).
         """
 
-        if data.type == UNDEFINED:
-            node = Node()
-        elif data.type == ENTITY:
-            node = Entity()
-        elif data.type == MESH:
-            node = Mesh()
-        elif data.type == CAMERA:
-            node = Camera()
-        else:
-            raise UnderworldsError("Unknown node type %s while deserializing a gRPC node" % data.type)
+        node = _blank_node(data.type)
 
         node.id = data.id
         node.name = data.name
         node.parent = data.parent if data.parent else None # convert empty string to None if needed
 
-        for c in data.children:
-            node._children.append(c)
+        node._children = data.children[:]
 
-        node.transformation = [v for v in data.transformation]
-
-        # Convert the transformation into a proper numpy array.
-        # The type (float32) ensures OpenGL compatibilty on 64bit platforms
-        node.transformation = numpy.array(node.transformation, dtype=numpy.float32).reshape(4,4)
+        node.transformation = _deserialize_transformation(data)
 
         node.last_update = data.last_update
 
-        for k, v in data.properties.items():
-            node.properties[k] = json.loads(v)
-            if k == "facing":
-                node.properties[k] = numpy.array(node.properties[k], dtype=numpy.float32).reshape(4,4)
+        if len(data.properties) or len(data.typed_properties):
+            node._decode_properties(data, node.properties, previous)
 
         return node
 
+    def update_fields(self, data, fields):
+        """Updates some fields of the node from a (possibly partial) protobuf
+        encoding of the node (see Node.serialize).
+
+        The fields are replaced by new objects, and not modified in place:
+        shallow copies of the node (copy.copy) are not affected.
+
+        :param fields: the list of fields to update (see NODE_FIELDS). For
+        'properties', the properties of `data` are added to (or replace)
+        the existing ones.
+        """
+
+        for field in fields:
+            if field == "name":
+                self.name = data.name
+            elif field == "parent":
+                self.parent = data.parent if data.parent else None
+            elif field == "transformation":
+                self.transformation = _deserialize_transformation(data)
+            elif field == "properties":
+                properties = dict(self.properties)
+                self._properties_cache = dict(self._properties_cache)
+                self._decode_properties(data, properties, self)
+                self.properties = properties
+            else:
+                raise UnderworldsError("Field <%s> of node %s does not exist or can not be updated" % (field, repr(self)))
+
+        self.last_update = data.last_update
+
+# a default instance of each type of node, used as template by _blank_node
+_node_templates = {}
+
+def _blank_node(type):
+    """Returns a new node of the given type, with the default properties of
+    this type.
+
+    Much faster than calling the constructor of the node (no ID is generated,
+    no transformation matrix is allocated...): Node.deserialize sets all the
+    fields anyway, and is called for every node received or restored.
+    """
+    template = _node_templates.get(type)
+    if template is None:
+        if type == UNDEFINED:
+            template = Node()
+        elif type == ENTITY:
+            template = Entity()
+        elif type == MESH:
+            template = Mesh()
+        elif type == CAMERA:
+            template = Camera()
+        else:
+            raise UnderworldsError("Unknown node type %s while deserializing a gRPC node" % type)
+        _node_templates[type] = template
+
+    node = object.__new__(template.__class__)
+    node.__dict__.update(template.__dict__)
+    node._children = []
+    node.properties = dict(template.properties)
+    node._properties_cache = {}
+    return node
+
 class Entity(Node):
 
     def __init__(self, name = ""):
@@ -249,25 +435,57 @@ class Camera(Node):
                 "horizontalfov": None,
             }
 
+# on-the-wire types of the vertices/normals coordinates and of the faces
+# indices (little-endian 32bit floats and unsigned integers)
+_MESH_COORDS_DTYPE = numpy.dtype("<f4")
+_MESH_INDICES_DTYPE = numpy.dtype("<u4")
+
+def _points_array(points, dtype):
+    """Returns a (N, 3) numpy array from a sequence of 3D points (or faces)
+    """
+    return numpy.asarray(points, dtype=dtype).reshape(-1, 3)
+
 class MeshData(object):
+    """A 3D mesh.
+
+    vertices, faces and normals are stored as (N, 3) numpy arrays (of
+    float32 for vertices and normals, uint32 for faces). The arrays of
+    deserialized meshes are read-only.
+    """
 
     def __init__(self, vertices, faces, normals, diffuse=(1,1,1,1)):
 
         self.id = ""
-        self.vertices = vertices
-        self.faces = faces
-        self.normals = normals
+        self.vertices = _points_array(vertices, _MESH_COORDS_DTYPE)
+        self.faces = _points_array(faces, _MESH_INDICES_DTYPE)
+        self.normals = _points_array(normals, _MESH_COORDS_DTYPE)
         self.diffuse = tuple(diffuse) # diffuse color, white by default
         if len(self.diffuse) == 3: self.diffuse += (1,)
 
-        self.id = str(hash(str(self.serialize(gRPC.Mesh))))
+        self.id = self._content_hash()
+
+    def _content_hash(self):
+        """Returns a hash of the mesh content, computed over the (wire
+        encoding of) vertices, faces, normals and diffuse color.
+
+        Identical meshes get the same hash, across processes and hosts.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for array, dtype in ((self.vertices, _MESH_COORDS_DTYPE),
+                             (self.faces, _MESH_INDICES_DTYPE),
+                             (self.normals, _MESH_COORDS_DTYPE),
+                             (self.diffuse, _MESH_COORDS_DTYPE)):
+            array = numpy.ascontiguousarray(array, dtype=dtype)
+            h.update(struct.pack("<Q", array.nbytes))
+            h.update(array)
+        return h.hexdigest()
 
     def __hash__(self):
-        m = (self.vertices, \
-             self.faces, \
-             self.normals, \
+        m = (self.vertices.tobytes(), \
+             self.faces.tobytes(), \
+             self.normals.tobytes(), \
              self.diffuse)
-        return hash(str(m))
+        return hash(m)
 
     def serialize(self, MeshType):
         """Outputs a protobuf encoding of the mesh
@@ -282,41 +500,80 @@ class MeshData(object):
         mesh = MeshType()
         mesh.id = self.id
 
-        for vertex in self.vertices:
-            point = mesh.vertices.add()
-            point.x, point.y, point.z = vertex
-
-        for f in self.faces:
-            face = mesh.faces.add()
-            face.x, face.y, face.z = f
-
-        for normal in self.normals:
-            point = mesh.normals.add()
-            point.x, point.y, point.z = normal
+        mesh.packed_vertices = numpy.ascontiguousarray(self.vertices, dtype=_MESH_COORDS_DTYPE).tobytes()
+        mesh.packed_faces = numpy.ascontiguousarray(self.faces, dtype=_MESH_INDICES_DTYPE).tobytes()
+        mesh.packed_normals = numpy.ascontiguousarray(self.normals, dtype=_MESH_COORDS_DTYPE).tobytes()
 
         mesh.diffuse.r, mesh.diffuse.g, mesh.diffuse.b, mesh.diffuse.a = self.diffuse
 
         logger.info("Serialized mesh %s in %.2fsec" % (self.id, time.time()-starttime))
         return mesh
 
+    @staticmethod
+    def _deserialize_points(packed, points, dtype):
+        if packed:
+            return numpy.frombuffer(packed, dtype=dtype).reshape(-1, 3)
+        # legacy encoding
+        return _points_array([(p.x, p.y, p.z) for p in points], dtype)
+
+    @staticmethod
+    def from_arrays(id, vertices, faces, normals, diffuse):
+        """Creates a mesh from its ID and (N, 3) arrays of vertices, faces and
+        normals, without copying the arrays nor re-computing the ID.
+        """
+        mesh = MeshData.__new__(MeshData)
+        mesh.id = id
+        mesh.vertices = vertices
+        mesh.faces = faces
+        mesh.normals = normals
+        mesh.diffuse = tuple(diffuse)
+        return mesh
 
     @staticmethod
     def deserialize(data):
         """Creates a Python mesh object from a protobuf encoding.
         """
 
-        mesh = MeshData(vertices=[(p.x,p.y,p.z) for p in data.vertices],
-                    faces = [(f.x,f.y,f.z) for f in data.faces],
-                    normals = [(n.x,n.y,n.z) for n in data.normals],
-                    diffuse = (data.diffuse.r, data.diffuse.g, data.diffuse.b, data.diffuse.a))
+        mesh = MeshData.from_arrays(data.id,
+                    MeshData._deserialize_points(data.packed_vertices, data.vertices, _MESH_COORDS_DTYPE),
+                    MeshData._deserialize_points(data.packed_faces, data.faces, _MESH_INDICES_DTYPE),
+                    MeshData._deserialize_points(data.packed_normals, data.normals, _MESH_COORDS_DTYPE),
+                    (data.diffuse.r, data.diffuse.g, data.diffuse.b, data.diffuse.a))
 
         #if mesh.id != data.id:
         #    raise RuntimeError("Can not verify mesh integrity!")
 
         return mesh
 
+# versions of the scenes and timelines (cf Scene.version). They are drawn
+# from a single counter: versions always increase, even across scenes (when a
+# world is replaced by a copy of another one, for instance)
+_versions = itertools.count(1)
+
+# default number of changes a scene remembers, to rebuild its former
+# versions (cf Scene.nodes_at)
+_SCENE_HISTORY_SIZE = 10000
+
 class Scene(object):
     """An Underworlds scene
+
+    Nodes are indexed by ID (the index preserves the insertion order, which
+    is the order exposed to clients), by name, and by parent (parent ID ->
+    children IDs), so that lookups do not depend on the size of the scene.
+
+    The scene must be modified through Scene.update and Scene.remove only,
+    to keep these indices consistent. The scene also maintains the list of
+    children (Node.children) of the nodes it stores: it is updated
+    incrementally, only when the parent of a node changes.
+
+    Scenes can be copied cheaply (Scene.copy): the nodes are shared between
+    the copies until they are replaced. Nodes stored in a scene must
+    therefore never be modified in place: pass a modified copy of the node
+    to Scene.update instead.
+
+    Each change gives the scene a new version (Scene.version). The scene
+    remembers the nodes replaced or removed by its last `history_size`
+    changes, so that these former versions can be rebuilt (Scene.nodes_at).
     """
 
     def __init__(self):
@@ -324,9 +581,113 @@ class Scene(object):
         self.rootnode = Entity("root")
         self.rootnode.transformation = numpy.identity(4, dtype=numpy.float32)
 
-        self.nodes = []
+        self._nodes = OrderedDict() # node ID -> node
+
+        # secondary indices. The values are ordered sets of node IDs
+        # (OrderedDict with None values) so that removals are O(1) as well.
+        self._nodes_by_name = {} # node name -> node IDs
+        self._children = {} # parent ID -> children IDs
+
+        # (name, parent) under which each node is currently indexed. Nodes
+        # may be modified in place before being passed to Scene.update, so
+        # we can not rely on the stored node to know its previous keys.
+        self._keys = {} # node ID -> (name, parent ID)
 
-        self.nodes.append(self.rootnode)
+        # IDs of the nodes shared with copies of this scene (cf Scene.copy)
+        self._shared = set()
+
+        self.version = 0
+        self.history_size = _SCENE_HISTORY_SIZE
+        # (version, node ID, node before this change -- None for new nodes)
+        # of the last changes, oldest first
+        self._history = deque()
+
+        self.update(self.rootnode)
+
+        # the oldest version that can be rebuilt
+        self._history.clear()
+        self._first_version = self.version
+
+    def copy(self):
+        """ Returns a copy of the scene.
+
+        The nodes themselves are not copied: they are shared by both scenes
+        (copy-on-write). The scenes maintain the list of children of their
+        nodes (Node.children) separately: a shared node is replaced by a
+        private copy before its list of children is modified.
+        """
+
+        scene = Scene.__new__(Scene)
+
+        scene.rootnode = self.rootnode
+        scene._nodes = self._nodes.copy()
+        scene._nodes_by_name = {name: ids.copy() for name, ids in self._nodes_by_name.items()}
+        scene._children = {parent: ids.copy() for parent, ids in self._children.items()}
+        scene._keys = self._keys.copy()
+
+        scene._shared = set(self._nodes)
+        self._shared = set(self._nodes)
+
+        scene.version = next(_versions)
+        scene.history_size = self.history_size
+        scene._history = deque()
+        scene._first_version = scene.version
+
+        return scene
+
+    def nodes_at(self, version):
+        """ Returns the list of the nodes of the scene as they were at a given
+        version, in insertion order (nodes removed since then come last).
+
+        The children of the returned nodes (Node.children) are not rebuilt:
+        they reflect the current scene. Use the parents of the nodes instead.
+
+        :raises ValueError: if the scene can not be rebuilt at this version
+        anymore (it is older than the last `history_size` changes, or than
+        the scene itself)
+        """
+
+        if version < self._first_version:
+            raise ValueError("Version %d of the scene is not available anymore "
+                             "(oldest available version: %d)" % (version, self._first_version))
+
+        if version >= self.version:
+            return list(self._nodes.values())
+
+        # nodes changed since this version -> their value at this version
+        former = {}
+        for v, id, node in reversed(list(self._history)):
+            if v <= version:
+                break
+            former[id] = node
+
+        nodes = []
+        for id, node in list(self._nodes.items()):
+            if id in former:
+                node = former.pop(id)
+                if node is None: # did not exist yet
+                    continue
+            nodes.append(node)
+
+        nodes.extend(node for node in former.values() if node is not None)
+
+        return nodes
+
+    def _record_change(self, id, former):
+        """ Gives the scene a new version, and remembers the former value
+        (None for new nodes) of the node that has changed.
+        """
+        self.version = next(_versions)
+
+        self._history.append((self.version, id, former))
+        while len(self._history) > self.history_size:
+            self._first_version = self._history.popleft()[0]
+
+    @property
+    def nodes(self):
+        """ The (read-only) sequence of nodes of the scene, in insertion order.
+        """
+        return self._nodes.values()
 
     def list_entities(self):
         """ Returns the list of entities contained in the scene.
@@ -336,18 +697,143 @@ class Scene(object):
     def node(self, id):
         """ Returns a node from its ID (or None if the node does not exist)
         """
-        for n in self.nodes:
-            if n.id == id:
-                return n
+        return self._nodes.get(id)
 
     def nodebyname(self, name):
         """ Returns a list of node that have the given name (or [] if no node has this name)
         """
-        nodes = []
-        for n in self.nodes:
-            if n.name == name:
-                nodes.append(n)
-        return nodes
+        return [self._nodes[id] for id in self._nodes_by_name.get(name, [])]
+
+    def children(self, id):
+        """ Returns the list of IDs of the nodes whose parent is the node `id`
+        (or [] if the node has no children)
+        """
+        return list(self._children.get(id, []))
+
+    def update(self, node):
+        """ Adds a node to the scene or, if a node with the same ID already
+        exists, replaces it (keeping its position in the scene).
+
+        The children of the node are set by the scene: whatever
+        node.children contains is discarded.
+
+        :returns: the node previously stored with this ID, or None if the
+        node is new.
+        """
+        oldnode = self._update(node)
+
+        self._record_change(node.id, oldnode)
+
+        return oldnode
+
+    def load(self, nodes):
+        """ Adds (or replaces) many nodes at once, like a sequence of calls
+        to Scene.update, but faster (used to restore scenes).
+
+        The whole load is a single change of the scene, and the nodes it
+        replaces are not remembered: former versions of the scene can not
+        be rebuilt anymore (see Scene.nodes_at).
+        """
+        for node in nodes:
+            self._update(node)
+
+        self.version = next(_versions)
+        self._history.clear()
+        self._first_version = self.version
+
+    def _update(self, node):
+        """ Adds or replaces a node, without recording the change (see
+        Scene.update).
+
+        :returns: the node previously stored with this ID, or None
+        """
+        oldnode = self._nodes.get(node.id)
+
+        if oldnode is not None:
+            # the list of children is maintained by the scene: carry it over
+            if node.id in self._shared:
+                node._children = list(oldnode._children)
+                self._shared.discard(node.id)
+            else:
+                node._children = oldnode._children
+
+            name, parent = self._keys[node.id]
+            if name != node.name:
+                self._unindex(self._nodes_by_name, name, node.id)
+                self._index(self._nodes_by_name, node.name, node.id)
+            if parent != node.parent:
+                self._remove_child(parent, node.id)
+                self._add_child(node.parent, node.id)
+        else:
+            # some children might have been added before their parent
+            node._children = self.children(node.id)
+            self._shared.discard(node.id)
+
+            self._index(self._nodes_by_name, node.name, node.id)
+            self._add_child(node.parent, node.id)
+
+        self._nodes[node.id] = node
+        self._keys[node.id] = (node.name, node.parent)
+
+        return oldnode
+
+    def remove(self, id):
+        """ Removes a node from the scene.
+
+        The children of the node are *not* modified: they keep referencing
+        the removed node as parent until they are updated.
+
+        :returns: the removed node
+        :raises KeyError: if the node does not exist
+        """
+        node = self._nodes.pop(id)
+        name, parent = self._keys.pop(id)
+        self._shared.discard(id)
+
+        self._unindex(self._nodes_by_name, name, id)
+        self._remove_child(parent, id)
+
+        self._record_change(id, node)
+
+        return node
+
+    def _add_child(self, parent, id):
+        self._index(self._children, parent, id)
+        if parent in self._nodes:
+            self._own(parent)._children.append(id)
+
+    def _remove_child(self, parent, id):
+        self._unindex(self._children, parent, id)
+        if parent in self._nodes:
+            self._own(parent)._children.remove(id)
+
+    def _own(self, id):
+        """ Returns the node `id`, after replacing it by a private copy if
+        it is shared with another scene.
+        """
+        node = self._nodes[id]
+
+        if id in self._shared:
+            node = copy.copy(node)
+            node._children = list(node._children)
+            self._nodes[id] = node
+            self._shared.discard(id)
+
+            if id == self.rootnode.id:
+                self.rootnode = node
+
+        return node
+
+    @staticmethod
+    def _index(index, key, id):
+        index.setdefault(key, OrderedDict())[id] = None
+
+    @staticmethod
+    def _unindex(index, key, id):
+        ids = index[key]
+        del ids[id]
+        if not ids:
+            del index[key]
 
 class Timeline(object):
     """ Stores 'situations' (ie, either events -- temporal objects
@@ -366,6 +852,9 @@ class Timeline(object):
 
         self.situations = {}
 
+        # increases with every change (cf Scene.version)
+        self.version = next(_versions)
+
     def on(self, event):
         """
         Creates a new EventMonitor to watch a given event model.
@@ -385,6 +874,17 @@ class Timeline(object):
         return EventMonitor(event)
 
 
+    def copy(self):
+        """ Returns a copy of the timeline. The situations themselves are
+        shared by both timelines: they must be replaced (Timeline.update),
+        not modified in place.
+        """
+        timeline = Timeline()
+        timeline.origin = self.origin
+        timeline.situations = dict(self.situations)
+        timeline.version = next(_versions)
+        return timeline
+
     def start(self):
         """ Asserts a situation has started.
 
@@ -396,6 +896,7 @@ class Timeline(object):
         situation = Situation()
         situation.starttime = time.time()
         self.situations[situation.id] = situation
+        self.version = next(_versions)
         return situation
 
     def end(self, situation):
@@ -406,6 +907,7 @@ class Timeline(object):
         if situation.isevent():
             return situation
         self.situations[situation.id].endtime = time.time()
+        self.version = next(_versions)
         return self.situations[situation.id]
 
     def event(self):
@@ -436,12 +938,14 @@ class Timeline(object):
         """
         isnew = situation.id in self.situations
         self.situations[situation.id] = situation
+        self.version = next(_versions)
         return not isnew
 
     def remove(self, situation):
         """ Deletes an existing situation.
         """
         del self.situations[situation.id]
+        self.version = next(_versions)
 
     def situation(self, id):
         if id in self.situations:
@@ -478,8 +982,13 @@ class World(object):
         return "world " + self.name
 
     def deepcopy(self, world):
-        self.scene = copy.copy(world.scene)
-        self.timeline = copy.copy(world.timeline)
+        """ Replaces the content of this world by a copy of `world`.
+
+        The nodes and situations are shared between both worlds until they
+        are replaced (see Scene.copy).
+        """
+        self.scene = world.scene.copy()
+        self.timeline = world.timeline.copy()
 
 
 class Situation(object):
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   name='underworlds.proto',
   package='underworlds',
   syntax='proto3',
-  serialized_pb=_b('\n\x11underworlds.proto\x12\x0bunderworlds\"\x07\n\x05\x45mpty\"\x15\n\x04\x42ool\x12\r\n\x05value\x18\x01 \x01(\x08\"\x14\n\x04Time\x12\x0c\n\x04time\x18\x01 \x01(\x01\"G\n\x07Welcome\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04host\x18\x02 \x01(\t\x12 \n\x18invalidation_server_port\x18\x03 \x01(\x05\"\x14\n\x04Size\x12\x0c\n\x04size\x18\x01 \x01(\x05\")\n\x06Pointf\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01z\x18\x03 \x01(\x02\"(\n\x05Point\x12\t\n\x01x\x18\x01 \x01(\x11\x12\t\n\x01y\x18\x02 \x01(\x11\x12\t\n\x01z\x18\x03 \x01(\x11\"3\n\x05\x43olor\x12\t\n\x01r\x18\x01 \x01(\x02\x12\t\n\x01g\x18\x02 \x01(\x02\x12\t\n\x01\x62\x18\x03 \x01(\x02\x12\t\n\x01\x61\x18\x04 \x01(\x02\"Q\n\x06\x43lient\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12-\n\x05links\x18\x03 \x03(\x0b\x32\x1e.underworlds.ClientInteraction\"\xd0\x01\n\x11\x43lientInteraction\x12\r\n\x05world\x18\x01 \x01(\t\x12<\n\x04type\x18\x02 \x01(\x0e\x32..underworlds.ClientInteraction.InteractionType\x12(\n\rlast_activity\x18\x03 \x01(\x0b\x32\x11.underworlds.Time\"D\n\x0fInteractionType\x12\n\n\x06READER\x10\x00\x12\x0c\n\x08PROVIDER\x10\x01\x12\x0b\n\x07MONITOR\x10\x02\x12\n\n\x06\x46ILTER\x10\x03\"(\n\x07\x43ontext\x12\x0e\n\x06\x63lient\x18\x01 \x01(\t\x12\r\n\x05world\x18\x02 \x01(\t\"\xee\x01\n\x0cInvalidation\x12\x30\n\x06target\x18\x01 \x01(\x0e\x32 .underworlds.Invalidation.Target\x12\x38\n\x04type\x18\x02 \x01(\x0e\x32*.underworlds.Invalidation.InvalidationType\x12\r\n\x05world\x18\x03 \x01(\t\x12\x0b\n\x03ids\x18\x04 \x03(\t\"!\n\x06Target\x12\t\n\x05SCENE\x10\x00\x12\x0c\n\x08TIMELINE\x10\x01\"3\n\x10InvalidationType\x12\x07\n\x03NEW\x10\x00\x12\n\n\x06UPDATE\x10\x01\x12\n\n\x06\x44\x45LETE\x10\x02\"@\n\x08Topology\x12\x0e\n\x06worlds\x18\x01 \x03(\t\x12$\n\x07\x63lients\x18\x02 \x03(\x0b\x32\x13.underworlds.Client\"\xc0\x02\n\x04Node\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12(\n\x04type\x18\x03 \x01(\x0e\x32\x1a.underworlds.Node.NodeType\x12\x0e\n\x06parent\x18\x04 \x01(\t\x12\x10\n\x08\x63hildren\x18\x05 \x03(\t\x12\x16\n\x0etransformation\x18\x06 \x03(\x02\x12\x13\n\x0blast_update\x18\x08 \x01(\x01\x12\x35\n\nproperties\x18\t \x03(\x0b\x32!.underworlds.Node.PropertiesEntry\x1a\x31\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\";\n\x08NodeType\x12\r\n\tUNDEFINED\x10\x00\x12\n\n\x06\x45NTITY\x10\x01\x12\x08\n\x04MESH\x10\x02\x12\n\n\x06\x43\x41MERA\x10\x03\"\x14\n\x05Nodes\x12\x0b\n\x03ids\x18\x01 \x03(\t\"W\n\rNodeInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12\x1f\n\x04node\x18\x02 \x01(\x0b\x32\x11.underworlds.Node\"Y\n\x0eNodesInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12 \n\x05nodes\x18\x02 \x03(\x0b\x32\x11.underworlds.Node\"\xf4\x01\n\tSituation\x12\n\n\x02id\x18\x01 \x01(\t\x12\x32\n\x04type\x18\x02 \x01(\x0e\x32$.underworlds.Situation.SituationType\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x13\n\x0blast_update\x18\x04 \x01(\x01\x12 \n\x05start\x18\x05 \x01(\x0b\x32\x11.underworlds.Time\x12\x1e\n\x03\x65nd\x18\x06 \x01(\x0b\x32\x11.underworlds.Time\";\n\rSituationType\x12\x0b\n\x07GENERIC\x10\x00\x12\n\n\x06MOTION\x10\x01\x12\x11\n\rEVT_MODELLOAD\x10\x02\"\x19\n\nSituations\x12\x0b\n\x03ids\x18\x01 \x03(\t\"f\n\x12SituationInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12)\n\tsituation\x18\x02 \x01(\x0b\x32\x16.underworlds.Situation\"h\n\x13SituationsInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12*\n\nsituations\x18\x02 \x03(\x0b\x32\x16.underworlds.Situation\"\xb7\x01\n\x04Mesh\x12\n\n\x02id\x18\x01 \x01(\t\x12%\n\x08vertices\x18\x02 \x03(\x0b\x32\x13.underworlds.Pointf\x12!\n\x05\x66\x61\x63\x65s\x18\x03 \x03(\x0b\x32\x12.underworlds.Point\x12$\n\x07normals\x18\x04 \x03(\x0b\x32\x13.underworlds.Pointf\x12\x0e\n\x06\x63olors\x18\x05 \x03(\r\x12#\n\x07\x64iffuse\x18\x06 \x01(\x0b\x32\x12.underworlds.Color\"U\n\rMeshInContext\x12#\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x13.underworlds.Client\x12\x1f\n\x04mesh\x18\x02 \x01(\x0b\x32\x11.underworlds.Mesh2\xe2\t\n\x0bUnderworlds\x12\x33\n\x04helo\x12\x14.underworlds.Welcome\x1a\x13.underworlds.Client\"\x00\x12\x33\n\x06\x62yebye\x12\x13.underworlds.Client\x1a\x12.underworlds.Empty\"\x00\x12\x32\n\x06uptime\x12\x13.underworlds.Client\x1a\x11.underworlds.Time\"\x00\x12\x38\n\x08topology\x12\x13.underworlds.Client\x1a\x15.underworlds.Topology\"\x00\x12\x32\n\x05reset\x12\x13.underworlds.Client\x1a\x12.underworlds.Empty\"\x00\x12\x38\n\x0bgetNodesLen\x12\x14.underworlds.Context\x1a\x11.underworlds.Size\"\x00\x12\x39\n\x0bgetNodesIds\x12\x14.underworlds.Context\x1a\x12.underworlds.Nodes\"\x00\x12\x38\n\x0bgetRootNode\x12\x14.underworlds.Context\x1a\x11.underworlds.Node\"\x00\x12:\n\x07getNode\x12\x1a.underworlds.NodeInContext\x1a\x11.underworlds.Node\"\x00\x12@\n\x0bupdateNodes\x12\x1b.underworlds.NodesInContext\x1a\x12.underworlds.Empty\"\x00\x12@\n\x0b\x64\x65leteNodes\x12\x1b.underworlds.NodesInContext\x1a\x12.underworlds.Empty\"\x00\x12=\n\x10getSituationsLen\x12\x14.underworlds.Context\x1a\x11.underworlds.Size\"\x00\x12\x43\n\x10getSituationsIds\x12\x14.underworlds.Context\x1a\x17.underworlds.Situations\"\x00\x12I\n\x0cgetSituation\x12\x1f.underworlds.SituationInContext\x1a\x16.underworlds.Situation\"\x00\x12;\n\x0etimelineOrigin\x12\x14.underworlds.Context\x1a\x11.underworlds.Time\"\x00\x12J\n\x10updateSituations\x12 .underworlds.SituationsInContext\x1a\x12.underworlds.Empty\"\x00\x12J\n\x10\x64\x65leteSituations\x12 .underworlds.SituationsInContext\x1a\x12.underworlds.Empty\"\x00\x12:\n\x07hasMesh\x12\x1a.underworlds.MeshInContext\x1a\x11.underworlds.Bool\"\x00\x12:\n\x07getMesh\x12\x1a.underworlds.MeshInContext\x1a\x11.underworlds.Mesh\"\x00\x12<\n\x08pushMesh\x12\x1a.underworlds.MeshInContext\x1a\x12.underworlds.Empty\"\x00\x32^\n\x17UnderworldsInvalidation\x12\x43\n\x10\x65mitInvalidation\x12\x19.underworlds.Invalidation\x1a\x12.underworlds.Empty\"\x00\x62\x06proto3')
+  serialized_pb=_b('\n\x11underworlds.proto\x12\x0bunderworlds\"\x07\n\x05\x45mpty\"\x15\n\x04\x42ool\x12\r\n\x05value\x18\x01 \x01(\x08\"\x14\n\x04Time\x12\x0c\n\x04time\x18\x01 \x01(\x01\"\xa3\x01\n\x07Welcome\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04host\x18\x02 \x01(\t\x12 \n\x18invalidation_server_port\x18\x03 \x01(\x05\x12\x1c\n\x14stream_invalidations\x18\x04 \x01(\x08\x12\x1d\n\x15max_invalidation_rate\x18\x05 \x01(\x02\x12\x1d\n\x15invalidation_payloads\x18\x06 \x01(\x08\"\x14\n\x04Size\x12\x0c\n\x04size\x18\x01 \x01(\x05\")\n\x06Pointf\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01z\x18\x03 \x01(\x02\"(\n\x05Point\x12\t\n\x01x\x18\x01 \x01(\x11\x12\t\n\x01y\x18\x02 \x01(\x11\x12\t\n\x01z\x18\x03 \x01(\x11\"3\n\x05\x43olor\x12\t\n\x01r\x18\x01 \x01(\x02\x12\t\n\x01g\x18\x02 \x01(\x02\x12\t\n\x01\x62\x18\x03 \x01(\x02\x12\t\n\x01\x61\x18\x04 \x01(\x02\"Q\n\x06\x43lient\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12-\n\x05links\x18\x03 \x03(\x0b\x32\x1e.underworlds.ClientInteraction\"\xd0\x01\n\x11\x43lientInteraction\x12\r\n\x05world\x18\x01 \x01(\t\x12<\n\x04type\x18\x02 \x01(\x0e\x32..underworlds.ClientInteraction.InteractionType\x12(\n\rlast_activity\x18\x03 \x01(\x0b\x32\x11.underworlds.Time\"D\n\x0fInteractionType\x12\n\n\x06READER\x10\x00\x12\x0c\n\x08PROVIDER\x10\x01\x12\x0b\n\x07MONITOR\x10\x02\x12\n\n\x06\x46ILTER\x10\x03\"(\n\x07\x43ontext\x12\x0e\n\x06\x63lient\x18\x01 \x01(\t\x12\r\n\x05world\x18\x02 \x01(\t\"B\n\tWorldCopy\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12\x0e\n\x06source\x18\x02 \x01(\t\"\xf5\x02\n\x0cInvalidation\x12\x30\n\x06target\x18\x01 \x01(\x0e\x32 .underworlds.Invalidation.Target\x12\x38\n\x04type\x18\x02 \x01(\x0e\x32*.underworlds.Invalidation.InvalidationType\x12\r\n\x05world\x18\x03 \x01(\t\x12\x0b\n\x03ids\x18\x04 \x03(\t\x12&\n\x06\x64\x65ltas\x18\x05 \x03(\x0b\x32\x16.underworlds.NodeDelta\x12 \n\x05nodes\x18\x06 \x03(\x0b\x32\x11.underworlds.Node\x12*\n\nsituations\x18\x07 \x03(\x0b\x32\x16.underworlds.Situation\x12\x0f\n\x07version\x18\x08 \x01(\x04\"!\n\x06Target\x12\t\n\x05SCENE\x10\x00\x12\x0c\n\x08TIMELINE\x10\x01\"3\n\x10InvalidationType\x12\x07\n\x03NEW\x10\x00\x12\n\n\x06UPDATE\x10\x01\x12\n\n\x06\x44\x45LETE\x10\x02\"@\n\x08Topology\x12\x0e\n\x06worlds\x18\x01 \x03(\t\x12$\n\x07\x63lients\x18\x02 \x03(\x0b\x32\x13.underworlds.Client\"\xf5\x03\n\x04Node\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12(\n\x04type\x18\x03 \x01(\x0e\x32\x1a.underworlds.Node.NodeType\x12\x0e\n\x06parent\x18\x04 \x01(\t\x12\x10\n\x08\x63hildren\x18\x05 \x03(\t\x12\x16\n\x0etransformation\x18\x06 \x03(\x02\x12\x1d\n\x15packed_transformation\x18\x0b \x01(\x0c\x12\x13\n\x0blast_update\x18\x08 \x01(\x01\x12\x35\n\nproperties\x18\t \x03(\x0b\x32!.underworlds.Node.PropertiesEntry\x12@\n\x10typed_properties\x18\n \x03(\x0b\x32&.underworlds.Node.TypedPropertiesEntry\x1a\x31\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1aR\n\x14TypedPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12)\n\x05value\x18\x02 \x01(\x0b\x32\x1a.underworlds.PropertyValue:\x02\x38\x01\";\n\x08NodeType\x12\r\n\tUNDEFINED\x10\x00\x12\n\n\x06\x45NTITY\x10\x01\x12\x08\n\x04MESH\x10\x02\x12\n\n\x06\x43\x41MERA\x10\x03\"\xa8\x04\n\rPropertyValue\x12\x11\n\x07\x62oolean\x18\x01 \x01(\x08H\x00\x12\x11\n\x07integer\x18\x02 \x01(\x12H\x00\x12\x10\n\x06number\x18\x03 \x01(\x01H\x00\x12\x0e\n\x04text\x18\x04 \x01(\tH\x00\x12\x37\n\x08\x62ooleans\x18\x05 \x01(\x0b\x32#.underworlds.PropertyValue.BooleansH\x00\x12\x37\n\x08integers\x18\x06 \x01(\x0b\x32#.underworlds.PropertyValue.IntegersH\x00\x12\x35\n\x07numbers\x18\x07 \x01(\x0b\x32\".underworlds.PropertyValue.NumbersH\x00\x12\x33\n\x05texts\x18\x08 \x01(\x0b\x32\".underworlds.PropertyValue.StringsH\x00\x12\x33\n\x05\x61rray\x18\t \x01(\x0b\x32\".underworlds.PropertyValue.NDArrayH\x00\x12\x0e\n\x04json\x18\n \x01(\tH\x00\x1a\x1a\n\x08\x42ooleans\x12\x0e\n\x06values\x18\x01 \x03(\x08\x1a\x1a\n\x08Integers\x12\x0e\n\x06values\x18\x01 \x03(\x12\x1a\x19\n\x07Numbers\x12\x0e\n\x06values\x18\x01 \x03(\x01\x1a\x19\n\x07Strings\x12\x0e\n\x06values\x18\x01 \x03(\t\x1a\x35\n\x07NDArray\x12\r\n\x05\x64type\x18\x01 \x01(\t\x12\r\n\x05shape\x18\x02 \x03(\r\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\x42\x07\n\x05value\"\x14\n\x05Nodes\x12\x0b\n\x03ids\x18\x01 \x03(\t\"u\n\x07SceneAt\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12\x0f\n\x07version\x18\x02 \x01(\x04\x12\x10\n\x08rootnode\x18\x03 \x01(\t\x12 \n\x05nodes\x18\x04 \x03(\x0b\x32\x11.underworlds.Node\"W\n\rNodeInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12\x1f\n\x04node\x18\x02 \x01(\x0b\x32\x11.underworlds.Node\"Y\n\x0eNodesInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12 \n\x05nodes\x18\x02 \x03(\x0b\x32\x11.underworlds.Node\"<\n\tNodeDelta\x12\x1f\n\x04node\x18\x01 \x01(\x0b\x32\x11.underworlds.Node\x12\x0e\n\x06\x66ields\x18\x02 \x03(\t\"d\n\x13NodeDeltasInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12&\n\x06\x64\x65ltas\x18\x02 \x03(\x0b\x32\x16.underworlds.NodeDelta\"\xf4\x01\n\tSituation\x12\n\n\x02id\x18\x01 \x01(\t\x12\x32\n\x04type\x18\x02 \x01(\x0e\x32$.underworlds.Situation.SituationType\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x13\n\x0blast_update\x18\x04 \x01(\x01\x12 \n\x05start\x18\x05 \x01(\x0b\x32\x11.underworlds.Time\x12\x1e\n\x03\x65nd\x18\x06 \x01(\x0b\x32\x11.underworlds.Time\";\n\rSituationType\x12\x0b\n\x07GENERIC\x10\x00\x12\n\n\x06MOTION\x10\x01\x12\x11\n\rEVT_MODELLOAD\x10\x02\"\x19\n\nSituations\x12\x0b\n\x03ids\x18\x01 \x03(\t\"f\n\x12SituationInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12)\n\tsituation\x18\x02 \x01(\x0b\x32\x16.underworlds.Situation\"h\n\x13SituationsInContext\x12%\n\x07\x63ontext\x18\x01 \x01(\x0b\x32\x14.underworlds.Context\x12*\n\nsituations\x18\x02 \x03(\x0b\x32\x16.underworlds.Situation\"\xfe\x01\n\x04Mesh\x12\n\n\x02id\x18\x01 \x01(\t\x12%\n\x08vertices\x18\x02 \x03(\x0b\x32\x13.underworlds.Pointf\x12!\n\x05\x66\x61\x63\x65s\x18\x03 \x03(\x0b\x32\x12.underworlds.Point\x12$\n\x07normals\x18\x04 \x03(\x0b\x32\x13.underworlds.Pointf\x12\x0e\n\x06\x63olors\x18\x05 \x03(\r\x12#\n\x07\x64iffuse\x18\x06 \x01(\x0b\x32\x12.underworlds.Color\x12\x17\n\x0fpacked_vertices\x18\x07 \x01(\x0c\x12\x14\n\x0cpacked_faces\x18\x08 \x01(\x0c\x12\x16\n\x0epacked_normals\x18\t \x01(\x0c\"U\n\rMeshInContext\x12#\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x13.underworlds.Client\x12\x1f\n\x04mesh\x18\x02 \x01(\x0b\x32\x11.underworlds.Mesh\";\n\x07MeshIds\x12#\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x13.underworlds.Client\x12\x0b\n\x03ids\x18\x02 \x03(\t\"$\n\x12MeshesAvailability\x12\x0e\n\x06\x62itmap\x18\x01 \x01(\x0c\"h\n\tMeshChunk\x12#\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x13.underworlds.Client\x12\n\n\x02id\x18\x02 \x01(\t\x12\x0e\n\x06offset\x18\x03 \x01(\x04\x12\x0c\n\x04size\x18\x04 \x01(\x04\x12\x0c\n\x04\x64\x61ta\x18\x05 \x01(\x0c\"]\n\x0cMeshTransfer\x12#\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x13.underworlds.Client\x12\n\n\x02id\x18\x02 \x01(\t\x12\x0e\n\x06offset\x18\x03 \x01(\x04\x12\x0c\n\x04size\x18\x04 \x01(\x04\"\x99\x03\n\x0bWorldRecord\x12\x31\n\x04type\x18\x01 \x01(\x0e\x32#.underworlds.WorldRecord.RecordType\x12\r\n\x05world\x18\x02 \x01(\t\x12 \n\x05nodes\x18\x03 \x03(\x0b\x32\x11.underworlds.Node\x12*\n\nsituations\x18\x04 \x03(\x0b\x32\x16.underworlds.Situation\x12\x0c\n\x04time\x18\x05 \x01(\x01\x12\x0b\n\x03wal\x18\x06 \x01(\x04\x12\x0e\n\x06source\x18\x07 \x01(\t\x12.\n\x0cpacked_nodes\x18\x08 \x01(\x0b\x32\x18.underworlds.PackedNodes\"\x9e\x01\n\nRecordType\x12\x0c\n\x08SNAPSHOT\x10\x00\x12\t\n\x05WORLD\x10\x01\x12\x10\n\x0cUPDATE_NODES\x10\x02\x12\x15\n\x11UPDATE_SITUATIONS\x10\x03\x12\x10\n\x0c\x44\x45LETE_NODES\x10\x04\x12\x15\n\x11\x44\x45LETE_SITUATIONS\x10\x05\x12\t\n\x05RESET\x10\x06\x12\x08\n\x04\x43OPY\x10\x07\x12\x10\n\x0cPACKED_NODES\x10\x08\"\x9b\x02\n\x0bPackedNodes\x12\x0b\n\x03ids\x18\x01 \x03(\t\x12\r\n\x05names\x18\x02 \x03(\t\x12\r\n\x05types\x18\x03 \x01(\x0c\x12\x0f\n\x07parents\x18\x04 \x03(\t\x12\x14\n\x0clast_updates\x18\x05 \x03(\x01\x12\x17\n\x0ftransformations\x18\x06 \x01(\x0c\x12\x35\n\nproperties\x18\x07 \x03(\x0b\x32!.underworlds.PackedNodes.Property\x1aj\n\x08Property\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05nodes\x18\x02 \x03(\r\x12*\n\x06values\x18\x03 \x03(\x0b\x32\x1a.underworlds.PropertyValue\x12\x15\n\rvalue_indices\x18\x04 \x03(\r2\xdc\x0f\n\x0bUnderworlds\x12\x33\n\x04helo\x12\x14.underworlds.Welcome\x1a\x13.underworlds.Client\"\x00\x12\x33\n\x06\x62yebye\x12\x13.underworlds.Client\x1a\x12.underworlds.Empty\"\x00\x12?\n\tsubscribe\x12\x13.underworlds.Client\x1a\x19.underworlds.Invalidation\"\x00\x30\x01\x12\x32\n\x06uptime\x12\x13.underworlds.Client\x1a\x11.underworlds.Time\"\x00\x12\x38\n\x08topology\x12\x13.underworlds.Client\x1a\x15.underworlds.Topology\"\x00\x12\x32\n\x05reset\x12\x13.underworlds.Client\x1a\x12.underworlds.Empty\"\x00\x12\x39\n\tcopyWorld\x12\x16.underworlds.WorldCopy\x1a\x12.underworlds.Empty\"\x00\x12\x38\n\x0bgetNodesLen\x12\x14.underworlds.Context\x1a\x11.underworlds.Size\"\x00\x12\x39\n\x0bgetNodesIds\x12\x14.underworlds.Context\x1a\x12.underworlds.Nodes\"\x00\x12\x38\n\x0bgetRootNode\x12\x14.underworlds.Context\x1a\x11.underworlds.Node\"\x00\x12:\n\x07getNode\x12\x1a.underworlds.NodeInContext\x1a\x11.underworlds.Node\"\x00\x12\x46\n\x08getNodes\x12\x1b.underworlds.NodesInContext\x1a\x1b.underworlds.NodesInContext\"\x00\x12\x41\n\x08getScene\x12\x14.underworlds.Context\x1a\x1b.underworlds.NodesInContext\"\x00\x30\x01\x12<\n\ngetSceneAt\x12\x14.underworlds.SceneAt\x1a\x14.underworlds.SceneAt\"\x00\x30\x01\x12@\n\x0bupdateNodes\x12\x1b.underworlds.NodesInContext\x1a\x12.underworlds.Empty\"\x00\x12K\n\x11updateNodesFields\x12 .underworlds.NodeDeltasInContext\x1a\x12.underworlds.Empty\"\x00\x12@\n\x0b\x64\x65leteNodes\x12\x1b.underworlds.NodesInContext\x1a\x12.underworlds.Empty\"\x00\x12=\n\x10getSituationsLen\x12\x14.underworlds.Context\x1a\x11.underworlds.Size\"\x00\x12\x43\n\x10getSituationsIds\x12\x14.underworlds.Context\x1a\x17.underworlds.Situations\"\x00\x12I\n\x0cgetSituation\x12\x1f.underworlds.SituationInContext\x1a\x16.underworlds.Situation\"\x00\x12;\n\x0etimelineOrigin\x12\x14.underworlds.Context\x1a\x11.underworlds.Time\"\x00\x12J\n\x10updateSituations\x12 .underworlds.SituationsInContext\x1a\x12.underworlds.Empty\"\x00\x12J\n\x10\x64\x65leteSituations\x12 .underworlds.SituationsInContext\x1a\x12.underworlds.Empty\"\x00\x12:\n\x07hasMesh\x12\x1a.underworlds.MeshInContext\x1a\x11.underworlds.Bool\"\x00\x12\x44\n\thasMeshes\x12\x14.underworlds.MeshIds\x1a\x1f.underworlds.MeshesAvailability\"\x00\x12:\n\x07getMesh\x12\x1a.underworlds.MeshInContext\x1a\x11.underworlds.Mesh\"\x00\x12<\n\x08pushMesh\x12\x1a.underworlds.MeshInContext\x1a\x12.underworlds.Empty\"\x00\x12@\n\npushMeshes\x12\x1a.underworlds.MeshInContext\x1a\x12.underworlds.Empty\"\x00(\x01\x12\x46\n\rgetMeshChunks\x12\x19.underworlds.MeshTransfer\x1a\x16.underworlds.MeshChunk\"\x00\x30\x01\x12G\n\x0epushMeshChunks\x12\x16.underworlds.MeshChunk\x1a\x19.underworlds.MeshTransfer\"\x00(\x01\x12M\n\x13getMeshUploadStatus\x12\x19.underworlds.MeshTransfer\x1a\x19.underworlds.MeshTransfer\"\x00\x32^\n\x17UnderworldsInvalidation\x12\x43\n\x10\x65mitInvalidation\x12\x19.underworlds.Invalidation\x1a\x12.underworlds.Empty\"\x00\x62\x06proto3')
 )
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -50,8 +50,8 @@ _CLIENTINTERACTION_INTERACTIONTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=545,
-  serialized_end=613,
+  serialized_start=638,
+  serialized_end=706,
 )
 _sym_db.RegisterEnumDescriptor(_CLIENTINTERACTION_INTERACTIONTYPE)
 
@@ -72,8 +72,8 @@ _INVALIDATION_TARGET = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=810,
-  serialized_end=843,
+  serialized_start=1106,
+  serialized_end=1139,
 )
 _sym_db.RegisterEnumDescriptor(_INVALIDATION_TARGET)
 
@@ -98,8 +98,8 @@ _INVALIDATION_INVALIDATIONTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=845,
-  serialized_end=896,
+  serialized_start=1141,
+  serialized_end=1192,
 )
 _sym_db.RegisterEnumDescriptor(_INVALIDATION_INVALIDATIONTYPE)
 
@@ -128,8 +128,8 @@ _NODE_NODETYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=1226,
-  serialized_end=1285,
+  serialized_start=1703,
+  serialized_end=1762,
 )
 _sym_db.RegisterEnumDescriptor(_NODE_NODETYPE)
 
@@ -154,11 +154,61 @@ _SITUATION_SITUATIONTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   options=None,
-  serialized_start=1675,
-  serialized_end=1734,
+  serialized_start=2990,
+  serialized_end=3049,
 )
 _sym_db.RegisterEnumDescriptor(_SITUATION_SITUATIONTYPE)
 
+_WORLDRECORD_RECORDTYPE = _descriptor.EnumDescriptor(
+  name='RecordType',
+  full_name='underworlds.WorldRecord.RecordType',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='SNAPSHOT', index=0, number=0,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='WORLD', index=1, number=1,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='UPDATE_NODES', index=2, number=2,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='UPDATE_SITUATIONS', index=3, number=3,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='DELETE_NODES', index=4, number=4,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='DELETE_SITUATIONS', index=5, number=5,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='RESET', index=6, number=6,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='COPY', index=7, number=7,
+      options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='PACKED_NODES', index=8, number=8,
+      options=None,
+      type=None),
+  ],
+  containing_type=None,
+  options=None,
+  serialized_start=4184,
+  serialized_end=4342,
+)
+_sym_db.RegisterEnumDescriptor(_WORLDRECORD_RECORDTYPE)
+
 
 _EMPTY = _descriptor.Descriptor(
   name='Empty',
@@ -274,6 +324,27 @@ _WELCOME = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='stream_invalidations', full_name='underworlds.Welcome.stream_invalidations', index=3,
+      number=4, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='max_invalidation_rate', full_name='underworlds.Welcome.max_invalidation_rate', index=4,
+      number=5, type=2, cpp_type=6, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='invalidation_payloads', full_name='underworlds.Welcome.invalidation_payloads', index=5,
+      number=6, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -286,8 +357,8 @@ _WELCOME = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=88,
-  serialized_end=159,
+  serialized_start=89,
+  serialized_end=252,
 )
 
 
@@ -317,8 +388,8 @@ _SIZE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=161,
-  serialized_end=181,
+  serialized_start=254,
+  serialized_end=274,
 )
 
 
@@ -362,8 +433,8 @@ _POINTF = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=183,
-  serialized_end=224,
+  serialized_start=276,
+  serialized_end=317,
 )
 
 
@@ -407,8 +478,8 @@ _POINT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=226,
-  serialized_end=266,
+  serialized_start=319,
+  serialized_end=359,
 )
 
 
@@ -459,8 +530,8 @@ _COLOR = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=268,
-  serialized_end=319,
+  serialized_start=361,
+  serialized_end=412,
 )
 
 
@@ -504,8 +575,8 @@ _CLIENT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=321,
-  serialized_end=402,
+  serialized_start=414,
+  serialized_end=495,
 )
 
 
@@ -550,8 +621,8 @@ _CLIENTINTERACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=405,
-  serialized_end=613,
+  serialized_start=498,
+  serialized_end=706,
 )
 
 
@@ -588,8 +659,46 @@ _CONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=615,
-  serialized_end=655,
+  serialized_start=708,
+  serialized_end=748,
+)
+
+
+_WORLDCOPY = _descriptor.Descriptor(
+  name='WorldCopy',
+  full_name='underworlds.WorldCopy',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.WorldCopy.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='source', full_name='underworlds.WorldCopy.source', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=750,
+  serialized_end=816,
 )
 
 
@@ -628,6 +737,34 @@ _INVALIDATION = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='deltas', full_name='underworlds.Invalidation.deltas', index=4,
+      number=5, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='nodes', full_name='underworlds.Invalidation.nodes', index=5,
+      number=6, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='situations', full_name='underworlds.Invalidation.situations', index=6,
+      number=7, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='version', full_name='underworlds.Invalidation.version', index=7,
+      number=8, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -642,8 +779,8 @@ _INVALIDATION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=658,
-  serialized_end=896,
+  serialized_start=819,
+  serialized_end=1192,
 )
 
 
@@ -680,8 +817,8 @@ _TOPOLOGY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=898,
-  serialized_end=962,
+  serialized_start=1194,
+  serialized_end=1258,
 )
 
 
@@ -718,8 +855,45 @@ _NODE_PROPERTIESENTRY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1175,
-  serialized_end=1224,
+  serialized_start=1568,
+  serialized_end=1617,
+)
+
+_NODE_TYPEDPROPERTIESENTRY = _descriptor.Descriptor(
+  name='TypedPropertiesEntry',
+  full_name='underworlds.Node.TypedPropertiesEntry',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='key', full_name='underworlds.Node.TypedPropertiesEntry.key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='value', full_name='underworlds.Node.TypedPropertiesEntry.value', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=_descriptor._ParseOptions(descriptor_pb2.MessageOptions(), _b('8\001')),
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1619,
+  serialized_end=1701,
 )
 
 _NODE = _descriptor.Descriptor(
@@ -772,23 +946,37 @@ _NODE = _descriptor.Descriptor(
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='last_update', full_name='underworlds.Node.last_update', index=6,
+      name='packed_transformation', full_name='underworlds.Node.packed_transformation', index=6,
+      number=11, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='last_update', full_name='underworlds.Node.last_update', index=7,
       number=8, type=1, cpp_type=5, label=1,
       has_default_value=False, default_value=float(0),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='properties', full_name='underworlds.Node.properties', index=7,
+      name='properties', full_name='underworlds.Node.properties', index=8,
       number=9, type=11, cpp_type=10, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='typed_properties', full_name='underworlds.Node.typed_properties', index=9,
+      number=10, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
-  nested_types=[_NODE_PROPERTIESENTRY, ],
+  nested_types=[_NODE_PROPERTIESENTRY, _NODE_TYPEDPROPERTIESENTRY, ],
   enum_types=[
     _NODE_NODETYPE,
   ],
@@ -798,21 +986,21 @@ _NODE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=965,
-  serialized_end=1285,
+  serialized_start=1261,
+  serialized_end=1762,
 )
 
 
-_NODES = _descriptor.Descriptor(
-  name='Nodes',
-  full_name='underworlds.Nodes',
+_PROPERTYVALUE_BOOLEANS = _descriptor.Descriptor(
+  name='Booleans',
+  full_name='underworlds.PropertyValue.Booleans',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='ids', full_name='underworlds.Nodes.ids', index=0,
-      number=1, type=9, cpp_type=9, label=3,
+      name='values', full_name='underworlds.PropertyValue.Booleans.values', index=0,
+      number=1, type=8, cpp_type=7, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
@@ -829,29 +1017,21 @@ _NODES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1287,
-  serialized_end=1307,
+  serialized_start=2145,
+  serialized_end=2171,
 )
 
-
-_NODEINCONTEXT = _descriptor.Descriptor(
-  name='NodeInContext',
-  full_name='underworlds.NodeInContext',
+_PROPERTYVALUE_INTEGERS = _descriptor.Descriptor(
+  name='Integers',
+  full_name='underworlds.PropertyValue.Integers',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='context', full_name='underworlds.NodeInContext.context', index=0,
-      number=1, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='node', full_name='underworlds.NodeInContext.node', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='values', full_name='underworlds.PropertyValue.Integers.values', index=0,
+      number=1, type=18, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
@@ -867,28 +1047,20 @@ _NODEINCONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1309,
-  serialized_end=1396,
+  serialized_start=2173,
+  serialized_end=2199,
 )
 
-
-_NODESINCONTEXT = _descriptor.Descriptor(
-  name='NodesInContext',
-  full_name='underworlds.NodesInContext',
+_PROPERTYVALUE_NUMBERS = _descriptor.Descriptor(
+  name='Numbers',
+  full_name='underworlds.PropertyValue.Numbers',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='context', full_name='underworlds.NodesInContext.context', index=0,
-      number=1, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='nodes', full_name='underworlds.NodesInContext.nodes', index=1,
-      number=2, type=11, cpp_type=10, label=3,
+      name='values', full_name='underworlds.PropertyValue.Numbers.values', index=0,
+      number=1, type=1, cpp_type=5, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
@@ -905,57 +1077,21 @@ _NODESINCONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1398,
-  serialized_end=1487,
+  serialized_start=2201,
+  serialized_end=2226,
 )
 
-
-_SITUATION = _descriptor.Descriptor(
-  name='Situation',
-  full_name='underworlds.Situation',
+_PROPERTYVALUE_STRINGS = _descriptor.Descriptor(
+  name='Strings',
+  full_name='underworlds.PropertyValue.Strings',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='id', full_name='underworlds.Situation.id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='type', full_name='underworlds.Situation.type', index=1,
-      number=2, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='description', full_name='underworlds.Situation.description', index=2,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='last_update', full_name='underworlds.Situation.last_update', index=3,
-      number=4, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='start', full_name='underworlds.Situation.start', index=4,
-      number=5, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='end', full_name='underworlds.Situation.end', index=5,
-      number=6, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='values', full_name='underworlds.PropertyValue.Strings.values', index=0,
+      number=1, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
@@ -964,7 +1100,6 @@ _SITUATION = _descriptor.Descriptor(
   ],
   nested_types=[],
   enum_types=[
-    _SITUATION_SITUATIONTYPE,
   ],
   options=None,
   is_extendable=False,
@@ -972,25 +1107,38 @@ _SITUATION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1490,
-  serialized_end=1734,
+  serialized_start=2228,
+  serialized_end=2253,
 )
 
-
-_SITUATIONS = _descriptor.Descriptor(
-  name='Situations',
-  full_name='underworlds.Situations',
+_PROPERTYVALUE_NDARRAY = _descriptor.Descriptor(
+  name='NDArray',
+  full_name='underworlds.PropertyValue.NDArray',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='ids', full_name='underworlds.Situations.ids', index=0,
-      number=1, type=9, cpp_type=9, label=3,
+      name='dtype', full_name='underworlds.PropertyValue.NDArray.dtype', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='shape', full_name='underworlds.PropertyValue.NDArray.shape', index=1,
+      number=2, type=13, cpp_type=3, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
+    _descriptor.FieldDescriptor(
+      name='data', full_name='underworlds.PropertyValue.NDArray.data', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
   ],
   extensions=[
   ],
@@ -1003,66 +1151,933 @@ _SITUATIONS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1736,
-  serialized_end=1761,
+  serialized_start=2255,
+  serialized_end=2308,
 )
 
-
-_SITUATIONINCONTEXT = _descriptor.Descriptor(
-  name='SituationInContext',
-  full_name='underworlds.SituationInContext',
+_PROPERTYVALUE = _descriptor.Descriptor(
+  name='PropertyValue',
+  full_name='underworlds.PropertyValue',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='context', full_name='underworlds.SituationInContext.context', index=0,
-      number=1, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='boolean', full_name='underworlds.PropertyValue.boolean', index=0,
+      number=1, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='situation', full_name='underworlds.SituationInContext.situation', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='integer', full_name='underworlds.PropertyValue.integer', index=1,
+      number=2, type=18, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  syntax='proto3',
+    _descriptor.FieldDescriptor(
+      name='number', full_name='underworlds.PropertyValue.number', index=2,
+      number=3, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='text', full_name='underworlds.PropertyValue.text', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='booleans', full_name='underworlds.PropertyValue.booleans', index=4,
+      number=5, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='integers', full_name='underworlds.PropertyValue.integers', index=5,
+      number=6, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='numbers', full_name='underworlds.PropertyValue.numbers', index=6,
+      number=7, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='texts', full_name='underworlds.PropertyValue.texts', index=7,
+      number=8, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='array', full_name='underworlds.PropertyValue.array', index=8,
+      number=9, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='json', full_name='underworlds.PropertyValue.json', index=9,
+      number=10, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[_PROPERTYVALUE_BOOLEANS, _PROPERTYVALUE_INTEGERS, _PROPERTYVALUE_NUMBERS, _PROPERTYVALUE_STRINGS, _PROPERTYVALUE_NDARRAY, ],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='value', full_name='underworlds.PropertyValue.value',
+      index=0, containing_type=None, fields=[]),
+  ],
+  serialized_start=1765,
+  serialized_end=2317,
+)
+
+
+_NODES = _descriptor.Descriptor(
+  name='Nodes',
+  full_name='underworlds.Nodes',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='ids', full_name='underworlds.Nodes.ids', index=0,
+      number=1, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2319,
+  serialized_end=2339,
+)
+
+
+_SCENEAT = _descriptor.Descriptor(
+  name='SceneAt',
+  full_name='underworlds.SceneAt',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.SceneAt.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='version', full_name='underworlds.SceneAt.version', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='rootnode', full_name='underworlds.SceneAt.rootnode', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='nodes', full_name='underworlds.SceneAt.nodes', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2341,
+  serialized_end=2458,
+)
+
+
+_NODEINCONTEXT = _descriptor.Descriptor(
+  name='NodeInContext',
+  full_name='underworlds.NodeInContext',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.NodeInContext.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='node', full_name='underworlds.NodeInContext.node', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2460,
+  serialized_end=2547,
+)
+
+
+_NODESINCONTEXT = _descriptor.Descriptor(
+  name='NodesInContext',
+  full_name='underworlds.NodesInContext',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.NodesInContext.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='nodes', full_name='underworlds.NodesInContext.nodes', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2549,
+  serialized_end=2638,
+)
+
+
+_NODEDELTA = _descriptor.Descriptor(
+  name='NodeDelta',
+  full_name='underworlds.NodeDelta',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='node', full_name='underworlds.NodeDelta.node', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='fields', full_name='underworlds.NodeDelta.fields', index=1,
+      number=2, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2640,
+  serialized_end=2700,
+)
+
+
+_NODEDELTASINCONTEXT = _descriptor.Descriptor(
+  name='NodeDeltasInContext',
+  full_name='underworlds.NodeDeltasInContext',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.NodeDeltasInContext.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='deltas', full_name='underworlds.NodeDeltasInContext.deltas', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2702,
+  serialized_end=2802,
+)
+
+
+_SITUATION = _descriptor.Descriptor(
+  name='Situation',
+  full_name='underworlds.Situation',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='id', full_name='underworlds.Situation.id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='type', full_name='underworlds.Situation.type', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='description', full_name='underworlds.Situation.description', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='last_update', full_name='underworlds.Situation.last_update', index=3,
+      number=4, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='start', full_name='underworlds.Situation.start', index=4,
+      number=5, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='end', full_name='underworlds.Situation.end', index=5,
+      number=6, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _SITUATION_SITUATIONTYPE,
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2805,
+  serialized_end=3049,
+)
+
+
+_SITUATIONS = _descriptor.Descriptor(
+  name='Situations',
+  full_name='underworlds.Situations',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='ids', full_name='underworlds.Situations.ids', index=0,
+      number=1, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3051,
+  serialized_end=3076,
+)
+
+
+_SITUATIONINCONTEXT = _descriptor.Descriptor(
+  name='SituationInContext',
+  full_name='underworlds.SituationInContext',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.SituationInContext.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='situation', full_name='underworlds.SituationInContext.situation', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3078,
+  serialized_end=3180,
+)
+
+
+_SITUATIONSINCONTEXT = _descriptor.Descriptor(
+  name='SituationsInContext',
+  full_name='underworlds.SituationsInContext',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='context', full_name='underworlds.SituationsInContext.context', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='situations', full_name='underworlds.SituationsInContext.situations', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3182,
+  serialized_end=3286,
+)
+
+
+_MESH = _descriptor.Descriptor(
+  name='Mesh',
+  full_name='underworlds.Mesh',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='id', full_name='underworlds.Mesh.id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='vertices', full_name='underworlds.Mesh.vertices', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='faces', full_name='underworlds.Mesh.faces', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='normals', full_name='underworlds.Mesh.normals', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='colors', full_name='underworlds.Mesh.colors', index=4,
+      number=5, type=13, cpp_type=3, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='diffuse', full_name='underworlds.Mesh.diffuse', index=5,
+      number=6, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='packed_vertices', full_name='underworlds.Mesh.packed_vertices', index=6,
+      number=7, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='packed_faces', full_name='underworlds.Mesh.packed_faces', index=7,
+      number=8, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='packed_normals', full_name='underworlds.Mesh.packed_normals', index=8,
+      number=9, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1763,
-  serialized_end=1865,
+  serialized_start=3289,
+  serialized_end=3543,
 )
 
 
-_SITUATIONSINCONTEXT = _descriptor.Descriptor(
-  name='SituationsInContext',
-  full_name='underworlds.SituationsInContext',
+_MESHINCONTEXT = _descriptor.Descriptor(
+  name='MeshInContext',
+  full_name='underworlds.MeshInContext',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='context', full_name='underworlds.SituationsInContext.context', index=0,
+      name='client', full_name='underworlds.MeshInContext.client', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='mesh', full_name='underworlds.MeshInContext.mesh', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3545,
+  serialized_end=3630,
+)
+
+
+_MESHIDS = _descriptor.Descriptor(
+  name='MeshIds',
+  full_name='underworlds.MeshIds',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='client', full_name='underworlds.MeshIds.client', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='ids', full_name='underworlds.MeshIds.ids', index=1,
+      number=2, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3632,
+  serialized_end=3691,
+)
+
+
+_MESHESAVAILABILITY = _descriptor.Descriptor(
+  name='MeshesAvailability',
+  full_name='underworlds.MeshesAvailability',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='bitmap', full_name='underworlds.MeshesAvailability.bitmap', index=0,
+      number=1, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3693,
+  serialized_end=3729,
+)
+
+
+_MESHCHUNK = _descriptor.Descriptor(
+  name='MeshChunk',
+  full_name='underworlds.MeshChunk',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='client', full_name='underworlds.MeshChunk.client', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='id', full_name='underworlds.MeshChunk.id', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='underworlds.MeshChunk.offset', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='underworlds.MeshChunk.size', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='data', full_name='underworlds.MeshChunk.data', index=4,
+      number=5, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3731,
+  serialized_end=3835,
+)
+
+
+_MESHTRANSFER = _descriptor.Descriptor(
+  name='MeshTransfer',
+  full_name='underworlds.MeshTransfer',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='client', full_name='underworlds.MeshTransfer.client', index=0,
       number=1, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='situations', full_name='underworlds.SituationsInContext.situations', index=1,
-      number=2, type=11, cpp_type=10, label=3,
+      name='id', full_name='underworlds.MeshTransfer.id', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='offset', full_name='underworlds.MeshTransfer.offset', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='size', full_name='underworlds.MeshTransfer.size', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3837,
+  serialized_end=3930,
+)
+
+
+_WORLDRECORD = _descriptor.Descriptor(
+  name='WorldRecord',
+  full_name='underworlds.WorldRecord',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='type', full_name='underworlds.WorldRecord.type', index=0,
+      number=1, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='world', full_name='underworlds.WorldRecord.world', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='nodes', full_name='underworlds.WorldRecord.nodes', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='situations', full_name='underworlds.WorldRecord.situations', index=3,
+      number=4, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='time', full_name='underworlds.WorldRecord.time', index=4,
+      number=5, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='wal', full_name='underworlds.WorldRecord.wal', index=5,
+      number=6, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='source', full_name='underworlds.WorldRecord.source', index=6,
+      number=7, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='packed_nodes', full_name='underworlds.WorldRecord.packed_nodes', index=7,
+      number=8, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _WORLDRECORD_RECORDTYPE,
+  ],
+  options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=3933,
+  serialized_end=4342,
+)
+
+
+_PACKEDNODES_PROPERTY = _descriptor.Descriptor(
+  name='Property',
+  full_name='underworlds.PackedNodes.Property',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='name', full_name='underworlds.PackedNodes.Property.name', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='nodes', full_name='underworlds.PackedNodes.Property.nodes', index=1,
+      number=2, type=13, cpp_type=3, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='values', full_name='underworlds.PackedNodes.Property.values', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      options=None),
+    _descriptor.FieldDescriptor(
+      name='value_indices', full_name='underworlds.PackedNodes.Property.value_indices', index=3,
+      number=4, type=13, cpp_type=3, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
@@ -1079,102 +2094,70 @@ _SITUATIONSINCONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1867,
-  serialized_end=1971,
+  serialized_start=4522,
+  serialized_end=4628,
 )
 
-
-_MESH = _descriptor.Descriptor(
-  name='Mesh',
-  full_name='underworlds.Mesh',
+_PACKEDNODES = _descriptor.Descriptor(
+  name='PackedNodes',
+  full_name='underworlds.PackedNodes',
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
   fields=[
     _descriptor.FieldDescriptor(
-      name='id', full_name='underworlds.Mesh.id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='vertices', full_name='underworlds.Mesh.vertices', index=1,
-      number=2, type=11, cpp_type=10, label=3,
+      name='ids', full_name='underworlds.PackedNodes.ids', index=0,
+      number=1, type=9, cpp_type=9, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='faces', full_name='underworlds.Mesh.faces', index=2,
-      number=3, type=11, cpp_type=10, label=3,
+      name='names', full_name='underworlds.PackedNodes.names', index=1,
+      number=2, type=9, cpp_type=9, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='normals', full_name='underworlds.Mesh.normals', index=3,
-      number=4, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
+      name='types', full_name='underworlds.PackedNodes.types', index=2,
+      number=3, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='colors', full_name='underworlds.Mesh.colors', index=4,
-      number=5, type=13, cpp_type=3, label=3,
+      name='parents', full_name='underworlds.PackedNodes.parents', index=3,
+      number=4, type=9, cpp_type=9, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='diffuse', full_name='underworlds.Mesh.diffuse', index=5,
-      number=6, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='last_updates', full_name='underworlds.PackedNodes.last_updates', index=4,
+      number=5, type=1, cpp_type=5, label=3,
+      has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1974,
-  serialized_end=2157,
-)
-
-
-_MESHINCONTEXT = _descriptor.Descriptor(
-  name='MeshInContext',
-  full_name='underworlds.MeshInContext',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
     _descriptor.FieldDescriptor(
-      name='client', full_name='underworlds.MeshInContext.client', index=0,
-      number=1, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='transformations', full_name='underworlds.PackedNodes.transformations', index=5,
+      number=6, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
     _descriptor.FieldDescriptor(
-      name='mesh', full_name='underworlds.MeshInContext.mesh', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
+      name='properties', full_name='underworlds.PackedNodes.properties', index=6,
+      number=7, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       options=None),
   ],
   extensions=[
   ],
-  nested_types=[],
+  nested_types=[_PACKEDNODES_PROPERTY, ],
   enum_types=[
   ],
   options=None,
@@ -1183,27 +2166,79 @@ _MESHINCONTEXT = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2159,
-  serialized_end=2244,
+  serialized_start=4345,
+  serialized_end=4628,
 )
 
 _CLIENT.fields_by_name['links'].message_type = _CLIENTINTERACTION
 _CLIENTINTERACTION.fields_by_name['type'].enum_type = _CLIENTINTERACTION_INTERACTIONTYPE
 _CLIENTINTERACTION.fields_by_name['last_activity'].message_type = _TIME
 _CLIENTINTERACTION_INTERACTIONTYPE.containing_type = _CLIENTINTERACTION
+_WORLDCOPY.fields_by_name['context'].message_type = _CONTEXT
 _INVALIDATION.fields_by_name['target'].enum_type = _INVALIDATION_TARGET
 _INVALIDATION.fields_by_name['type'].enum_type = _INVALIDATION_INVALIDATIONTYPE
+_INVALIDATION.fields_by_name['deltas'].message_type = _NODEDELTA
+_INVALIDATION.fields_by_name['nodes'].message_type = _NODE
+_INVALIDATION.fields_by_name['situations'].message_type = _SITUATION
 _INVALIDATION_TARGET.containing_type = _INVALIDATION
 _INVALIDATION_INVALIDATIONTYPE.containing_type = _INVALIDATION
 _TOPOLOGY.fields_by_name['clients'].message_type = _CLIENT
 _NODE_PROPERTIESENTRY.containing_type = _NODE
+_NODE_TYPEDPROPERTIESENTRY.fields_by_name['value'].message_type = _PROPERTYVALUE
+_NODE_TYPEDPROPERTIESENTRY.containing_type = _NODE
 _NODE.fields_by_name['type'].enum_type = _NODE_NODETYPE
 _NODE.fields_by_name['properties'].message_type = _NODE_PROPERTIESENTRY
+_NODE.fields_by_name['typed_properties'].message_type = _NODE_TYPEDPROPERTIESENTRY
 _NODE_NODETYPE.containing_type = _NODE
+_PROPERTYVALUE_BOOLEANS.containing_type = _PROPERTYVALUE
+_PROPERTYVALUE_INTEGERS.containing_type = _PROPERTYVALUE
+_PROPERTYVALUE_NUMBERS.containing_type = _PROPERTYVALUE
+_PROPERTYVALUE_STRINGS.containing_type = _PROPERTYVALUE
+_PROPERTYVALUE_NDARRAY.containing_type = _PROPERTYVALUE
+_PROPERTYVALUE.fields_by_name['booleans'].message_type = _PROPERTYVALUE_BOOLEANS
+_PROPERTYVALUE.fields_by_name['integers'].message_type = _PROPERTYVALUE_INTEGERS
+_PROPERTYVALUE.fields_by_name['numbers'].message_type = _PROPERTYVALUE_NUMBERS
+_PROPERTYVALUE.fields_by_name['texts'].message_type = _PROPERTYVALUE_STRINGS
+_PROPERTYVALUE.fields_by_name['array'].message_type = _PROPERTYVALUE_NDARRAY
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['boolean'])
+_PROPERTYVALUE.fields_by_name['boolean'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['integer'])
+_PROPERTYVALUE.fields_by_name['integer'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['number'])
+_PROPERTYVALUE.fields_by_name['number'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['text'])
+_PROPERTYVALUE.fields_by_name['text'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['booleans'])
+_PROPERTYVALUE.fields_by_name['booleans'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['integers'])
+_PROPERTYVALUE.fields_by_name['integers'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['numbers'])
+_PROPERTYVALUE.fields_by_name['numbers'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['texts'])
+_PROPERTYVALUE.fields_by_name['texts'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['array'])
+_PROPERTYVALUE.fields_by_name['array'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_PROPERTYVALUE.oneofs_by_name['value'].fields.append(
+  _PROPERTYVALUE.fields_by_name['json'])
+_PROPERTYVALUE.fields_by_name['json'].containing_oneof = _PROPERTYVALUE.oneofs_by_name['value']
+_SCENEAT.fields_by_name['context'].message_type = _CONTEXT
+_SCENEAT.fields_by_name['nodes'].message_type = _NODE
 _NODEINCONTEXT.fields_by_name['context'].message_type = _CONTEXT
 _NODEINCONTEXT.fields_by_name['node'].message_type = _NODE
 _NODESINCONTEXT.fields_by_name['context'].message_type = _CONTEXT
 _NODESINCONTEXT.fields_by_name['nodes'].message_type = _NODE
+_NODEDELTA.fields_by_name['node'].message_type = _NODE
+_NODEDELTASINCONTEXT.fields_by_name['context'].message_type = _CONTEXT
+_NODEDELTASINCONTEXT.fields_by_name['deltas'].message_type = _NODEDELTA
 _SITUATION.fields_by_name['type'].enum_type = _SITUATION_SITUATIONTYPE
 _SITUATION.fields_by_name['start'].message_type = _TIME
 _SITUATION.fields_by_name['end'].message_type = _TIME
@@ -1218,6 +2253,17 @@ _MESH.fields_by_name['normals'].message_type = _POINTF
 _MESH.fields_by_name['diffuse'].message_type = _COLOR
 _MESHINCONTEXT.fields_by_name['client'].message_type = _CLIENT
 _MESHINCONTEXT.fields_by_name['mesh'].message_type = _MESH
+_MESHIDS.fields_by_name['client'].message_type = _CLIENT
+_MESHCHUNK.fields_by_name['client'].message_type = _CLIENT
+_MESHTRANSFER.fields_by_name['client'].message_type = _CLIENT
+_WORLDRECORD.fields_by_name['type'].enum_type = _WORLDRECORD_RECORDTYPE
+_WORLDRECORD.fields_by_name['nodes'].message_type = _NODE
+_WORLDRECORD.fields_by_name['situations'].message_type = _SITUATION
+_WORLDRECORD.fields_by_name['packed_nodes'].message_type = _PACKEDNODES
+_WORLDRECORD_RECORDTYPE.containing_type = _WORLDRECORD
+_PACKEDNODES_PROPERTY.fields_by_name['values'].message_type = _PROPERTYVALUE
+_PACKEDNODES_PROPERTY.containing_type = _PACKEDNODES
+_PACKEDNODES.fields_by_name['properties'].message_type = _PACKEDNODES_PROPERTY
 DESCRIPTOR.message_types_by_name['Empty'] = _EMPTY
 DESCRIPTOR.message_types_by_name['Bool'] = _BOOL
 DESCRIPTOR.message_types_by_name['Time'] = _TIME
@@ -1229,18 +2275,29 @@ DESCRIPTOR.message_types_by_name['Color'] = _COLOR
 DESCRIPTOR.message_types_by_name['Client'] = _CLIENT
 DESCRIPTOR.message_types_by_name['ClientInteraction'] = _CLIENTINTERACTION
 DESCRIPTOR.message_types_by_name['Context'] = _CONTEXT
+DESCRIPTOR.message_types_by_name['WorldCopy'] = _WORLDCOPY
 DESCRIPTOR.message_types_by_name['Invalidation'] = _INVALIDATION
 DESCRIPTOR.message_types_by_name['Topology'] = _TOPOLOGY
 DESCRIPTOR.message_types_by_name['Node'] = _NODE
+DESCRIPTOR.message_types_by_name['PropertyValue'] = _PROPERTYVALUE
 DESCRIPTOR.message_types_by_name['Nodes'] = _NODES
+DESCRIPTOR.message_types_by_name['SceneAt'] = _SCENEAT
 DESCRIPTOR.message_types_by_name['NodeInContext'] = _NODEINCONTEXT
 DESCRIPTOR.message_types_by_name['NodesInContext'] = _NODESINCONTEXT
+DESCRIPTOR.message_types_by_name['NodeDelta'] = _NODEDELTA
+DESCRIPTOR.message_types_by_name['NodeDeltasInContext'] = _NODEDELTASINCONTEXT
 DESCRIPTOR.message_types_by_name['Situation'] = _SITUATION
 DESCRIPTOR.message_types_by_name['Situations'] = _SITUATIONS
 DESCRIPTOR.message_types_by_name['SituationInContext'] = _SITUATIONINCONTEXT
 DESCRIPTOR.message_types_by_name['SituationsInContext'] = _SITUATIONSINCONTEXT
 DESCRIPTOR.message_types_by_name['Mesh'] = _MESH
 DESCRIPTOR.message_types_by_name['MeshInContext'] = _MESHINCONTEXT
+DESCRIPTOR.message_types_by_name['MeshIds'] = _MESHIDS
+DESCRIPTOR.message_types_by_name['MeshesAvailability'] = _MESHESAVAILABILITY
+DESCRIPTOR.message_types_by_name['MeshChunk'] = _MESHCHUNK
+DESCRIPTOR.message_types_by_name['MeshTransfer'] = _MESHTRANSFER
+DESCRIPTOR.message_types_by_name['WorldRecord'] = _WORLDRECORD
+DESCRIPTOR.message_types_by_name['PackedNodes'] = _PACKEDNODES
 
 Empty = _reflection.GeneratedProtocolMessageType('Empty', (_message.Message,), dict(
   DESCRIPTOR = _EMPTY,
@@ -1319,6 +2376,13 @@ Context = _reflection.GeneratedProtocolMessageType('Context', (_message.Message,
   ))
 _sym_db.RegisterMessage(Context)
 
+WorldCopy = _reflection.GeneratedProtocolMessageType('WorldCopy', (_message.Message,), dict(
+  DESCRIPTOR = _WORLDCOPY,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.WorldCopy)
+  ))
+_sym_db.RegisterMessage(WorldCopy)
+
 Invalidation = _reflection.GeneratedProtocolMessageType('Invalidation', (_message.Message,), dict(
   DESCRIPTOR = _INVALIDATION,
   __module__ = 'underworlds_pb2'
@@ -1341,12 +2405,67 @@ Node = _reflection.GeneratedProtocolMessageType('Node', (_message.Message,), dic
     # @@protoc_insertion_point(class_scope:underworlds.Node.PropertiesEntry)
     ))
   ,
+
+  TypedPropertiesEntry = _reflection.GeneratedProtocolMessageType('TypedPropertiesEntry', (_message.Message,), dict(
+    DESCRIPTOR = _NODE_TYPEDPROPERTIESENTRY,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.Node.TypedPropertiesEntry)
+    ))
+  ,
   DESCRIPTOR = _NODE,
   __module__ = 'underworlds_pb2'
   # @@protoc_insertion_point(class_scope:underworlds.Node)
   ))
 _sym_db.RegisterMessage(Node)
 _sym_db.RegisterMessage(Node.PropertiesEntry)
+_sym_db.RegisterMessage(Node.TypedPropertiesEntry)
+
+PropertyValue = _reflection.GeneratedProtocolMessageType('PropertyValue', (_message.Message,), dict(
+
+  Booleans = _reflection.GeneratedProtocolMessageType('Booleans', (_message.Message,), dict(
+    DESCRIPTOR = _PROPERTYVALUE_BOOLEANS,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.PropertyValue.Booleans)
+    ))
+  ,
+
+  Integers = _reflection.GeneratedProtocolMessageType('Integers', (_message.Message,), dict(
+    DESCRIPTOR = _PROPERTYVALUE_INTEGERS,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.PropertyValue.Integers)
+    ))
+  ,
+
+  Numbers = _reflection.GeneratedProtocolMessageType('Numbers', (_message.Message,), dict(
+    DESCRIPTOR = _PROPERTYVALUE_NUMBERS,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.PropertyValue.Numbers)
+    ))
+  ,
+
+  Strings = _reflection.GeneratedProtocolMessageType('Strings', (_message.Message,), dict(
+    DESCRIPTOR = _PROPERTYVALUE_STRINGS,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.PropertyValue.Strings)
+    ))
+  ,
+
+  NDArray = _reflection.GeneratedProtocolMessageType('NDArray', (_message.Message,), dict(
+    DESCRIPTOR = _PROPERTYVALUE_NDARRAY,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.PropertyValue.NDArray)
+    ))
+  ,
+  DESCRIPTOR = _PROPERTYVALUE,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.PropertyValue)
+  ))
+_sym_db.RegisterMessage(PropertyValue)
+_sym_db.RegisterMessage(PropertyValue.Booleans)
+_sym_db.RegisterMessage(PropertyValue.Integers)
+_sym_db.RegisterMessage(PropertyValue.Numbers)
+_sym_db.RegisterMessage(PropertyValue.Strings)
+_sym_db.RegisterMessage(PropertyValue.NDArray)
 
 Nodes = _reflection.GeneratedProtocolMessageType('Nodes', (_message.Message,), dict(
   DESCRIPTOR = _NODES,
@@ -1355,6 +2474,13 @@ Nodes = _reflection.GeneratedProtocolMessageType('Nodes', (_message.Message,), d
   ))
 _sym_db.RegisterMessage(Nodes)
 
+SceneAt = _reflection.GeneratedProtocolMessageType('SceneAt', (_message.Message,), dict(
+  DESCRIPTOR = _SCENEAT,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.SceneAt)
+  ))
+_sym_db.RegisterMessage(SceneAt)
+
 NodeInContext = _reflection.GeneratedProtocolMessageType('NodeInContext', (_message.Message,), dict(
   DESCRIPTOR = _NODEINCONTEXT,
   __module__ = 'underworlds_pb2'
@@ -1369,6 +2495,20 @@ NodesInContext = _reflection.GeneratedProtocolMessageType('NodesInContext', (_me
   ))
 _sym_db.RegisterMessage(NodesInContext)
 
+NodeDelta = _reflection.GeneratedProtocolMessageType('NodeDelta', (_message.Message,), dict(
+  DESCRIPTOR = _NODEDELTA,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.NodeDelta)
+  ))
+_sym_db.RegisterMessage(NodeDelta)
+
+NodeDeltasInContext = _reflection.GeneratedProtocolMessageType('NodeDeltasInContext', (_message.Message,), dict(
+  DESCRIPTOR = _NODEDELTASINCONTEXT,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.NodeDeltasInContext)
+  ))
+_sym_db.RegisterMessage(NodeDeltasInContext)
+
 Situation = _reflection.GeneratedProtocolMessageType('Situation', (_message.Message,), dict(
   DESCRIPTOR = _SITUATION,
   __module__ = 'underworlds_pb2'
@@ -1411,9 +2551,61 @@ MeshInContext = _reflection.GeneratedProtocolMessageType('MeshInContext', (_mess
   ))
 _sym_db.RegisterMessage(MeshInContext)
 
+MeshIds = _reflection.GeneratedProtocolMessageType('MeshIds', (_message.Message,), dict(
+  DESCRIPTOR = _MESHIDS,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.MeshIds)
+  ))
+_sym_db.RegisterMessage(MeshIds)
+
+MeshesAvailability = _reflection.GeneratedProtocolMessageType('MeshesAvailability', (_message.Message,), dict(
+  DESCRIPTOR = _MESHESAVAILABILITY,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.MeshesAvailability)
+  ))
+_sym_db.RegisterMessage(MeshesAvailability)
+
+MeshChunk = _reflection.GeneratedProtocolMessageType('MeshChunk', (_message.Message,), dict(
+  DESCRIPTOR = _MESHCHUNK,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.MeshChunk)
+  ))
+_sym_db.RegisterMessage(MeshChunk)
+
+MeshTransfer = _reflection.GeneratedProtocolMessageType('MeshTransfer', (_message.Message,), dict(
+  DESCRIPTOR = _MESHTRANSFER,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.MeshTransfer)
+  ))
+_sym_db.RegisterMessage(MeshTransfer)
+
+WorldRecord = _reflection.GeneratedProtocolMessageType('WorldRecord', (_message.Message,), dict(
+  DESCRIPTOR = _WORLDRECORD,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.WorldRecord)
+  ))
+_sym_db.RegisterMessage(WorldRecord)
+
+PackedNodes = _reflection.GeneratedProtocolMessageType('PackedNodes', (_message.Message,), dict(
+
+  Property = _reflection.GeneratedProtocolMessageType('Property', (_message.Message,), dict(
+    DESCRIPTOR = _PACKEDNODES_PROPERTY,
+    __module__ = 'underworlds_pb2'
+    # @@protoc_insertion_point(class_scope:underworlds.PackedNodes.Property)
+    ))
+  ,
+  DESCRIPTOR = _PACKEDNODES,
+  __module__ = 'underworlds_pb2'
+  # @@protoc_insertion_point(class_scope:underworlds.PackedNodes)
+  ))
+_sym_db.RegisterMessage(PackedNodes)
+_sym_db.RegisterMessage(PackedNodes.Property)
+
 
 _NODE_PROPERTIESENTRY.has_options = True
 _NODE_PROPERTIESENTRY._options = _descriptor._ParseOptions(descriptor_pb2.MessageOptions(), _b('8\001'))
+_NODE_TYPEDPROPERTIESENTRY.has_options = True
+_NODE_TYPEDPROPERTIESENTRY._options = _descriptor._ParseOptions(descriptor_pb2.MessageOptions(), _b('8\001'))
 import grpc
 from grpc.beta import implementations as beta_implementations
 from grpc.beta import interfaces as beta_interfaces
@@ -1439,6 +2631,11 @@ class UnderworldsStub(object):
         request_serializer=Client.SerializeToString,
         response_deserializer=Empty.FromString,
         )
+    self.subscribe = channel.unary_stream(
+        '/underworlds.Underworlds/subscribe',
+        request_serializer=Client.SerializeToString,
+        response_deserializer=Invalidation.FromString,
+        )
     self.uptime = channel.unary_unary(
         '/underworlds.Underworlds/uptime',
         request_serializer=Client.SerializeToString,
@@ -1454,6 +2651,11 @@ class UnderworldsStub(object):
         request_serializer=Client.SerializeToString,
         response_deserializer=Empty.FromString,
         )
+    self.copyWorld = channel.unary_unary(
+        '/underworlds.Underworlds/copyWorld',
+        request_serializer=WorldCopy.SerializeToString,
+        response_deserializer=Empty.FromString,
+        )
     self.getNodesLen = channel.unary_unary(
         '/underworlds.Underworlds/getNodesLen',
         request_serializer=Context.SerializeToString,
@@ -1474,11 +2676,31 @@ class UnderworldsStub(object):
         request_serializer=NodeInContext.SerializeToString,
         response_deserializer=Node.FromString,
         )
+    self.getNodes = channel.unary_unary(
+        '/underworlds.Underworlds/getNodes',
+        request_serializer=NodesInContext.SerializeToString,
+        response_deserializer=NodesInContext.FromString,
+        )
+    self.getScene = channel.unary_stream(
+        '/underworlds.Underworlds/getScene',
+        request_serializer=Context.SerializeToString,
+        response_deserializer=NodesInContext.FromString,
+        )
+    self.getSceneAt = channel.unary_stream(
+        '/underworlds.Underworlds/getSceneAt',
+        request_serializer=SceneAt.SerializeToString,
+        response_deserializer=SceneAt.FromString,
+        )
     self.updateNodes = channel.unary_unary(
         '/underworlds.Underworlds/updateNodes',
         request_serializer=NodesInContext.SerializeToString,
         response_deserializer=Empty.FromString,
         )
+    self.updateNodesFields = channel.unary_unary(
+        '/underworlds.Underworlds/updateNodesFields',
+        request_serializer=NodeDeltasInContext.SerializeToString,
+        response_deserializer=Empty.FromString,
+        )
     self.deleteNodes = channel.unary_unary(
         '/underworlds.Underworlds/deleteNodes',
         request_serializer=NodesInContext.SerializeToString,
@@ -1519,6 +2741,11 @@ class UnderworldsStub(object):
         request_serializer=MeshInContext.SerializeToString,
         response_deserializer=Bool.FromString,
         )
+    self.hasMeshes = channel.unary_unary(
+        '/underworlds.Underworlds/hasMeshes',
+        request_serializer=MeshIds.SerializeToString,
+        response_deserializer=MeshesAvailability.FromString,
+        )
     self.getMesh = channel.unary_unary(
         '/underworlds.Underworlds/getMesh',
         request_serializer=MeshInContext.SerializeToString,
@@ -1529,6 +2756,26 @@ class UnderworldsStub(object):
         request_serializer=MeshInContext.SerializeToString,
         response_deserializer=Empty.FromString,
         )
+    self.pushMeshes = channel.stream_unary(
+        '/underworlds.Underworlds/pushMeshes',
+        request_serializer=MeshInContext.SerializeToString,
+        response_deserializer=Empty.FromString,
+        )
+    self.getMeshChunks = channel.unary_stream(
+        '/underworlds.Underworlds/getMeshChunks',
+        request_serializer=MeshTransfer.SerializeToString,
+        response_deserializer=MeshChunk.FromString,
+        )
+    self.pushMeshChunks = channel.stream_unary(
+        '/underworlds.Underworlds/pushMeshChunks',
+        request_serializer=MeshChunk.SerializeToString,
+        response_deserializer=MeshTransfer.FromString,
+        )
+    self.getMeshUploadStatus = channel.unary_unary(
+        '/underworlds.Underworlds/getMeshUploadStatus',
+        request_serializer=MeshTransfer.SerializeToString,
+        response_deserializer=MeshTransfer.FromString,
+        )
 
 
 class UnderworldsServicer(object):
@@ -1550,7 +2797,19 @@ class UnderworldsServicer(object):
     Before completing this call, the client must keep its invalidation
     server open and listening.
     After completing this call, the server should not attempt to connect to
-    the client's invalidation server.
+    the client's invalidation server, and closes the client's invalidation
+    stream, if any (see subscribe).
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def subscribe(self, request, context):
+    """Opens the stream of invalidations for this client.
+    Only available to clients that requested streamed invalidations in
+    their Welcome message. These clients do not run an invalidation server:
+    invalidations for every world the client interacts with are sent on
+    this stream instead, until the client calls byebye.
     """
     context.set_code(grpc.StatusCode.UNIMPLEMENTED)
     context.set_details('Method not implemented!')
@@ -1581,6 +2840,19 @@ class UnderworldsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def copyWorld(self, request, context):
+    """Replaces the content of a world (created if needed) by a copy of
+    another world: its scene and its timeline, with the same node and
+    situation IDs (and the same root node).
+    The copy is made by the server, without transferring the nodes.
+    Clients are then informed of the new content of the world by bulk
+    invalidations.
+    Returns a NOT_FOUND error if the source world does not exist.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
   def getNodesLen(self, request, context):
     """NODES
 
@@ -1613,6 +2885,38 @@ class UnderworldsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def getNodes(self, request, context):
+    """Returns several nodes from their IDs in the given world.
+    Note that only the nodes IDs are used. Nodes that do not exist are
+    omitted from the response.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def getScene(self, request, context):
+    """Returns all the nodes of the given world, in the same order as
+    getNodesIds.
+    The nodes are streamed back in chunks of several nodes.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def getSceneAt(self, request, context):
+    """Returns all the nodes of the given world, as they were at a given
+    version of the scene (see Invalidation.version), or at the current
+    version if 'version' is 0. The nodes are consistent with each other,
+    even if the scene is being modified.
+    The nodes are streamed back in chunks of several nodes. The first
+    chunk holds the version of the scene and its root node ID.
+    Only the most recent versions are kept by the server: returns an
+    OUT_OF_RANGE error if the requested version is not available anymore.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
   def updateNodes(self, request, context):
     """Updates (and broadcasts to all client) nodes in a given world
     """
@@ -1620,6 +2924,16 @@ class UnderworldsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def updateNodesFields(self, request, context):
+    """Updates only some of the fields of existing nodes in a given world, and
+    broadcasts these changes to all clients as deltas (see
+    Invalidation.deltas).
+    Deltas for nodes that do not exist are ignored.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
   def deleteNodes(self, request, context):
     """Deletes (and broadcasts to all client) nodes in a given world
     """
@@ -1684,9 +2998,18 @@ class UnderworldsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def hasMeshes(self, request, context):
+    """Returns which of the given meshes are already available on the server.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
   def getMesh(self, request, context):
     """Returns a 3D mesh.
     Note that only the ID of the input mesh is used.
+    Meshes larger than 4MB (once serialized) are only available through
+    getMeshChunks.
     """
     context.set_code(grpc.StatusCode.UNIMPLEMENTED)
     context.set_details('Method not implemented!')
@@ -1699,6 +3022,49 @@ class UnderworldsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def pushMeshes(self, request_iterator, context):
+    """Sends several 3D meshes to the server, one mesh per message.
+    Large meshes should rather be sent with pushMeshChunks.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def getMeshChunks(self, request, context):
+    """Returns a 3D mesh, streamed back in chunks of its serialized Mesh
+    message (for large meshes, see MeshChunk).
+    Only the client, mesh ID and offset of the input are used: the
+    transfer starts at the given offset, so that an interrupted download
+    can be resumed.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def pushMeshChunks(self, request_iterator, context):
+    """Sends a 3D mesh to the server, as a stream of chunks of its serialized
+    Mesh message (for large meshes, see MeshChunk). The mesh is available
+    once all its chunks have been received.
+    If the stream is interrupted, the chunks received so far are kept, and
+    the upload can be resumed (see getMeshUploadStatus), until the client
+    disconnects or stops sending chunks for 10 minutes.
+    Chunks past the announced size are rejected (OUT_OF_RANGE), as are
+    meshes that do not decode, or whose ID is not the one of the chunks
+    (INVALID_ARGUMENT). Returns the status of the upload.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def getMeshUploadStatus(self, request, context):
+    """Returns how much of a mesh has already been received by the server
+    through pushMeshChunks. Only the client and mesh ID of the input are
+    used. If no upload is pending for this mesh, offset and size are 0.
+    """
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_UnderworldsServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -1712,6 +3078,11 @@ def add_UnderworldsServicer_to_server(servicer, server):
           request_deserializer=Client.FromString,
           response_serializer=Empty.SerializeToString,
       ),
+      'subscribe': grpc.unary_stream_rpc_method_handler(
+          servicer.subscribe,
+          request_deserializer=Client.FromString,
+          response_serializer=Invalidation.SerializeToString,
+      ),
       'uptime': grpc.unary_unary_rpc_method_handler(
           servicer.uptime,
           request_deserializer=Client.FromString,
@@ -1727,6 +3098,11 @@ def add_UnderworldsServicer_to_server(servicer, server):
           request_deserializer=Client.FromString,
           response_serializer=Empty.SerializeToString,
       ),
+      'copyWorld': grpc.unary_unary_rpc_method_handler(
+          servicer.copyWorld,
+          request_deserializer=WorldCopy.FromString,
+          response_serializer=Empty.SerializeToString,
+      ),
       'getNodesLen': grpc.unary_unary_rpc_method_handler(
           servicer.getNodesLen,
           request_deserializer=Context.FromString,
@@ -1747,11 +3123,31 @@ def add_UnderworldsServicer_to_server(servicer, server):
           request_deserializer=NodeInContext.FromString,
           response_serializer=Node.SerializeToString,
       ),
+      'getNodes': grpc.unary_unary_rpc_method_handler(
+          servicer.getNodes,
+          request_deserializer=NodesInContext.FromString,
+          response_serializer=NodesInContext.SerializeToString,
+      ),
+      'getScene': grpc.unary_stream_rpc_method_handler(
+          servicer.getScene,
+          request_deserializer=Context.FromString,
+          response_serializer=NodesInContext.SerializeToString,
+      ),
+      'getSceneAt': grpc.unary_stream_rpc_method_handler(
+          servicer.getSceneAt,
+          request_deserializer=SceneAt.FromString,
+          response_serializer=SceneAt.SerializeToString,
+      ),
       'updateNodes': grpc.unary_unary_rpc_method_handler(
           servicer.updateNodes,
           request_deserializer=NodesInContext.FromString,
           response_serializer=Empty.SerializeToString,
       ),
+      'updateNodesFields': grpc.unary_unary_rpc_method_handler(
+          servicer.updateNodesFields,
+          request_deserializer=NodeDeltasInContext.FromString,
+          response_serializer=Empty.SerializeToString,
+      ),
       'deleteNodes': grpc.unary_unary_rpc_method_handler(
           servicer.deleteNodes,
           request_deserializer=NodesInContext.FromString,
@@ -1792,6 +3188,11 @@ def add_UnderworldsServicer_to_server(servicer, server):
           request_deserializer=MeshInContext.FromString,
           response_serializer=Bool.SerializeToString,
       ),
+      'hasMeshes': grpc.unary_unary_rpc_method_handler(
+          servicer.hasMeshes,
+          request_deserializer=MeshIds.FromString,
+          response_serializer=MeshesAvailability.SerializeToString,
+      ),
       'getMesh': grpc.unary_unary_rpc_method_handler(
           servicer.getMesh,
           request_deserializer=MeshInContext.FromString,
@@ -1802,6 +3203,26 @@ def add_UnderworldsServicer_to_server(servicer, server):
           request_deserializer=MeshInContext.FromString,
           response_serializer=Empty.SerializeToString,
       ),
+      'pushMeshes': grpc.stream_unary_rpc_method_handler(
+          servicer.pushMeshes,
+          request_deserializer=MeshInContext.FromString,
+          response_serializer=Empty.SerializeToString,
+      ),
+      'getMeshChunks': grpc.unary_stream_rpc_method_handler(
+          servicer.getMeshChunks,
+          request_deserializer=MeshTransfer.FromString,
+          response_serializer=MeshChunk.SerializeToString,
+      ),
+      'pushMeshChunks': grpc.stream_unary_rpc_method_handler(
+          servicer.pushMeshChunks,
+          request_deserializer=MeshChunk.FromString,
+          response_serializer=MeshTransfer.SerializeToString,
+      ),
+      'getMeshUploadStatus': grpc.unary_unary_rpc_method_handler(
+          servicer.getMeshUploadStatus,
+          request_deserializer=MeshTransfer.FromString,
+          response_serializer=MeshTransfer.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'underworlds.Underworlds', rpc_method_handlers)
@@ -1823,7 +3244,16 @@ class BetaUnderworldsServicer(object):
     Before completing this call, the client must keep its invalidation
     server open and listening.
     After completing this call, the server should not attempt to connect to
-    the client's invalidation server.
+    the client's invalidation server, and closes the client's invalidation
+    stream, if any (see subscribe).
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def subscribe(self, request, context):
+    """Opens the stream of invalidations for this client.
+    Only available to clients that requested streamed invalidations in
+    their Welcome message. These clients do not run an invalidation server:
+    invalidations for every world the client interacts with are sent on
+    this stream instead, until the client calls byebye.
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
   def uptime(self, request, context):
@@ -1842,6 +3272,16 @@ class BetaUnderworldsServicer(object):
     call 'helo' again).
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def copyWorld(self, request, context):
+    """Replaces the content of a world (created if needed) by a copy of
+    another world: its scene and its timeline, with the same node and
+    situation IDs (and the same root node).
+    The copy is made by the server, without transferring the nodes.
+    Clients are then informed of the new content of the world by bulk
+    invalidations.
+    Returns a NOT_FOUND error if the source world does not exist.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
   def getNodesLen(self, request, context):
     """NODES
 
@@ -1862,10 +3302,40 @@ class BetaUnderworldsServicer(object):
     Note that only the node ID is used (and thus, required).
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def getNodes(self, request, context):
+    """Returns several nodes from their IDs in the given world.
+    Note that only the nodes IDs are used. Nodes that do not exist are
+    omitted from the response.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def getScene(self, request, context):
+    """Returns all the nodes of the given world, in the same order as
+    getNodesIds.
+    The nodes are streamed back in chunks of several nodes.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def getSceneAt(self, request, context):
+    """Returns all the nodes of the given world, as they were at a given
+    version of the scene (see Invalidation.version), or at the current
+    version if 'version' is 0. The nodes are consistent with each other,
+    even if the scene is being modified.
+    The nodes are streamed back in chunks of several nodes. The first
+    chunk holds the version of the scene and its root node ID.
+    Only the most recent versions are kept by the server: returns an
+    OUT_OF_RANGE error if the requested version is not available anymore.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
   def updateNodes(self, request, context):
     """Updates (and broadcasts to all client) nodes in a given world
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def updateNodesFields(self, request, context):
+    """Updates only some of the fields of existing nodes in a given world, and
+    broadcasts these changes to all clients as deltas (see
+    Invalidation.deltas).
+    Deltas for nodes that do not exist are ignored.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
   def deleteNodes(self, request, context):
     """Deletes (and broadcasts to all client) nodes in a given world
     """
@@ -1906,15 +3376,52 @@ class BetaUnderworldsServicer(object):
     Note that only the mesh ID is used.
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def hasMeshes(self, request, context):
+    """Returns which of the given meshes are already available on the server.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
   def getMesh(self, request, context):
     """Returns a 3D mesh.
     Note that only the ID of the input mesh is used.
+    Meshes larger than 4MB (once serialized) are only available through
+    getMeshChunks.
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
   def pushMesh(self, request, context):
     """Sends a 3D mesh to the server.
     """
     context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def pushMeshes(self, request_iterator, context):
+    """Sends several 3D meshes to the server, one mesh per message.
+    Large meshes should rather be sent with pushMeshChunks.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def getMeshChunks(self, request, context):
+    """Returns a 3D mesh, streamed back in chunks of its serialized Mesh
+    message (for large meshes, see MeshChunk).
+    Only the client, mesh ID and offset of the input are used: the
+    transfer starts at the given offset, so that an interrupted download
+    can be resumed.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def pushMeshChunks(self, request_iterator, context):
+    """Sends a 3D mesh to the server, as a stream of chunks of its serialized
+    Mesh message (for large meshes, see MeshChunk). The mesh is available
+    once all its chunks have been received.
+    If the stream is interrupted, the chunks received so far are kept, and
+    the upload can be resumed (see getMeshUploadStatus), until the client
+    disconnects or stops sending chunks for 10 minutes.
+    Chunks past the announced size are rejected (OUT_OF_RANGE), as are
+    meshes that do not decode, or whose ID is not the one of the chunks
+    (INVALID_ARGUMENT). Returns the status of the upload.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
+  def getMeshUploadStatus(self, request, context):
+    """Returns how much of a mesh has already been received by the server
+    through pushMeshChunks. Only the client and mesh ID of the input are
+    used. If no upload is pending for this mesh, offset and size are 0.
+    """
+    context.code(beta_interfaces.StatusCode.UNIMPLEMENTED)
 
 
 class BetaUnderworldsStub(object):
@@ -1933,10 +3440,19 @@ class BetaUnderworldsStub(object):
     Before completing this call, the client must keep its invalidation
     server open and listening.
     After completing this call, the server should not attempt to connect to
-    the client's invalidation server.
+    the client's invalidation server, and closes the client's invalidation
+    stream, if any (see subscribe).
     """
     raise NotImplementedError()
   byebye.future = None
+  def subscribe(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Opens the stream of invalidations for this client.
+    Only available to clients that requested streamed invalidations in
+    their Welcome message. These clients do not run an invalidation server:
+    invalidations for every world the client interacts with are sent on
+    this stream instead, until the client calls byebye.
+    """
+    raise NotImplementedError()
   def uptime(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
     """Returns the uptime of the server, in seconds
     """
@@ -1956,6 +3472,17 @@ class BetaUnderworldsStub(object):
     """
     raise NotImplementedError()
   reset.future = None
+  def copyWorld(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Replaces the content of a world (created if needed) by a copy of
+    another world: its scene and its timeline, with the same node and
+    situation IDs (and the same root node).
+    The copy is made by the server, without transferring the nodes.
+    Clients are then informed of the new content of the world by bulk
+    invalidations.
+    Returns a NOT_FOUND error if the source world does not exist.
+    """
+    raise NotImplementedError()
+  copyWorld.future = None
   def getNodesLen(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
     """NODES
 
@@ -1980,11 +3507,43 @@ class BetaUnderworldsStub(object):
     """
     raise NotImplementedError()
   getNode.future = None
+  def getNodes(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Returns several nodes from their IDs in the given world.
+    Note that only the nodes IDs are used. Nodes that do not exist are
+    omitted from the response.
+    """
+    raise NotImplementedError()
+  getNodes.future = None
+  def getScene(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Returns all the nodes of the given world, in the same order as
+    getNodesIds.
+    The nodes are streamed back in chunks of several nodes.
+    """
+    raise NotImplementedError()
+  def getSceneAt(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Returns all the nodes of the given world, as they were at a given
+    version of the scene (see Invalidation.version), or at the current
+    version if 'version' is 0. The nodes are consistent with each other,
+    even if the scene is being modified.
+    The nodes are streamed back in chunks of several nodes. The first
+    chunk holds the version of the scene and its root node ID.
+    Only the most recent versions are kept by the server: returns an
+    OUT_OF_RANGE error if the requested version is not available anymore.
+    """
+    raise NotImplementedError()
   def updateNodes(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
     """Updates (and broadcasts to all client) nodes in a given world
     """
     raise NotImplementedError()
   updateNodes.future = None
+  def updateNodesFields(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Updates only some of the fields of existing nodes in a given world, and
+    broadcasts these changes to all clients as deltas (see
+    Invalidation.deltas).
+    Deltas for nodes that do not exist are ignored.
+    """
+    raise NotImplementedError()
+  updateNodesFields.future = None
   def deleteNodes(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
     """Deletes (and broadcasts to all client) nodes in a given world
     """
@@ -2033,9 +3592,16 @@ class BetaUnderworldsStub(object):
     """
     raise NotImplementedError()
   hasMesh.future = None
+  def hasMeshes(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Returns which of the given meshes are already available on the server.
+    """
+    raise NotImplementedError()
+  hasMeshes.future = None
   def getMesh(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
     """Returns a 3D mesh.
     Note that only the ID of the input mesh is used.
+    Meshes larger than 4MB (once serialized) are only available through
+    getMeshChunks.
     """
     raise NotImplementedError()
   getMesh.future = None
@@ -2044,72 +3610,139 @@ class BetaUnderworldsStub(object):
     """
     raise NotImplementedError()
   pushMesh.future = None
+  def pushMeshes(self, request_iterator, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Sends several 3D meshes to the server, one mesh per message.
+    Large meshes should rather be sent with pushMeshChunks.
+    """
+    raise NotImplementedError()
+  pushMeshes.future = None
+  def getMeshChunks(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Returns a 3D mesh, streamed back in chunks of its serialized Mesh
+    message (for large meshes, see MeshChunk).
+    Only the client, mesh ID and offset of the input are used: the
+    transfer starts at the given offset, so that an interrupted download
+    can be resumed.
+    """
+    raise NotImplementedError()
+  def pushMeshChunks(self, request_iterator, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Sends a 3D mesh to the server, as a stream of chunks of its serialized
+    Mesh message (for large meshes, see MeshChunk). The mesh is available
+    once all its chunks have been received.
+    If the stream is interrupted, the chunks received so far are kept, and
+    the upload can be resumed (see getMeshUploadStatus), until the client
+    disconnects or stops sending chunks for 10 minutes.
+    Chunks past the announced size are rejected (OUT_OF_RANGE), as are
+    meshes that do not decode, or whose ID is not the one of the chunks
+    (INVALID_ARGUMENT). Returns the status of the upload.
+    """
+    raise NotImplementedError()
+  pushMeshChunks.future = None
+  def getMeshUploadStatus(self, request, timeout, metadata=None, with_call=False, protocol_options=None):
+    """Returns how much of a mesh has already been received by the server
+    through pushMeshChunks. Only the client and mesh ID of the input are
+    used. If no upload is pending for this mesh, offset and size are 0.
+    """
+    raise NotImplementedError()
+  getMeshUploadStatus.future = None
 
 
 def beta_create_Underworlds_server(servicer, pool=None, pool_size=None, default_timeout=None, maximum_timeout=None):
   request_deserializers = {
     ('underworlds.Underworlds', 'byebye'): Client.FromString,
+    ('underworlds.Underworlds', 'copyWorld'): WorldCopy.FromString,
     ('underworlds.Underworlds', 'deleteNodes'): NodesInContext.FromString,
     ('underworlds.Underworlds', 'deleteSituations'): SituationsInContext.FromString,
     ('underworlds.Underworlds', 'getMesh'): MeshInContext.FromString,
+    ('underworlds.Underworlds', 'getMeshChunks'): MeshTransfer.FromString,
+    ('underworlds.Underworlds', 'getMeshUploadStatus'): MeshTransfer.FromString,
     ('underworlds.Underworlds', 'getNode'): NodeInContext.FromString,
+    ('underworlds.Underworlds', 'getNodes'): NodesInContext.FromString,
     ('underworlds.Underworlds', 'getNodesIds'): Context.FromString,
     ('underworlds.Underworlds', 'getNodesLen'): Context.FromString,
     ('underworlds.Underworlds', 'getRootNode'): Context.FromString,
+    ('underworlds.Underworlds', 'getScene'): Context.FromString,
+    ('underworlds.Underworlds', 'getSceneAt'): SceneAt.FromString,
     ('underworlds.Underworlds', 'getSituation'): SituationInContext.FromString,
     ('underworlds.Underworlds', 'getSituationsIds'): Context.FromString,
     ('underworlds.Underworlds', 'getSituationsLen'): Context.FromString,
     ('underworlds.Underworlds', 'hasMesh'): MeshInContext.FromString,
+    ('underworlds.Underworlds', 'hasMeshes'): MeshIds.FromString,
     ('underworlds.Underworlds', 'helo'): Welcome.FromString,
     ('underworlds.Underworlds', 'pushMesh'): MeshInContext.FromString,
+    ('underworlds.Underworlds', 'pushMeshChunks'): MeshChunk.FromString,
+    ('underworlds.Underworlds', 'pushMeshes'): MeshInContext.FromString,
     ('underworlds.Underworlds', 'reset'): Client.FromString,
+    ('underworlds.Underworlds', 'subscribe'): Client.FromString,
     ('underworlds.Underworlds', 'timelineOrigin'): Context.FromString,
     ('underworlds.Underworlds', 'topology'): Client.FromString,
     ('underworlds.Underworlds', 'updateNodes'): NodesInContext.FromString,
+    ('underworlds.Underworlds', 'updateNodesFields'): NodeDeltasInContext.FromString,
     ('underworlds.Underworlds', 'updateSituations'): SituationsInContext.FromString,
     ('underworlds.Underworlds', 'uptime'): Client.FromString,
   }
   response_serializers = {
     ('underworlds.Underworlds', 'byebye'): Empty.SerializeToString,
+    ('underworlds.Underworlds', 'copyWorld'): Empty.SerializeToString,
     ('underworlds.Underworlds', 'deleteNodes'): Empty.SerializeToString,
     ('underworlds.Underworlds', 'deleteSituations'): Empty.SerializeToString,
     ('underworlds.Underworlds', 'getMesh'): Mesh.SerializeToString,
+    ('underworlds.Underworlds', 'getMeshChunks'): MeshChunk.SerializeToString,
+    ('underworlds.Underworlds', 'getMeshUploadStatus'): MeshTransfer.SerializeToString,
     ('underworlds.Underworlds', 'getNode'): Node.SerializeToString,
+    ('underworlds.Underworlds', 'getNodes'): NodesInContext.SerializeToString,
     ('underworlds.Underworlds', 'getNodesIds'): Nodes.SerializeToString,
     ('underworlds.Underworlds', 'getNodesLen'): Size.SerializeToString,
     ('underworlds.Underworlds', 'getRootNode'): Node.SerializeToString,
+    ('underworlds.Underworlds', 'getScene'): NodesInContext.SerializeToString,
+    ('underworlds.Underworlds', 'getSceneAt'): SceneAt.SerializeToString,
     ('underworlds.Underworlds', 'getSituation'): Situation.SerializeToString,
     ('underworlds.Underworlds', 'getSituationsIds'): Situations.SerializeToString,
     ('underworlds.Underworlds', 'getSituationsLen'): Size.SerializeToString,
     ('underworlds.Underworlds', 'hasMesh'): Bool.SerializeToString,
+    ('underworlds.Underworlds', 'hasMeshes'): MeshesAvailability.SerializeToString,
     ('underworlds.Underworlds', 'helo'): Client.SerializeToString,
     ('underworlds.Underworlds', 'pushMesh'): Empty.SerializeToString,
+    ('underworlds.Underworlds', 'pushMeshChunks'): MeshTransfer.SerializeToString,
+    ('underworlds.Underworlds', 'pushMeshes'): Empty.SerializeToString,
     ('underworlds.Underworlds', 'reset'): Empty.SerializeToString,
+    ('underworlds.Underworlds', 'subscribe'): Invalidation.SerializeToString,
     ('underworlds.Underworlds', 'timelineOrigin'): Time.SerializeToString,
     ('underworlds.Underworlds', 'topology'): Topology.SerializeToString,
     ('underworlds.Underworlds', 'updateNodes'): Empty.SerializeToString,
+    ('underworlds.Underworlds', 'updateNodesFields'): Empty.SerializeToString,
     ('underworlds.Underworlds', 'updateSituations'): Empty.SerializeToString,
     ('underworlds.Underworlds', 'uptime'): Time.SerializeToString,
   }
   method_implementations = {
     ('underworlds.Underworlds', 'byebye'): face_utilities.unary_unary_inline(servicer.byebye),
+    ('underworlds.Underworlds', 'copyWorld'): face_utilities.unary_unary_inline(servicer.copyWorld),
     ('underworlds.Underworlds', 'deleteNodes'): face_utilities.unary_unary_inline(servicer.deleteNodes),
     ('underworlds.Underworlds', 'deleteSituations'): face_utilities.unary_unary_inline(servicer.deleteSituations),
     ('underworlds.Underworlds', 'getMesh'): face_utilities.unary_unary_inline(servicer.getMesh),
+    ('underworlds.Underworlds', 'getMeshChunks'): face_utilities.unary_stream_inline(servicer.getMeshChunks),
+    ('underworlds.Underworlds', 'getMeshUploadStatus'): face_utilities.unary_unary_inline(servicer.getMeshUploadStatus),
     ('underworlds.Underworlds', 'getNode'): face_utilities.unary_unary_inline(servicer.getNode),
+    ('underworlds.Underworlds', 'getNodes'): face_utilities.unary_unary_inline(servicer.getNodes),
     ('underworlds.Underworlds', 'getNodesIds'): face_utilities.unary_unary_inline(servicer.getNodesIds),
     ('underworlds.Underworlds', 'getNodesLen'): face_utilities.unary_unary_inline(servicer.getNodesLen),
     ('underworlds.Underworlds', 'getRootNode'): face_utilities.unary_unary_inline(servicer.getRootNode),
+    ('underworlds.Underworlds', 'getScene'): face_utilities.unary_stream_inline(servicer.getScene),
+    ('underworlds.Underworlds', 'getSceneAt'): face_utilities.unary_stream_inline(servicer.getSceneAt),
     ('underworlds.Underworlds', 'getSituation'): face_utilities.unary_unary_inline(servicer.getSituation),
     ('underworlds.Underworlds', 'getSituationsIds'): face_utilities.unary_unary_inline(servicer.getSituationsIds),
     ('underworlds.Underworlds', 'getSituationsLen'): face_utilities.unary_unary_inline(servicer.getSituationsLen),
     ('underworlds.Underworlds', 'hasMesh'): face_utilities.unary_unary_inline(servicer.hasMesh),
+    ('underworlds.Underworlds', 'hasMeshes'): face_utilities.unary_unary_inline(servicer.hasMeshes),
     ('underworlds.Underworlds', 'helo'): face_utilities.unary_unary_inline(servicer.helo),
     ('underworlds.Underworlds', 'pushMesh'): face_utilities.unary_unary_inline(servicer.pushMesh),
+    ('underworlds.Underworlds', 'pushMeshChunks'): face_utilities.stream_unary_inline(servicer.pushMeshChunks),
+    ('underworlds.Underworlds', 'pushMeshes'): face_utilities.stream_unary_inline(servicer.pushMeshes),
     ('underworlds.Underworlds', 'reset'): face_utilities.unary_unary_inline(servicer.reset),
+    ('underworlds.Underworlds', 'subscribe'): face_utilities.unary_stream_inline(servicer.subscribe),
     ('underworlds.Underworlds', 'timelineOrigin'): face_utilities.unary_unary_inline(servicer.timelineOrigin),
     ('underworlds.Underworlds', 'topology'): face_utilities.unary_unary_inline(servicer.topology),
     ('underworlds.Underworlds', 'updateNodes'): face_utilities.unary_unary_inline(servicer.updateNodes),
+    ('underworlds.Underworlds', 'updateNodesFields'): face_utilities.unary_unary_inline(servicer.updateNodesFields),
     ('underworlds.Underworlds', 'updateSituations'): face_utilities.unary_unary_inline(servicer.updateSituations),
     ('underworlds.Underworlds', 'uptime'): face_utilities.unary_unary_inline(servicer.uptime),
   }
@@ -2120,67 +3753,100 @@ def beta_create_Underworlds_server(servicer, pool=None, pool_size=None, default_
 def beta_create_Underworlds_stub(channel, host=None, metadata_transformer=None, pool=None, pool_size=None):
   request_serializers = {
     ('underworlds.Underworlds', 'byebye'): Client.SerializeToString,
+    ('underworlds.Underworlds', 'copyWorld'): WorldCopy.SerializeToString,
     ('underworlds.Underworlds', 'deleteNodes'): NodesInContext.SerializeToString,
     ('underworlds.Underworlds', 'deleteSituations'): SituationsInContext.SerializeToString,
     ('underworlds.Underworlds', 'getMesh'): MeshInContext.SerializeToString,
+    ('underworlds.Underworlds', 'getMeshChunks'): MeshTransfer.SerializeToString,
+    ('underworlds.Underworlds', 'getMeshUploadStatus'): MeshTransfer.SerializeToString,
     ('underworlds.Underworlds', 'getNode'): NodeInContext.SerializeToString,
+    ('underworlds.Underworlds', 'getNodes'): NodesInContext.SerializeToString,
     ('underworlds.Underworlds', 'getNodesIds'): Context.SerializeToString,
     ('underworlds.Underworlds', 'getNodesLen'): Context.SerializeToString,
     ('underworlds.Underworlds', 'getRootNode'): Context.SerializeToString,
+    ('underworlds.Underworlds', 'getScene'): Context.SerializeToString,
+    ('underworlds.Underworlds', 'getSceneAt'): SceneAt.SerializeToString,
     ('underworlds.Underworlds', 'getSituation'): SituationInContext.SerializeToString,
     ('underworlds.Underworlds', 'getSituationsIds'): Context.SerializeToString,
     ('underworlds.Underworlds', 'getSituationsLen'): Context.SerializeToString,
     ('underworlds.Underworlds', 'hasMesh'): MeshInContext.SerializeToString,
+    ('underworlds.Underworlds', 'hasMeshes'): MeshIds.SerializeToString,
     ('underworlds.Underworlds', 'helo'): Welcome.SerializeToString,
     ('underworlds.Underworlds', 'pushMesh'): MeshInContext.SerializeToString,
+    ('underworlds.Underworlds', 'pushMeshChunks'): MeshChunk.SerializeToString,
+    ('underworlds.Underworlds', 'pushMeshes'): MeshInContext.SerializeToString,
     ('underworlds.Underworlds', 'reset'): Client.SerializeToString,
+    ('underworlds.Underworlds', 'subscribe'): Client.SerializeToString,
     ('underworlds.Underworlds', 'timelineOrigin'): Context.SerializeToString,
     ('underworlds.Underworlds', 'topology'): Client.SerializeToString,
     ('underworlds.Underworlds', 'updateNodes'): NodesInContext.SerializeToString,
+    ('underworlds.Underworlds', 'updateNodesFields'): NodeDeltasInContext.SerializeToString,
     ('underworlds.Underworlds', 'updateSituations'): SituationsInContext.SerializeToString,
     ('underworlds.Underworlds', 'uptime'): Client.SerializeToString,
   }
   response_deserializers = {
     ('underworlds.Underworlds', 'byebye'): Empty.FromString,
+    ('underworlds.Underworlds', 'copyWorld'): Empty.FromString,
     ('underworlds.Underworlds', 'deleteNodes'): Empty.FromString,
     ('underworlds.Underworlds', 'deleteSituations'): Empty.FromString,
     ('underworlds.Underworlds', 'getMesh'): Mesh.FromString,
+    ('underworlds.Underworlds', 'getMeshChunks'): MeshChunk.FromString,
+    ('underworlds.Underworlds', 'getMeshUploadStatus'): MeshTransfer.FromString,
     ('underworlds.Underworlds', 'getNode'): Node.FromString,
+    ('underworlds.Underworlds', 'getNodes'): NodesInContext.FromString,
     ('underworlds.Underworlds', 'getNodesIds'): Nodes.FromString,
     ('underworlds.Underworlds', 'getNodesLen'): Size.FromString,
     ('underworlds.Underworlds', 'getRootNode'): Node.FromString,
+    ('underworlds.Underworlds', 'getScene'): NodesInContext.FromString,
+    ('underworlds.Underworlds', 'getSceneAt'): SceneAt.FromString,
     ('underworlds.Underworlds', 'getSituation'): Situation.FromString,
     ('underworlds.Underworlds', 'getSituationsIds'): Situations.FromString,
     ('underworlds.Underworlds', 'getSituationsLen'): Size.FromString,
     ('underworlds.Underworlds', 'hasMesh'): Bool.FromString,
+    ('underworlds.Underworlds', 'hasMeshes'): MeshesAvailability.FromString,
     ('underworlds.Underworlds', 'helo'): Client.FromString,
     ('underworlds.Underworlds', 'pushMesh'): Empty.FromString,
+    ('underworlds.Underworlds', 'pushMeshChunks'): MeshTransfer.FromString,
+    ('underworlds.Underworlds', 'pushMeshes'): Empty.FromString,
     ('underworlds.Underworlds', 'reset'): Empty.FromString,
+    ('underworlds.Underworlds', 'subscribe'): Invalidation.FromString,
     ('underworlds.Underworlds', 'timelineOrigin'): Time.FromString,
     ('underworlds.Underworlds', 'topology'): Topology.FromString,
     ('underworlds.Underworlds', 'updateNodes'): Empty.FromString,
+    ('underworlds.Underworlds', 'updateNodesFields'): Empty.FromString,
     ('underworlds.Underworlds', 'updateSituations'): Empty.FromString,
     ('underworlds.Underworlds', 'uptime'): Time.FromString,
   }
   cardinalities = {
     'byebye': cardinality.Cardinality.UNARY_UNARY,
+    'copyWorld': cardinality.Cardinality.UNARY_UNARY,
     'deleteNodes': cardinality.Cardinality.UNARY_UNARY,
     'deleteSituations': cardinality.Cardinality.UNARY_UNARY,
     'getMesh': cardinality.Cardinality.UNARY_UNARY,
+    'getMeshChunks': cardinality.Cardinality.UNARY_STREAM,
+    'getMeshUploadStatus': cardinality.Cardinality.UNARY_UNARY,
     'getNode': cardinality.Cardinality.UNARY_UNARY,
+    'getNodes': cardinality.Cardinality.UNARY_UNARY,
     'getNodesIds': cardinality.Cardinality.UNARY_UNARY,
     'getNodesLen': cardinality.Cardinality.UNARY_UNARY,
     'getRootNode': cardinality.Cardinality.UNARY_UNARY,
+    'getScene': cardinality.Cardinality.UNARY_STREAM,
+    'getSceneAt': cardinality.Cardinality.UNARY_STREAM,
     'getSituation': cardinality.Cardinality.UNARY_UNARY,
     'getSituationsIds': cardinality.Cardinality.UNARY_UNARY,
     'getSituationsLen': cardinality.Cardinality.UNARY_UNARY,
     'hasMesh': cardinality.Cardinality.UNARY_UNARY,
+    'hasMeshes': cardinality.Cardinality.UNARY_UNARY,
     'helo': cardinality.Cardinality.UNARY_UNARY,
     'pushMesh': cardinality.Cardinality.UNARY_UNARY,
+    'pushMeshChunks': cardinality.Cardinality.STREAM_UNARY,
+    'pushMeshes': cardinality.Cardinality.STREAM_UNARY,
     'reset': cardinality.Cardinality.UNARY_UNARY,
+    'subscribe': cardinality.Cardinality.UNARY_STREAM,
     'timelineOrigin': cardinality.Cardinality.UNARY_UNARY,
     'topology': cardinality.Cardinality.UNARY_UNARY,
     'updateNodes': cardinality.Cardinality.UNARY_UNARY,
+    'updateNodesFields': cardinality.Cardinality.UNARY_UNARY,
     'updateSituations': cardinality.Cardinality.UNARY_UNARY,
     'uptime': cardinality.Cardinality.UNARY_UNARY,
   }
@@ -1,14 +1,21 @@
 #! /usr/bin/env python
 
 import time
+import shutil
+import tempfile
 import unittest
 
 import logging; logger = logging.getLogger("underworlds.testing.basic_server_interaction")
 logging.basicConfig(level=logging.DEBUG)
 
+import numpy
+
 import underworlds
 import underworlds.server
-from underworlds.types import Node
+import underworlds.underworlds_pb2 as gRPC
+from underworlds.types import Node, MeshData
+from underworlds.helpers.persistence import WorldStore
+from underworlds.tools.primitives_3d import Box
 
 
 class TestSingleUser(unittest.TestCase):
@@ -30,12 +37,359 @@ class TestSingleUser(unittest.TestCase):
         self.assertGreaterEqual(uptime,1)
         self.assertGreater(2, uptime)
 
+    def test_invalidation_modes(self):
+
+        # a context with its own invalidation server, along with the default
+        # context using the invalidation stream
+        with underworlds.Context("unittest - reverse invalidations",
+                                 reverse_invalidations=True) as ctx2:
+
+            self.assertIsNotNone(ctx2.invalidation_server)
+            self.assertIsNone(self.ctx.invalidation_server)
+
+            nodes = self.ctx.worlds["base"].scene.nodes
+            nodes2 = ctx2.worlds["base"].scene.nodes
+
+            n = Node()
+            n.name = "from stream client"
+            nodes.append(n)
+
+            n2 = Node()
+            n2.name = "from reverse client"
+            nodes2.append(n2)
+
+            time.sleep(0.1) # wait for propagation
+
+            self.assertEqual(len(nodes), 3)
+            self.assertEqual(len(nodes2), 3)
+            self.assertEqual(nodes[n2.id].name, "from reverse client")
+            self.assertEqual(nodes2[n.id].name, "from stream client")
+
+    def test_meshes(self):
+
+        cube = Box.create(1, 1, 1)
+
+        self.assertFalse(self.ctx.has_mesh(cube.id))
+        self.ctx.push_mesh(cube)
+        self.assertTrue(self.ctx.has_mesh(cube.id))
+
+        with underworlds.Context("unittest - meshes") as ctx2:
+            cube2 = ctx2.mesh(cube.id)
+            self.assertEqual(cube2.id, cube.id)
+            self.assertListEqual(cube2.vertices.tolist(), cube.vertices.tolist())
+            self.assertListEqual(cube2.faces.tolist(), cube.faces.tolist())
+
+            # meshes are only retrieved once
+            self.assertIs(ctx2.mesh(cube.id), cube2)
+
+    def test_batched_meshes(self):
+
+        from underworlds.tools.loader import MeshUploader
+
+        boxes = [Box.create(1, 1, i + 1) for i in range(5)]
+        ids = [box.id for box in boxes]
+
+        self.ctx.push_meshes(boxes[:2])
+        self.assertListEqual(self.ctx.has_meshes(ids), [True, True, False, False, False])
+        self.assertListEqual(self.ctx.has_meshes([]), [])
+
+        uploader = MeshUploader(self.ctx)
+        uploader.start()
+        for box in boxes:
+            uploader.add(box)
+        uploader.finish()
+
+        self.assertIsNone(uploader.error)
+        self.assertEqual(uploader.nb_sent, 3)
+        self.assertEqual(uploader.nb_notsent, 2)
+        self.assertListEqual(self.ctx.has_meshes(ids), [True] * 5)
+
+    def test_large_meshes(self):
+
+        # large enough to be transferred in several chunks
+        nb_vertices = 3 * (underworlds._MESH_CHUNK_SIZE // 12)
+        vertices = numpy.random.rand(nb_vertices, 3)
+        faces = numpy.arange(nb_vertices).reshape(-1, 3)
+        mesh = MeshData(vertices, faces, vertices)
+
+        self.ctx.push_mesh(mesh)
+        self.assertTrue(self.ctx.has_mesh(mesh.id))
+
+        # too large to be sent in a single message
+        from grpc.framework.interfaces.face.face import AbortionError
+        from grpc.beta.interfaces import StatusCode
+        with self.assertRaises(AbortionError) as e:
+            self.ctx.rpc.getMesh(gRPC.MeshInContext(client=gRPC.Client(id=self.ctx.id),
+                                                    mesh=gRPC.Mesh(id=mesh.id)), 1)
+        self.assertEqual(e.exception.code, StatusCode.RESOURCE_EXHAUSTED)
+
+        with underworlds.Context("unittest - large meshes", mesh_cache_size=0) as ctx2:
+            mesh2 = ctx2.mesh(mesh.id)
+            self.assertEqual(mesh2.id, mesh.id)
+            self.assertTrue((mesh2.vertices == mesh.vertices).all())
+            self.assertTrue((mesh2.faces == mesh.faces).all())
+
+        # interrupted transfers are resumed
+        mesh = MeshData(vertices * 2, faces, vertices)
+        data = mesh.serialize(gRPC.Mesh).SerializeToString()
+        client = gRPC.Client(id=self.ctx.id)
+        first_chunk = gRPC.MeshChunk(client=client, id=mesh.id, offset=0, size=len(data),
+                                     data=data[:underworlds._MESH_CHUNK_SIZE])
+        self.ctx.rpc.pushMeshChunks(iter([first_chunk]), 1)
+
+        self.assertFalse(self.ctx.has_mesh(mesh.id))
+        status = self.ctx.rpc.getMeshUploadStatus(gRPC.MeshTransfer(client=client, id=mesh.id), 1)
+        self.assertEqual(status.offset, underworlds._MESH_CHUNK_SIZE)
+        self.assertEqual(status.size, len(data))
+
+        self.ctx.push_mesh(mesh)
+        self.assertTrue(self.ctx.has_mesh(mesh.id))
+
+        chunks = list(self.ctx.rpc.getMeshChunks(gRPC.MeshTransfer(client=client, id=mesh.id,
+                                                                   offset=len(data) - 10), 1))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].data, data[-10:])
+
+    def test_invalid_mesh_chunks(self):
+
+        from grpc.framework.interfaces.face.face import AbortionError
+        from grpc.beta.interfaces import StatusCode
+
+        mesh = Box.create(1, 2, 3)
+        data = mesh.serialize(gRPC.Mesh).SerializeToString()
+        client = gRPC.Client(id=self.ctx.id)
+
+        def push(id, offset, content, size=len(data)):
+            chunk = gRPC.MeshChunk(client=client, id=id, offset=offset, size=size, data=content)
+            self.ctx.rpc.pushMeshChunks(iter([chunk]), 1)
+
+        # chunks beyond the announced size
+        push(mesh.id, 0, data[:10])
+        with self.assertRaises(AbortionError) as e:
+            push(mesh.id, 10, data[10:] + b"trailing bytes")
+        self.assertEqual(e.exception.code, StatusCode.OUT_OF_RANGE)
+
+        # corrupted content
+        with self.assertRaises(AbortionError) as e:
+            push(mesh.id, 0, b"\xff" * len(data))
+        self.assertEqual(e.exception.code, StatusCode.INVALID_ARGUMENT)
+
+        # content of another mesh
+        with self.assertRaises(AbortionError) as e:
+            push("not" + mesh.id, 0, data)
+        self.assertEqual(e.exception.code, StatusCode.INVALID_ARGUMENT)
+
+        self.assertFalse(self.ctx.has_mesh(mesh.id))
+        self.assertFalse(self.ctx.has_mesh("not" + mesh.id))
+
+        # partial uploads are dropped when their client disconnects
+        with underworlds.Context("unittest - partial uploads") as ctx2:
+            chunk = gRPC.MeshChunk(client=gRPC.Client(id=ctx2.id), id=mesh.id, offset=0,
+                                   size=len(data), data=data[:10])
+            ctx2.rpc.pushMeshChunks(iter([chunk]), 1)
+
+            status = self.ctx.rpc.getMeshUploadStatus(gRPC.MeshTransfer(client=client, id=mesh.id), 1)
+            self.assertEqual(status.offset, 10)
+
+        status = self.ctx.rpc.getMeshUploadStatus(gRPC.MeshTransfer(client=client, id=mesh.id), 1)
+        self.assertEqual(status.offset, 0)
+
     def tearDown(self):
         self.ctx.close()
         self.server.stop(0).wait()
 
+class TestAsyncServer(TestSingleUser):
+    """ Same tests, with the asyncio server.
+    """
+
+    def setUp(self):
+        self.server = underworlds.server.start(aio=True)
+
+        self.ctx = underworlds.Context("unittest - basic server interaction (aio)")
+
+    def test_rate_limited_invalidations(self):
+
+        # coalesced invalidations are sent by a timer thread, not by the
+        # event loop
+        with underworlds.Context("unittest - rate limited (aio)",
+                                 max_invalidation_rate=20) as ctx2:
+
+            nodes = self.ctx.worlds["base"].scene.nodes
+            nodes2 = ctx2.worlds["base"].scene.nodes
+
+            new_nodes = [Node() for i in range(10)]
+            for n in new_nodes:
+                nodes.append(n)
+
+            time.sleep(0.2) # wait for propagation
+
+            self.assertEqual(len(nodes2), 11)
+
+class TestPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_restart(self):
+
+        store = WorldStore(self.directory)
+        server = underworlds.server.start(world_store=store)
+
+        with underworlds.Context("unittest - persistence") as ctx:
+            nodes = ctx.worlds["base"].scene.nodes
+            parent = Node("parent")
+            nodes.append(parent)
+            child = Node("child")
+            child.parent = parent.id
+            nodes.append(child)
+            ctx.worlds["other"].scene.nodes.append(Node("other"))
+            time.sleep(0.1) # wait for propagation
+
+            nodes.remove(parent) # the child is moved to the root node
+            time.sleep(0.1) # wait for propagation
+
+            rootnode = ctx.worlds["base"].scene.rootnode.id
+
+        server.stop(0).wait()
+        store.close()
+
+        store = WorldStore(self.directory)
+        server = underworlds.server.start(world_store=store)
+
+        try:
+            with underworlds.Context("unittest - persistence") as ctx:
+                self.assertSetEqual(set(w.name for w in ctx.worlds), set(["base", "other"]))
+
+                scene = ctx.worlds["base"].scene
+                self.assertEqual(len(scene.nodes), 2)
+                self.assertEqual(scene.rootnode.id, rootnode)
+                self.assertEqual(scene.nodes[child.id].parent, rootnode)
+                self.assertEqual(len(ctx.worlds["other"].scene.nodes), 2)
+        finally:
+            server.stop(0).wait()
+            store.close()
+
+    def test_snapshot_while_writing(self):
+
+        import threading
+
+        store = WorldStore(self.directory, snapshot_period=None)
+        server = underworlds.server.start(world_store=store)
+
+        done = threading.Event()
+        def snapshots():
+            while not done.is_set():
+                store.snapshot()
+                time.sleep(0.01)
+        snapshotter = threading.Thread(target=snapshots)
+        snapshotter.start()
+
+        try:
+            with underworlds.Context("unittest - persistence") as ctx:
+                nodes = ctx.worlds["base"].scene.nodes
+                for i in range(100):
+                    nodes.append(Node("n%d" % i))
+                    if i % 10 == 0:
+                        ctx.worlds["w%d" % i].scene.nodes.append(Node("n%d" % i))
+                time.sleep(0.1) # wait for propagation
+                ids = sorted(n.id for n in nodes)
+        finally:
+            done.set()
+            snapshotter.join()
+            server.stop(0).wait()
+            store.close()
+
+        worlds = WorldStore(self.directory, snapshot_period=None).restore()
+        self.assertEqual(len(worlds), 11)
+        self.assertListEqual(sorted(n.id for n in worlds["base"].scene.nodes), ids)
+
+    def test_snapshot_locking(self):
+
+        import threading
+
+        server = underworlds.server.Server()
+        with server._world_locks_lock:
+            server._new_world("base")
+
+        created = threading.Event()
+        def create():
+            with server._world_locks_lock:
+                server._new_world("other")
+            created.set()
+
+        with server._reading_all():
+            # other requests can still lock the worlds...
+            with server._reading("base"):
+                pass
+            with server._writing("other"):
+                pass
+
+            # ...but no world can be created
+            threading.Thread(target=create).start()
+            self.assertFalse(created.wait(0.1))
+
+        self.assertTrue(created.wait(1))
+        self.assertListEqual(sorted(server._worlds), ["base", "other"])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+class TestServerOptions(unittest.TestCase):
+
+    def test_message_size(self):
+
+        from grpc.framework.interfaces.face.face import AbortionError
+
+        server = underworlds.server.start(workers=4, max_message_size=64 * 1024)
+
+        try:
+            with underworlds.Context("unittest - server options") as ctx:
+                context = gRPC.Context(client=ctx.id, world="base")
+
+                small = Node("small")
+                ctx.rpc.updateNodes(gRPC.NodesInContext(context=context, nodes=[small.serialize(gRPC.Node)]), 1)
+                self.assertEqual(ctx.rpc.getNodesLen(context, 1).size, 2)
+
+                # rejected by the server
+                large = Node("l" * 128 * 1024)
+                with self.assertRaises(AbortionError):
+                    ctx.rpc.updateNodes(gRPC.NodesInContext(context=context, nodes=[large.serialize(gRPC.Node)]), 1)
+                self.assertEqual(ctx.rpc.getNodesLen(context, 1).size, 2)
+        finally:
+            server.stop(0).wait()
+
+    def test_max_streams(self):
+
+        # at most one client can stream its invalidations
+        server = underworlds.server.start(workers=2)
+
+        try:
+            with underworlds.Context("unittest - streamed") as ctx, \
+                 underworlds.Context("unittest - fallback") as ctx2:
+
+                self.assertIsNone(ctx.invalidation_server)
+                self.assertIsNotNone(ctx2.invalidation_server)
+
+                # both contexts are still notified of changes
+                nodes = ctx.worlds["base"].scene.nodes
+                nodes2 = ctx2.worlds["base"].scene.nodes
+                self.assertEqual(len(nodes2), 1)
+
+                nodes.append(Node("test"))
+                time.sleep(0.1)
+                self.assertEqual(len(nodes2), 2)
+
+                nodes2.append(Node("test2"))
+                time.sleep(0.1)
+                self.assertEqual(len(nodes), 3)
+        finally:
+            server.stop(0).wait()
+
 def test_suite():
      suite = unittest.TestLoader().loadTestsFromTestCase(TestSingleUser)
+     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAsyncServer))
+     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPersistence))
+     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestServerOptions))
      return suite
 
 
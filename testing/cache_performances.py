@@ -0,0 +1,129 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Measures the cost of processing invalidations in the client-side node
+cache (NodesProxy), for growing world sizes.
+
+The per-invalidation cost should remain flat as the number of nodes grows.
+"""
+
+import argparse
+import time
+import uuid
+
+from collections import deque
+
+import logging; logger = logging.getLogger("underworlds.testing.cache_performances")
+
+import underworlds
+import underworlds.server
+from underworlds.helpers.cache import IndexedIds
+
+def us(duration):
+    return "%.2fus" % (duration * 1e6)
+
+def per_id(f, ids, batch_size):
+    """ Calls f on successive batches of ids, and returns the average
+    duration per id.
+    """
+    starttime = time.time()
+    for i in range(0, len(ids), batch_size):
+        f(ids[i:i + batch_size])
+    return (time.time() - starttime) / len(ids)
+
+def bench_proxy(nodes, nb_nodes, batch_size):
+    """ Feeds NEW, then UPDATE invalidations for nb_nodes nodes to the
+    invalidation handlers of a NodesProxy, and applies them to the cache.
+    """
+
+    ids = [str(uuid.uuid4()) for i in range(nb_nodes)]
+
+    def apply(handler):
+        def f(ids):
+            handler(ids)
+            with nodes._lock:
+                nodes._process_invalidations()
+        return f
+
+    new = per_id(apply(nodes._on_remotely_added_nodes), ids, batch_size)
+
+    # worst case: the nodes are all still pending when updated again
+    update = per_id(apply(nodes._on_remotely_updated_nodes), ids, batch_size)
+
+    # remove the synthetic nodes to leave the proxy in a consistent state
+    for id in ids:
+        nodes._updated_ids.discard(id)
+    nodes._len -= nb_nodes
+
+    return new, update
+
+def bench_deletions(nb_nodes, nb_deletions, legacy):
+    """ Deletes nb_deletions random ids from a list of nb_nodes ids, and
+    accesses the list by index after each deletion, as NodesProxy does.
+    """
+
+    ids = [str(uuid.uuid4()) for i in range(nb_nodes)]
+    to_delete = ids[::max(1, nb_nodes // nb_deletions)][:nb_deletions]
+
+    cache = list(ids) if legacy else IndexedIds(ids)
+
+    starttime = time.time()
+    for id in to_delete:
+        cache.remove(id)
+        cache[len(cache) // 2]
+    return (time.time() - starttime) / len(to_delete)
+
+def bench_legacy_handler(nb_nodes, batch_size):
+    """ The former implementation of the invalidation handlers, for reference.
+    """
+    updated_ids = deque()
+
+    def on_remotely_updated_nodes(ids):
+        for id in ids:
+            if id not in updated_ids:
+                updated_ids.append(id)
+
+    ids = [str(uuid.uuid4()) for i in range(nb_nodes)]
+    return per_id(on_remotely_updated_nodes, ids, batch_size)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("maxnodes", default=100000, type=int, nargs="?", help="Maximum number of nodes (default: 100000)")
+    parser.add_argument("-b", "--batch", default=10, type=int, help="number of ids per invalidation (default: 10)")
+    parser.add_argument("-l", "--legacy", action="store_true", help="also measure the former deque/list-based implementation (slow!)")
+    parser.add_argument("-d", "--debug", help="debug mode", action="store_true")
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logger.setLevel(logging.WARN)
+
+    sizes = []
+    size = 100
+    while size <= args.maxnodes:
+        sizes.append(size)
+        size *= 10
+
+    server = underworlds.server.start()
+
+    with underworlds.Context("cache performances") as ctx:
+        nodes = ctx.worlds["base"].scene.nodes
+
+        print("nb nodes;NEW (per id);UPDATE (per id);deletion (per id)" + (";legacy UPDATE;legacy deletion" if args.legacy else ""))
+
+        for size in sizes:
+            new, update = bench_proxy(nodes, size, args.batch)
+            deletion = bench_deletions(size, max(1, size // 10), legacy=False)
+
+            res = [str(size), us(new), us(update), us(deletion)]
+
+            if args.legacy:
+                res += [us(bench_legacy_handler(size, args.batch)),
+                        us(bench_deletions(size, max(1, size // 10), legacy=True))]
+
+            print(";".join(res))
+
+    server.stop(0).wait()
@@ -1,8 +1,16 @@
 import unittest
+import copy
+import time
 import json
+import random
+import shutil
+import tempfile
+
+import numpy
 
 from underworlds.types import *
 from underworlds.tools.primitives_3d import Box
+from underworlds.helpers.cache import OrderedSet, IndexedIds
 
 import underworlds.underworlds_pb2
 
@@ -87,6 +95,577 @@ class TestCore(unittest.TestCase):
         self.assertEqual(n.properties, n2.properties)
 
 
+    def test_partial_updates(self):
+
+        n = Entity("test")
+        n.properties["a"] = 1
+        n.translate([1, 2, 3])
+
+        # partial encoding: only the transformation
+        delta = n.serialize(underworlds.underworlds_pb2.Node, ["transformation"])
+        self.assertEqual(delta.id, n.id)
+        self.assertEqual(delta.name, "")
+        self.assertEqual(len(delta.properties), 0)
+
+        n2 = Entity("test")
+        n2.id = n.id
+        n2.properties["b"] = 2
+        n2.update_fields(delta, ["transformation"])
+        self.assertEqual(n2.name, "test")
+        self.assertListEqual(n2.translation().tolist(), [1, 2, 3])
+
+        # properties are merged
+        delta = n.serialize(underworlds.underworlds_pb2.Node, ["name", "properties"])
+        n2.update_fields(delta, ["name", "properties"])
+        self.assertDictEqual(n2.properties, {"a": 1, "b": 2})
+
+        with self.assertRaises(UnderworldsError):
+            n2.update_fields(delta, ["children"])
+
+
+    def test_transformation_encoding(self):
+
+        n = Entity("test")
+        n.translate([1, 2, 3])
+
+        serialized = n.serialize(underworlds.underworlds_pb2.Node)
+        self.assertEqual(len(serialized.packed_transformation), 64)
+
+        n2 = Node.deserialize(serialized)
+        self.assertEqual(n2.transformation.dtype, numpy.float32)
+        self.assertListEqual(n2.transformation.tolist(), n.transformation.tolist())
+
+        # deserialized transformations can be modified in place
+        n2.translate([4, 5, 6])
+        self.assertListEqual(n2.translation().tolist(), [4, 5, 6])
+
+        # legacy encoding
+        serialized.packed_transformation = b""
+        serialized.transformation.extend(n.transformation.flatten().tolist())
+        self.assertListEqual(Node.deserialize(serialized).translation().tolist(), [1, 2, 3])
+
+
+    def test_properties_encoding(self):
+
+        n = Entity("test")
+        n.properties = {"flag": True,
+                        "count": 3,
+                        "ratio": 0.5,
+                        "label": "a label",
+                        "mesh_ids": ["a", "b"],
+                        "aabb": [0., 1., 2., 3., 4., 5.],
+                        "indices": [1, 2, 3],
+                        "mixed": [0, 1.5],
+                        "custom": {"a": [1, 2]},
+                        "facing": numpy.identity(4, dtype=numpy.float32)}
+
+        serialized = n.serialize(underworlds.underworlds_pb2.Node)
+        self.assertEqual(len(serialized.properties), 0)
+        self.assertEqual(serialized.typed_properties["aabb"].WhichOneof("value"), "numbers")
+        self.assertEqual(serialized.typed_properties["custom"].WhichOneof("value"), "json")
+
+        n2 = Node.deserialize(serialized)
+        facing = n2.properties.pop("facing")
+        self.assertEqual(facing.dtype, numpy.float32)
+        self.assertListEqual(facing.tolist(), numpy.identity(4).tolist())
+
+        expected = dict(n.properties)
+        del expected["facing"]
+        self.assertDictEqual(n2.properties, expected)
+        for k, v in expected.items():
+            self.assertIs(type(n2.properties[k]), type(v))
+        self.assertListEqual([type(v) for v in n2.properties["mixed"]], [int, float])
+
+        # unchanged json-encoded values are not decoded again
+        n3 = Node.deserialize(serialized, n2)
+        self.assertIs(n3.properties["custom"], n2.properties["custom"])
+        self.assertIsNot(n3.properties["custom"], Node.deserialize(serialized).properties["custom"])
+
+        # legacy json encoding
+        legacy = n.serialize(underworlds.underworlds_pb2.Node, ["transformation"])
+        legacy.properties["count"] = json.dumps(3)
+        legacy.properties["facing"] = json.dumps(numpy.identity(4).flatten().tolist())
+        n4 = Node.deserialize(legacy)
+        self.assertEqual(n4.properties["count"], 3)
+        self.assertEqual(n4.properties["facing"].shape, (4, 4))
+
+
+    def test_mesh_encoding(self):
+
+        cube = Box.create(1, 2, 3, diffuse=(1, 0, 0))
+        self.assertEqual(cube.vertices.shape, (len(Box.vertices), 3))
+        self.assertEqual(cube.faces.dtype, numpy.uint32)
+
+        serialized = cube.serialize(underworlds.underworlds_pb2.Mesh)
+        self.assertEqual(len(serialized.vertices), 0)
+        self.assertEqual(len(serialized.packed_faces), cube.faces.size * 4)
+
+        cube2 = MeshData.deserialize(serialized)
+        self.assertEqual(cube2.id, cube.id)
+        self.assertEqual(hash(cube2), hash(cube))
+        self.assertListEqual(cube2.vertices.tolist(), cube.vertices.tolist())
+        self.assertListEqual(cube2.faces.tolist(), cube.faces.tolist())
+        self.assertListEqual(cube2.normals.tolist(), cube.normals.tolist())
+        self.assertEqual(cube2.diffuse, (1, 0, 0, 1))
+
+        # mesh ids only depend on the mesh content
+        self.assertEqual(Box.create(1, 2, 3, diffuse=(1, 0, 0)).id, cube.id)
+        self.assertEqual(MeshData(cube.vertices.tolist(), cube.faces.tolist(),
+                                  cube.normals.tolist(), (1, 0, 0)).id, cube.id)
+        self.assertNotEqual(Box.create(1, 2, 3).id, cube.id)
+        self.assertNotEqual(Box.create(1, 2, 4, diffuse=(1, 0, 0)).id, cube.id)
+
+        # legacy encoding
+        legacy = underworlds.underworlds_pb2.Mesh(id=cube.id)
+        for x, y, z in cube.vertices.tolist():
+            legacy.vertices.add(x=x, y=y, z=z)
+        for x, y, z in cube.faces.tolist():
+            legacy.faces.add(x=x, y=y, z=z)
+        cube3 = MeshData.deserialize(legacy)
+        self.assertListEqual(cube3.vertices.tolist(), cube.vertices.tolist())
+        self.assertListEqual(cube3.faces.tolist(), cube.faces.tolist())
+        self.assertEqual(cube3.normals.shape, (0, 3))
+
+
+    def test_scene_indices(self):
+
+        scene = Scene()
+        root = scene.rootnode
+
+        self.assertEqual(len(scene.nodes), 1)
+        self.assertEqual(scene.node(root.id), root)
+        self.assertListEqual(scene.nodebyname("root"), [root])
+
+        n1 = Entity("n1")
+        n1.parent = root.id
+        n2 = Entity("n2")
+        n2.parent = root.id
+
+        self.assertIsNone(scene.update(n1))
+        self.assertIsNone(scene.update(n2))
+
+        self.assertEqual(len(scene.nodes), 3)
+        self.assertListEqual(scene.children(root.id), [n1.id, n2.id])
+        self.assertListEqual(scene.nodebyname("n1"), [n1])
+
+        # replacing a node keeps its position and updates the indices
+        n1bis = Entity("n1bis")
+        n1bis.id = n1.id
+        n1bis.parent = n2.id
+
+        self.assertEqual(scene.update(n1bis), n1)
+        self.assertListEqual([n.name for n in scene.nodes], ["root", "n1bis", "n2"])
+        self.assertListEqual(scene.nodebyname("n1"), [])
+        self.assertListEqual(scene.nodebyname("n1bis"), [n1bis])
+        self.assertListEqual(scene.children(root.id), [n2.id])
+        self.assertListEqual(scene.children(n2.id), [n1.id])
+
+        # the scene maintains the nodes' children
+        self.assertListEqual(scene.node(root.id).children, [n2.id])
+        self.assertListEqual(scene.node(n2.id).children, [n1.id])
+
+        # nodes modified in place are re-indexed as well
+        n1bis.parent = root.id
+        scene.update(n1bis)
+        self.assertListEqual(scene.children(n2.id), [])
+        self.assertListEqual(scene.children(root.id), [n2.id, n1.id])
+        self.assertListEqual(scene.node(n2.id).children, [])
+        self.assertListEqual(scene.node(root.id).children, [n2.id, n1.id])
+
+        # children added before their parent
+        orphan = Entity("orphan")
+        orphan.parent = "not-yet-there"
+        scene.update(orphan)
+        late_parent = Entity("late parent")
+        late_parent.id = "not-yet-there"
+        late_parent.parent = root.id
+        scene.update(late_parent)
+        self.assertListEqual(scene.node(late_parent.id).children, [orphan.id])
+        scene.remove(orphan.id)
+        scene.remove(late_parent.id)
+
+        self.assertEqual(scene.remove(n2.id), n2)
+        self.assertIsNone(scene.node(n2.id))
+        self.assertListEqual(scene.nodebyname("n2"), [])
+        self.assertListEqual(scene.children(root.id), [n1.id])
+        self.assertListEqual(scene.node(root.id).children, [n1.id])
+
+        with self.assertRaises(KeyError):
+            scene.remove(n2.id)
+
+
+    def test_scene_copy(self):
+
+        world = World("base")
+        scene = world.scene
+        root = scene.rootnode
+
+        n1 = Entity("n1")
+        n1.parent = root.id
+        scene.update(n1)
+        world.timeline.update(Situation())
+
+        world2 = World("copy")
+        world2.deepcopy(world)
+        scene2 = world2.scene
+
+        # nodes are shared until they are modified
+        self.assertIs(scene2.node(n1.id), n1)
+        self.assertEqual(scene2.rootnode.id, root.id)
+        self.assertDictEqual(world2.timeline.situations, world.timeline.situations)
+        self.assertEqual(world2.timeline.origin, world.timeline.origin)
+
+        n2 = Entity("n2")
+        n2.parent = root.id
+        scene2.update(n2)
+
+        self.assertIsNone(scene.node(n2.id))
+        self.assertListEqual(scene.node(root.id).children, [n1.id])
+        self.assertListEqual(scene2.node(root.id).children, [n1.id, n2.id])
+        self.assertIsNot(scene2.node(root.id), root)
+        self.assertIs(scene2.rootnode, scene2.node(root.id))
+
+        # the source scene can be modified as well
+        n1bis = Entity("n1bis")
+        n1bis.id = n1.id
+        n1bis.parent = n2.id
+        scene.update(n1bis)
+        self.assertListEqual(scene.node(root.id).children, [])
+        self.assertListEqual(scene.nodebyname("n1"), [])
+        self.assertListEqual(scene2.nodebyname("n1"), [n1])
+        self.assertListEqual(scene2.node(root.id).children, [n1.id, n2.id])
+
+        scene2.remove(n1.id)
+        self.assertIs(scene.node(n1.id), n1bis)
+        self.assertListEqual(scene2.children(root.id), [n2.id])
+
+
+    def test_scene_versions(self):
+
+        scene = Scene()
+        root = scene.rootnode
+        v0 = scene.version
+
+        n1 = Entity("n1")
+        n1.parent = root.id
+        scene.update(n1)
+        v1 = scene.version
+        self.assertGreater(v1, v0)
+
+        n2 = Entity("n2")
+        n2.parent = root.id
+        scene.update(n2)
+
+        n1bis = copy.copy(n1)
+        n1bis.name = "n1bis"
+        scene.update(n1bis)
+        scene.remove(n2.id)
+        v2 = scene.version
+
+        self.assertListEqual(scene.nodes_at(v0), [root])
+        self.assertListEqual(scene.nodes_at(v1), [root, n1])
+        self.assertListEqual([n.name for n in scene.nodes_at(v2 - 1)], ["root", "n1bis", "n2"])
+        self.assertListEqual(scene.nodes_at(v2), [root, n1bis])
+        self.assertListEqual(scene.nodes_at(v2 + 10), [root, n1bis])
+
+        with self.assertRaises(ValueError):
+            scene.nodes_at(v0 - 1)
+
+        # only the last changes are remembered
+        scene.history_size = 2
+        for i in range(3):
+            n = Entity("n%d" % i)
+            n.parent = root.id
+            scene.update(n)
+        self.assertEqual(len(scene.nodes_at(scene.version - 1)), 4)
+        with self.assertRaises(ValueError):
+            scene.nodes_at(v2)
+
+        # copies have a new version, and no history
+        scene2 = scene.copy()
+        self.assertGreater(scene2.version, scene.version)
+        with self.assertRaises(ValueError):
+            scene2.nodes_at(scene.version)
+
+        # loads are a single change, and are not remembered
+        v3 = scene.version
+        nodes = [Entity("loaded %d" % i) for i in range(3)]
+        for n in nodes:
+            n.parent = root.id
+        scene.load(nodes + [copy.copy(n1bis)])
+        self.assertGreater(scene.version, v3)
+        self.assertEqual(len(scene.nodes), 8)
+        self.assertEqual(len(scene.children(root.id)), 7)
+        self.assertEqual(scene.nodebyname("loaded 1"), [nodes[1]])
+        self.assertListEqual(scene.nodes_at(scene.version), list(scene.nodes))
+        with self.assertRaises(ValueError):
+            scene.nodes_at(v3)
+
+
+    def test_invalidation_coalescing(self):
+
+        from underworlds.server import _coalesce_invalidation
+
+        pending = {}
+        for id, type in [("a", NEW), ("a", UPDATE), # still NEW
+                         ("b", NEW), ("b", DELETE), # never seen by the client
+                         ("c", UPDATE), ("c", UPDATE),
+                         ("d", UPDATE), ("d", DELETE),
+                         ("e", DELETE), ("e", NEW), # re-created: UPDATE
+                         ("f", DELETE), ("f", DELETE)]:
+            _coalesce_invalidation(pending, id, type)
+
+        self.assertDictEqual(pending, {"a": NEW,
+                                       "c": UPDATE,
+                                       "d": DELETE,
+                                       "e": UPDATE,
+                                       "f": DELETE})
+
+
+    def test_proxy_caches(self):
+
+        ids = IndexedIds(["a", "b", "c", "d"])
+        ids.append("b") # already present
+        self.assertEqual(len(ids), 4)
+        self.assertTrue("c" in ids)
+
+        ids.remove("b")
+        ids.remove("d") # last one
+        self.assertFalse("b" in ids)
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(ids[1], "c")
+        self.assertEqual(ids.index("c"), 1)
+        ids.append("e")
+        self.assertListEqual(list(ids), ["a", "c", "e"])
+
+        with self.assertRaises(ValueError):
+            ids.remove("b")
+
+        # interleaved removals, appends and accesses (not always compacted)
+        rng = random.Random(42)
+        reference = [str(i) for i in range(200)]
+        ids = IndexedIds(reference)
+        for i in range(300):
+            if rng.random() < 0.7 and reference:
+                id = rng.choice(reference)
+                reference.remove(id)
+                ids.remove(id)
+            else:
+                reference.append("new %d" % i)
+                ids.append("new %d" % i)
+            self.assertEqual(len(ids), len(reference))
+            if reference:
+                index = rng.randrange(len(reference))
+                self.assertEqual(ids[index], reference[index])
+                self.assertEqual(ids.index(reference[index]), index)
+                self.assertEqual(ids[-1], reference[-1])
+        self.assertListEqual(list(ids), reference)
+        with self.assertRaises(IndexError):
+            ids[len(reference)]
+
+        stale = OrderedSet(["a", "b"])
+        stale.extend(["c", "a"])
+        self.assertEqual(len(stale), 3)
+        self.assertEqual(stale.pop(), "c")
+        self.assertEqual(stale.popleft(), "a")
+        stale.discard("z")
+        stale.remove("b")
+        self.assertFalse(stale)
+
+
+    def test_mesh_cache(self):
+
+        from underworlds.helpers.meshcache import MeshCache
+
+        boxes = [Box.create(1, 1, i + 1) for i in range(3)]
+        size = boxes[0].vertices.nbytes + boxes[0].faces.nbytes + boxes[0].normals.nbytes
+
+        cache = MeshCache(2 * size)
+        for box in boxes[:2]:
+            cache.put(box)
+        self.assertIs(cache.get(boxes[0].id), boxes[0])
+
+        # boxes[1] is now the least recently used mesh
+        cache.put(boxes[2])
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(boxes[1].id))
+        self.assertTrue(boxes[0].id in cache)
+
+        directory = tempfile.mkdtemp()
+        try:
+            MeshCache(size, directory).put(boxes[1])
+
+            # eg, after a restart
+            mesh = MeshCache(size, directory).get(boxes[1].id)
+            self.assertEqual(mesh.id, boxes[1].id)
+            self.assertListEqual(mesh.vertices.tolist(), boxes[1].vertices.tolist())
+            self.assertListEqual(mesh.faces.tolist(), boxes[1].faces.tolist())
+            self.assertEqual(mesh.diffuse, boxes[1].diffuse)
+        finally:
+            shutil.rmtree(directory)
+
+
+    def test_mesh_store(self):
+
+        from underworlds.helpers.meshstore import DiskMeshStore
+
+        meshes = {"a": b"a" * 10, "b": b"b" * 10, "not/safe id": b"c" * 10, "large": b"d" * 100}
+
+        directory = tempfile.mkdtemp()
+        try:
+            store = DiskMeshStore(directory, cache_size=25)
+            for id, data in meshes.items():
+                store.add(id, data)
+
+            self.assertEqual(len(store), 4)
+            self.assertTrue("not/safe id" in store)
+            self.assertFalse("c" in store)
+            with self.assertRaises(KeyError):
+                store.get("c")
+
+            for id, data in meshes.items():
+                self.assertEqual(store.get(id)[:], data)
+
+            # large meshes are never loaded in memory
+            self.assertLessEqual(sum(len(d) for d in store._cache.values()), 25)
+            large = store.get("large")
+            self.assertFalse(isinstance(large, bytes))
+            self.assertEqual(large[95:], b"d" * 5)
+
+            # eg, after a restart
+            store = DiskMeshStore(directory)
+            self.assertEqual(len(store), 4)
+            for id, data in meshes.items():
+                self.assertEqual(store.get(id)[:], data)
+
+            # empty files can not be memory-mapped
+            store.add("empty", b"")
+            store = DiskMeshStore(directory)
+            self.assertEqual(store.get("empty")[:], b"")
+        finally:
+            shutil.rmtree(directory)
+
+    def test_rwlock(self):
+
+        import threading
+        from underworlds.helpers.rwlock import RWLock
+
+        lock = RWLock()
+        events = []
+
+        def reader(name):
+            with lock.shared():
+                events.append(name)
+
+        def writer(name):
+            with lock.exclusive():
+                events.append(name)
+
+        # readers share the lock
+        with lock.shared():
+            t = threading.Thread(target=reader, args=("reader",))
+            t.start()
+            t.join(1)
+            self.assertFalse(t.is_alive())
+
+        # writers wait for the readers, and new readers for the waiting writers
+        lock.acquire_shared()
+        w = threading.Thread(target=writer, args=("writer",))
+        w.start()
+        time.sleep(0.05)
+        r = threading.Thread(target=reader, args=("late reader",))
+        r.start()
+        time.sleep(0.05)
+        self.assertListEqual(events, ["reader"])
+        lock.release_shared()
+        w.join(1)
+        r.join(1)
+        self.assertListEqual(events, ["reader", "writer", "late reader"])
+
+        # writers exclude readers
+        with lock.exclusive():
+            t = threading.Thread(target=reader, args=("reader",))
+            t.start()
+            t.join(0.05)
+            self.assertTrue(t.is_alive())
+        t.join(1)
+        self.assertFalse(t.is_alive())
+
+    def test_world_store(self):
+
+        import os
+        from underworlds.helpers.persistence import WorldStore
+
+        directory = tempfile.mkdtemp()
+        try:
+            store = WorldStore(directory, snapshot_period=None)
+            worlds = store.restore()
+            self.assertEqual(worlds, {})
+            store.start(lambda: worlds)
+
+            world = World("base")
+            worlds["base"] = world
+            store.log_world(world)
+
+            nodes = [Entity("n%d" % i) for i in range(3)]
+            for n in nodes:
+                n.parent = world.scene.rootnode.id
+                world.scene.update(n)
+            nodes[1].translate([1, 2, 3])
+            nodes[1].properties["mesh_ids"] = ["a", "b"]
+            nodes[1].properties["facing"] = numpy.identity(4)
+            nodes[1].properties["values"] = [1, 0]
+            nodes[2].properties["mesh_ids"] = ["a", "b"]
+            nodes[2].properties["values"] = [True, False]
+            store.log_nodes("base", nodes)
+
+            store.snapshot()
+
+            # changes after the snapshot are only in the write-ahead log
+            world.scene.remove(nodes[0].id)
+            store.log_deleted_nodes("base", [nodes[0].id])
+            situation = Situation()
+            world.timeline.update(situation)
+            store.log_situations("base", [situation])
+            world2 = World("copy")
+            world2.deepcopy(world)
+            worlds["copy"] = world2
+            store.log_copy("base", "copy")
+
+            # eg, the server crashes here, in the middle of a change
+            with open(os.path.join(directory, "wal-%d" % store._wal_index), "ab") as f:
+                f.write(b"\x10\x00\x00\x00garbage")
+
+            restored = WorldStore(directory, snapshot_period=None).restore()
+
+            self.assertListEqual(sorted(restored.keys()), ["base", "copy"])
+            self.assertListEqual([n.id for n in restored["copy"].scene.nodes], [n.id for n in world.scene.nodes])
+            scene = restored["base"].scene
+            self.assertEqual(scene.rootnode.id, world.scene.rootnode.id)
+            self.assertListEqual([n.id for n in scene.nodes], [n.id for n in world.scene.nodes])
+            self.assertListEqual(sorted(scene.rootnode.children), sorted([nodes[1].id, nodes[2].id]))
+            node = scene.node(nodes[1].id)
+            self.assertEqual(node.name, "n1")
+            self.assertEqual(node.type, ENTITY)
+            self.assertListEqual(node.translation().tolist(), [1, 2, 3])
+            self.assertListEqual(node.properties["mesh_ids"], ["a", "b"])
+            self.assertTrue((node.properties["facing"] == numpy.identity(4)).all())
+            self.assertListEqual(node.properties["values"], [1, 0])
+            # values shared by several nodes
+            node2 = scene.node(nodes[2].id)
+            self.assertListEqual(node2.properties["mesh_ids"], ["a", "b"])
+            self.assertIsNot(node2.properties["mesh_ids"], node.properties["mesh_ids"])
+            self.assertIs(node2.properties["values"][0], True)
+            self.assertEqual(restored["base"].timeline.origin, world.timeline.origin)
+            self.assertListEqual(list(restored["base"].timeline.situations.keys()), [situation.id])
+
+            worlds.clear()
+            store.log_reset()
+            store.close()
+            self.assertEqual(WorldStore(directory, snapshot_period=None).restore(), {})
+        finally:
+            shutil.rmtree(directory)
+
 
 def test_suite():
      suite = unittest.TestLoader().loadTestsFromTestCase(TestCore)
@@ -1,4 +1,5 @@
 import time
+import threading
 import unittest
 
 import logging; logger = logging.getLogger("underworlds")
@@ -195,6 +196,13 @@ class TestNodes(unittest.TestCase):
         names2 = [n.name for n in nodes2]
         self.assertListEqual(names, names2[:2])
 
+        # unknown (or already deleted) nodes are skipped
+        nodes.remove([n3, n1])
+        nodes.remove_future.result()
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        self.assertEqual(len(nodes2), 2)
+
 
     def test_multiple_nodes(self):
 
@@ -216,6 +224,364 @@ class TestNodes(unittest.TestCase):
         time.sleep(PROPAGATION_TIME) # wait for propagation
         self.assertEqual(len(nodes), 1)
 
+    def test_bulk_access(self):
+
+        world = self.ctx.worlds["base"]
+        nodes = world.scene.nodes
+
+        new_nodes = []
+        for i in range(1200): # more than one chunk of the streamed scene
+            n = Node()
+            n.name = "node %d" % i
+            new_nodes.append(n)
+
+        nodes.append(new_nodes)
+        time.sleep(10 * PROPAGATION_TIME) # wait for propagation
+
+        # a fresh context fetches the whole scene at once
+        world2 = self.ctx2.worlds["base"]
+        nodes2 = world2.scene.nodes
+        self.assertEqual(len(nodes2), 1201)
+
+        names = [n.name for n in nodes2]
+        self.assertEqual(names[0], "root")
+        self.assertListEqual(names[1:], [n.name for n in new_nodes])
+
+        # nodes updated after the bulk fetch are still refreshed on access
+        new_nodes[0].name = "renamed"
+        nodes.update(new_nodes[0])
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        self.assertEqual(nodes2[new_nodes[0].id].name, "renamed")
+
+    def test_batch_refresh(self):
+
+        world = self.ctx.worlds["base"]
+        nodes = world.scene.nodes
+
+        new_nodes = [Node() for i in range(10)]
+        nodes.append(new_nodes)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        world2 = self.ctx2.worlds["base"]
+        nodes2 = world2.scene.nodes
+        nodes2.batch_size = 4
+        self.assertEqual(len([n for n in nodes2]), 11)
+
+        for n in new_nodes:
+            n.name = "updated"
+        nodes.update(new_nodes)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        # accessing one stale node refreshes a whole batch of them
+        self.assertEqual(nodes2[new_nodes[0].id].name, "updated")
+        self.assertEqual(len(nodes2._updated_ids), 10 - 4)
+
+        names = [n.name for n in nodes2]
+        self.assertEqual(names.count("updated"), 10)
+
+    def test_concurrent_access(self):
+
+        world = self.ctx.worlds["base"]
+        nodes = world.scene.nodes
+
+        nodes2 = self.ctx2.worlds["base"].scene.nodes
+
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            try:
+                while not done.is_set():
+                    for n in nodes2:
+                        nodes2[n.id]
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for i in range(4)]
+        for r in readers:
+            r.start()
+
+        # add and update nodes while the readers access them
+        new_nodes = []
+        for i in range(20):
+            new_nodes += [Node() for j in range(10)]
+            for n in new_nodes:
+                n.name = "iteration %d" % i
+            nodes.update(new_nodes)
+            time.sleep(PROPAGATION_TIME / 5)
+
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        done.set()
+        for r in readers:
+            r.join()
+
+        self.assertListEqual(errors, [])
+        self.assertEqual(len(nodes2), 1 + 20 * 10)
+        self.assertEqual(nodes2[new_nodes[0].id].name, "iteration 19")
+
+        nodes.remove(new_nodes)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        self.assertEqual(len([n for n in nodes2]), 1)
+
+    def test_slow_fetch(self):
+
+        nodes = self.ctx.worlds["base"].scene.nodes
+        root = nodes[0]
+
+        class SlowRPC(object):
+            def __init__(self, rpc):
+                self.rpc = rpc
+            def __getattr__(self, name):
+                return getattr(self.rpc, name)
+            def getNode(self, *args):
+                time.sleep(0.5)
+                return self.rpc.getNode(*args)
+
+        self.ctx.rpc = SlowRPC(self.ctx.rpc)
+        fetcher = threading.Thread(target=lambda: self.assertRaises(KeyError, nodes.__getitem__, "unknown"))
+        fetcher.start()
+        time.sleep(0.1)
+
+        # cached nodes are still accessible while another node is being fetched
+        start = time.time()
+        self.assertIs(nodes[root.id], root)
+        self.assertEqual(len(nodes), 1)
+        self.assertLess(time.time() - start, 0.2)
+
+        fetcher.join()
+        self.ctx.rpc = self.ctx.rpc.rpc
+
+    def test_concurrent_writes(self):
+
+        nodes = self.ctx.worlds["base"].scene.nodes
+
+        parent = Node()
+        nodes.append(parent)
+
+        contexts = [underworlds.Context("unittest - nodes writer %d" % i) for i in range(4)]
+        errors = []
+
+        def writer(ctx, world):
+            try:
+                writer_nodes = ctx.worlds[world].scene.nodes
+                for i in range(10):
+                    children = [Node() for j in range(5)]
+                    for n in children:
+                        n.parent = parent.id
+                    writer_nodes.update(children)
+            except Exception as e:
+                errors.append(e)
+
+        # two writers per world
+        writers = [threading.Thread(target=writer, args=(ctx, "base" if i % 2 else "other"))
+                   for i, ctx in enumerate(contexts)]
+        for w in writers:
+            w.start()
+        for w in writers:
+            w.join()
+
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        for ctx in contexts:
+            ctx.close()
+
+        self.assertListEqual(errors, [])
+        self.assertEqual(len(nodes), 1 + 1 + 2 * 10 * 5)
+        self.assertEqual(len(nodes[parent.id].children), 2 * 10 * 5)
+        self.assertEqual(len(self.ctx2.worlds["other"].scene.nodes), 1 + 2 * 10 * 5)
+
+    def test_lost_invalidations(self):
+
+        nodes = self.ctx.worlds["base"].scene.nodes
+        nodes2 = self.ctx2.worlds["base"].scene.nodes
+
+        # errors of the invalidation threads are only logged: collect them
+        errors = []
+        handler = logging.Handler(level=logging.ERROR)
+        handler.emit = errors.append
+        logging.getLogger("underworlds.client").addHandler(handler)
+        self.addCleanup(logging.getLogger("underworlds.client").removeHandler, handler)
+
+        # simulate the loss of the notifications of new nodes
+        nodes2._on_remotely_added_nodes = lambda ids, nodes=(): None
+        nodes2.propagation_timeout = 0.1
+
+        n = Node()
+        nodes.append(n)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        self.assertEqual(len(nodes2), 1)
+        nodes2._len = 2 # as if the length was correct, but not the ids
+
+        # nodes2 waits for the notification, then resyncs with the server
+        self.assertEqual(nodes2[1], n)
+        self.assertEqual(len(nodes2), 2)
+
+        with self.assertRaises(IndexError):
+            nodes2[2]
+
+        self.assertEqual(errors, [])
+
+    def test_lost_invalidations_while_updating(self):
+
+        nodes = self.ctx.worlds["base"].scene.nodes
+        nodes2 = self.ctx2.worlds["base"].scene.nodes
+
+        m = Node()
+        nodes.append(m)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        self.assertEqual(nodes2[1], m)
+
+        # the notification of a new node is lost...
+        nodes2._on_remotely_added_nodes = lambda ids, nodes=(): None
+        nodes2.propagation_timeout = 0.1
+        n = Node()
+        nodes.append(n)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        nodes2._len = 3
+
+        # ...while another node keeps being updated
+        done = threading.Event()
+        def updater():
+            while not done.is_set():
+                m.name = str(time.time())
+                nodes.update(m)
+                time.sleep(0.01)
+        threading.Thread(target=updater).start()
+
+        try:
+            result = []
+            reader = threading.Thread(target=lambda: result.append(nodes2[2]))
+            reader.daemon = True
+            reader.start()
+            reader.join(2)
+            self.assertListEqual(result, [n])
+        finally:
+            done.set()
+
+    def test_partial_updates(self):
+
+        nodes = self.ctx.worlds["base"].scene.nodes
+        nodes2 = self.ctx2.worlds["base"].scene.nodes
+
+        n = Node()
+        n.name = "tracked"
+        nodes.append(n)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        self.assertEqual(nodes2[n.id].name, "tracked")
+
+        n.translate([1, 2, 3])
+        n.name = "not propagated"
+        nodes.update(n, fields=["transformation"])
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        n2 = nodes2[n.id]
+        self.assertListEqual(n2.translation().tolist(), [1, 2, 3])
+        self.assertEqual(n2.name, "tracked")
+        self.assertEqual(nodes[n.id].name, "tracked")
+
+        # deltas for unknown nodes are ignored
+        unknown = Node()
+        nodes.update(unknown, fields=["name"])
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        self.assertEqual(len(nodes), 2)
+
+    def test_invalidation_payloads(self):
+
+        nodes = self.ctx.worlds["base"].scene.nodes
+
+        with underworlds.Context("unittest - payloads", invalidation_payloads=True) as ctx3:
+            nodes3 = ctx3.worlds["base"].scene.nodes
+
+            n = Node()
+            n.name = "pushed"
+            nodes.append(n)
+            time.sleep(PROPAGATION_TIME) # wait for propagation
+
+            # the node is already in the cache: no need to fetch it
+            self.assertEqual(len(nodes3), 2)
+            self.assertFalse(n.id in nodes3._updated_ids)
+            self.assertEqual(nodes3[n.id].name, "pushed")
+
+            n.name = "updated"
+            nodes.update(n)
+            time.sleep(PROPAGATION_TIME) # wait for propagation
+
+            self.assertEqual(len(nodes3), 2)
+            self.assertFalse(n.id in nodes3._updated_ids)
+            self.assertEqual(nodes3[n.id].name, "updated")
+
+    def test_copy_world(self):
+
+        world = self.ctx.worlds["base"]
+        n = Node()
+        n.name = "original"
+        world.scene.nodes.append(n)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        # the copy replaces the existing content of the target world
+        copy = self.ctx2.worlds["copy"]
+        copy.scene.nodes.append(Node())
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        self.assertEqual(len(copy.scene.nodes), 2)
+
+        copy.copy_from(self.ctx2.worlds["base"])
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        nodes = copy.scene.nodes
+        self.assertEqual(len(nodes), 2)
+        self.assertEqual(nodes[n.id].name, "original")
+        self.assertEqual(copy.scene.rootnode.id, world.scene.rootnode.id)
+
+        # both worlds are then independent
+        nodes[n.id].name = "copy"
+        nodes.update(nodes[n.id])
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        self.assertEqual(world.scene.nodes[n.id].name, "original")
+
+        with self.assertRaises(ValueError):
+            copy.copy_from("does not exist")
+
+    def test_scene_versions(self):
+
+        scene = self.ctx.worlds["base"].scene
+        scene2 = self.ctx2.worlds["base"].scene
+
+        n = Node()
+        n.name = "first"
+        scene.nodes.append(n)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+
+        version = scene2.version
+        self.assertGreater(version, 0)
+
+        n.name = "second"
+        scene.nodes.update(n)
+        n2 = Node()
+        n2.parent = n.id
+        scene.nodes.append(n2)
+        time.sleep(PROPAGATION_TIME) # wait for propagation
+        self.assertGreater(scene2.version, version)
+
+        # the scene as it was before the last changes
+        snapshot = scene2.at(version)
+        self.assertEqual(snapshot.version, version)
+        self.assertEqual(len(snapshot.nodes), 2)
+        self.assertEqual(snapshot.nodes[n.id].name, "first")
+        self.assertEqual(snapshot.rootnode.id, scene2.nodes.rootnode)
+        self.assertListEqual(snapshot.nodes[n.id].children, [])
+
+        snapshot = scene2.at()
+        self.assertEqual(snapshot.version, scene2.version)
+        self.assertEqual(len(snapshot.nodes), 3)
+        self.assertEqual(snapshot.nodes[n.id].name, "second")
+        self.assertListEqual(snapshot.nodes[n.id].children, [n2.id])
+
+        with self.assertRaises(ValueError):
+            scene2.at(1)
+
     def tearDown(self):
         self.ctx.close()
         self.ctx2.close()
@@ -21,13 +21,13 @@ def ms(duration):
     return "%.1fms" % (duration * 1000)
 
 
-def passthrough(world1, world2, signaling_pipe):
+def passthrough(world1, world2, signaling_pipe, payloads=False):
     """ Simple passthrough filter: wait for changes on a world world1 and
     propagate these changes to world world2.
     """
 
     name = "passthrough_filter_%s_to_%s" % (world1, world2)
-    with underworlds.Context(name) as ctx:
+    with underworlds.Context(name, invalidation_payloads=payloads) as ctx:
 
         world1 = ctx.worlds[world1]
         world2 = ctx.worlds[world2]
@@ -39,9 +39,9 @@ def passthrough(world1, world2, signaling_pipe):
                 change = world1.scene.waitforchanges(0.5)
                 #print("%f -- %s Done waiting (last change: %s)" % (time.time(), name, str(change)))
                 if change is not None:
-                    id, op = change
+                    ids, op = change
                     #print("%f -- propagating from %s to %s" % (time.time(), name, world1, world2))
-                    world2.scene.update_and_propagate(world1.scene.nodes[id])
+                    world2.scene.update_and_propagate([world1.scene.nodes[id] for id in ids])
                     change = None
         except Exception as e:
             import traceback
@@ -68,7 +68,7 @@ def wait_for_changes(world, nb_changes):
 
 
     
-def test_propagation_time(nb_worlds, nb_changes):
+def test_propagation_time(nb_worlds, nb_changes, payloads=False):
 
     executor = ThreadPoolExecutor(max_workers=nb_worlds)
     pool = Pool(nb_worlds)
@@ -80,11 +80,11 @@ def test_propagation_time(nb_worlds, nb_changes):
         #f = executor.submit(passthrough, "world%d" % i, "world%d" % (i+1))
         conn1, conn2 = Pipe()
         pipes.append(conn1)
-        res.append(pool.apply_async(passthrough, ["world%d" % i, "world%d" % (i+1), conn2]))
+        res.append(pool.apply_async(passthrough, ["world%d" % i, "world%d" % (i+1), conn2, payloads]))
 
     time.sleep(0.5)
 
-    ctx = underworlds.Context("test_client")
+    ctx = underworlds.Context("test_client", invalidation_payloads=payloads)
     entry_world = ctx.worlds["world0"]
     exit_world = ctx.worlds["world%d" % (nb_worlds-1)]
 
@@ -131,6 +131,7 @@ if __name__ == '__main__':
     parser.add_argument("-i", "--incremental", action="store_true", help="test for every nb of worlds, from 2 to maxworlds")
     parser.add_argument("-r", "--repeat", default=1, type=int, nargs="?", help="how many times the test should be repeated (default: no repeat)")
     parser.add_argument("-c", "--changes", default=1, type=int, nargs="?", help="how many changes should be propagated (default: one)")
+    parser.add_argument("-p", "--payloads", action="store_true", help="clients receive the nodes content along with the invalidations")
     args = parser.parse_args()
 
     if args.debug or args.fulldebug:
@@ -150,7 +151,7 @@ if __name__ == '__main__':
             print("\n\n\n-- %d worlds --\n" % nb)
 
             server = underworlds.server.start()
-            durations.setdefault(nb,[]).append(test_propagation_time(nb, args.changes))
+            durations.setdefault(nb,[]).append(test_propagation_time(nb, args.changes, args.payloads))
             server.stop(0).wait()
 
 
@@ -0,0 +1,192 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Load test of the underworlds server: measures the throughput of the
+server for increasing sizes of its thread pool (cf underworlds.server.start),
+to size deployments.
+
+For each size of the pool, a server is started in its own process, then
+several clients (each in its own process) send getNode and updateNodes
+requests as fast as they can, for a given duration.
+
+Unless --reverse-invalidations is used, each client streams its
+invalidations from the server, which holds one thread of the pool per
+client: the pool must be larger than the number of clients (except with the
+asyncio server, --aio).
+
+--idle-clients connects additional clients that only wait for their
+invalidations, like most clients of a large deployment.
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import logging; logger = logging.getLogger("underworlds.testing.server_load")
+
+import underworlds
+import underworlds.server
+import underworlds.underworlds_pb2 as gRPC
+import grpc
+from underworlds.types import Entity
+
+_TIMEOUT_SECONDS = 5
+
+def run_client(port, world, start_at, duration, batch, write_ratio, reverse_invalidations, results):
+    """ Sends requests until start_at + duration, and pushes
+    (nb reads, nb writes, total latency, nb errors) onto results.
+    """
+
+    reads, writes, latency, errors = 0, 0, 0., 0
+
+    try:
+        with underworlds.Context("load test", port=port, reverse_invalidations=reverse_invalidations) as ctx:
+
+            nodes = [Entity() for i in range(batch)]
+            ctx.worlds[world].scene.nodes.update(nodes)
+
+            server_ctx = gRPC.Context(client=ctx.id, world=world)
+            update = gRPC.NodesInContext(context=server_ctx,
+                                         nodes=[n.serialize(gRPC.Node) for n in nodes])
+            gets = [gRPC.NodeInContext(context=server_ctx, node=gRPC.Node(id=n.id)) for n in nodes]
+
+            # one write every write_period requests
+            write_period = int(round(1. / write_ratio)) if write_ratio > 0 else 0
+
+            time.sleep(max(0, start_at - time.time()))
+            end = start_at + duration
+
+            i = 0
+            while time.time() < end:
+                i += 1
+                starttime = time.time()
+                try:
+                    if write_period and i % write_period == 0:
+                        ctx.rpc.updateNodes(update, _TIMEOUT_SECONDS)
+                        writes += 1
+                    else:
+                        ctx.rpc.getNode(gets[i % batch], _TIMEOUT_SECONDS)
+                        reads += 1
+                except Exception as e:
+                    logger.debug("Request failed: %s" % e)
+                    errors += 1
+                latency += time.time() - starttime
+    except Exception as e:
+        logger.error("Client failed: %s" % e)
+        errors += 1
+    finally:
+        results.put((reads, writes, latency, errors))
+
+def run_idle_clients(port, nb_clients, connected, done):
+    """ Connects clients that only stream their invalidations (all on the
+    same channel), sets `connected`, and disconnects them once `done` is set.
+    """
+
+    channel = grpc.insecure_channel("localhost:%d" % port)
+    stub = gRPC.UnderworldsStub(channel)
+
+    clients = []
+    for i in range(nb_clients):
+        client = stub.helo(gRPC.Welcome(name="idle client %d" % i, stream_invalidations=True), _TIMEOUT_SECONDS)
+        clients.append((client, stub.subscribe(client)))
+
+    connected.set()
+    done.wait()
+
+    for client, stream in clients:
+        stub.byebye(client, _TIMEOUT_SECONDS)
+        stream.cancel()
+    channel.close()
+
+def bench(port, workers, nb_clients, nb_idle_clients, nb_worlds, duration, batch, write_ratio, reverse_invalidations, aio):
+
+    server, server_queue = underworlds.server.start_process(port, workers=workers, aio=aio)
+    time.sleep(1) # leave some time to the server to start
+
+    # gRPC does not support forking a process with open channels: the
+    # idle clients have their own process as well
+    idle_connected, idle_done = multiprocessing.Event(), multiprocessing.Event()
+    idle_clients = multiprocessing.Process(target=run_idle_clients,
+                                           args=(port, nb_idle_clients, idle_connected, idle_done))
+    idle_clients.start()
+    idle_connected.wait()
+
+    try:
+        results = multiprocessing.Queue()
+
+        # leave some time to the clients to connect
+        start_at = time.time() + 1 + 0.1 * nb_clients
+
+        clients = [multiprocessing.Process(target=run_client,
+                                           args=(port,
+                                                 "load-%d" % (i % nb_worlds),
+                                                 start_at,
+                                                 duration,
+                                                 batch,
+                                                 write_ratio,
+                                                 reverse_invalidations,
+                                                 results))
+                   for i in range(nb_clients)]
+        for c in clients:
+            c.start()
+
+        reads, writes, latency, errors = 0, 0, 0., 0
+        for c in clients:
+            r, w, l, e = results.get()
+            reads += r
+            writes += w
+            latency += l
+            errors += e
+
+        for c in clients:
+            c.join()
+
+    finally:
+        idle_done.set()
+        idle_clients.join()
+        server_queue.put(True)
+        server.join()
+
+    nb_requests = max(1, reads + writes + errors)
+    return (reads + writes) / duration, reads / duration, writes / duration, latency / nb_requests, errors
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-w", "--workers", default=[1, 2, 4, 8, 16, 32, 64], type=int, nargs="+", help="sizes of the server's thread pool to test (default: 1 2 4 8 16 32 64)")
+    parser.add_argument("-c", "--clients", default=8, type=int, help="number of concurrent clients, each in its own process (default: 8)")
+    parser.add_argument("--idle-clients", default=0, type=int, help="number of additional clients that only wait for their invalidations (default: 0)")
+    parser.add_argument("--worlds", default=1, type=int, help="number of worlds the clients are spread across (default: 1)")
+    parser.add_argument("-t", "--duration", default=5., type=float, help="duration (in sec) of each measure (default: 5)")
+    parser.add_argument("-b", "--batch", default=10, type=int, help="number of nodes per updateNodes request (default: 10)")
+    parser.add_argument("-r", "--write-ratio", default=0.1, type=float, help="proportion of updateNodes requests (default: 0.1)")
+    parser.add_argument("-i", "--reverse-invalidations", action="store_true", help="clients run their own invalidation server instead of streaming their invalidations")
+    parser.add_argument("-a", "--aio", action="store_true", help="tests the asyncio server")
+    parser.add_argument("-p", "--port", default=50061, type=int, help="port of the test servers (default: 50061)")
+    parser.add_argument("-d", "--debug", help="debug mode", action="store_true")
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.WARN)
+
+    print("%s server, %d clients (+%d idle), %d worlds, %d%% writes of %d nodes" % ("asyncio" if args.aio else "threaded", args.clients, args.idle_clients, args.worlds, args.write_ratio * 100, args.batch))
+    print("workers;requests/s;reads/s;writes/s;mean latency;errors")
+
+    for workers in args.workers:
+
+        streams = args.idle_clients + (0 if args.reverse_invalidations else args.clients)
+        if not args.aio and workers <= streams:
+            print("%d;skipped: the invalidation streams of the clients would hold all the workers" % workers)
+            continue
+
+        total, reads, writes, latency, errors = bench(args.port, workers,
+                                                      args.clients, args.idle_clients,
+                                                      args.worlds,
+                                                      args.duration, args.batch,
+                                                      args.write_ratio,
+                                                      args.reverse_invalidations,
+                                                      args.aio)
+        print("%d;%.1f;%.1f;%.1f;%.2fms;%d" % (workers, total, reads, writes, latency * 1000, errors))
@@ -38,6 +38,7 @@ class TestTopology(unittest.TestCase):
         world = provider_ctx.worlds["base"]
         world.scene.nodes.append(Node()) # create and add a random node
         provider_id = provider_ctx.id
+        time.sleep(PROPAGATION_TIME) # nodes are sent asynchronously
 
         topo = self.observer_ctx.topology()
 
@@ -77,6 +78,7 @@ class TestTopology(unittest.TestCase):
             # Modify the world from the PROVIDER context
             time.sleep(0.2)
             world.scene.nodes.append(Node()) # create and add a random node
+            time.sleep(PROPAGATION_TIME)
 
             topo = self.observer_ctx.topology()
 